@@ -0,0 +1,112 @@
+"""add grid cell and height band to measurements
+
+Revision ID: 3f1c2a9d7b10
+Revises:
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+import math
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK_SIZE = 10000
+
+# Siatka z app.utils.grid w tej rewizji – zamrożona, żeby migracja nie zależała od kodu aplikacji
+CELL_SIZE_METERS = 5.0
+HEIGHT_BAND_METERS = 1.0
+METERS_PER_DEGREE = math.pi * 6371000 / 180
+
+
+def _grid_cell(lat: float, lon: float) -> int:
+    lat_step = CELL_SIZE_METERS / METERS_PER_DEGREE
+    row = math.floor(lat / lat_step)
+    lon_step = lat_step / max(math.cos(math.radians((row + 0.5) * lat_step)), 1e-6)
+    col = math.floor(lon / lon_step)
+    return row * (1 << 32) + col + (1 << 31)
+
+
+def _height_band(height):
+    if height is None:
+        return None
+    return math.floor(height / HEIGHT_BAND_METERS)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("measurements"):
+        # świeża baza – tabelę z nowymi kolumnami utworzy Base.metadata.create_all
+        return
+
+    columns = {c["name"] for c in inspector.get_columns("measurements")}
+    if "grid_cell" not in columns:
+        op.add_column("measurements", sa.Column("grid_cell", sa.Integer(), nullable=True))
+    if "height_band" not in columns:
+        op.add_column("measurements", sa.Column("height_band", sa.Integer(), nullable=True))
+
+    indexes = {i["name"] for i in inspector.get_indexes("measurements")}
+    if "idx_grid_cell" not in indexes:
+        op.create_index("idx_grid_cell", "measurements", ["grid_cell", "building_name", "height_band"])
+
+    # backfill komórek dla istniejących agregatów, porcjami po id
+    measurements = sa.table(
+        "measurements",
+        sa.column("id", sa.Integer),
+        sa.column("latitude", sa.Float),
+        sa.column("longitude", sa.Float),
+        sa.column("height", sa.Float),
+        sa.column("grid_cell", sa.Integer),
+        sa.column("height_band", sa.Integer),
+    )
+    update = (
+        measurements.update()
+        .where(measurements.c.id == sa.bindparam("b_id"))
+        .values(grid_cell=sa.bindparam("b_cell"), height_band=sa.bindparam("b_band"))
+    )
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                measurements.c.id,
+                measurements.c.latitude,
+                measurements.c.longitude,
+                measurements.c.height,
+            )
+            .where(measurements.c.id > last_id, measurements.c.grid_cell.is_(None))
+            .order_by(measurements.c.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        bind.execute(
+            update,
+            [
+                {
+                    "b_id": row.id,
+                    "b_cell": _grid_cell(row.latitude, row.longitude),
+                    "b_band": _height_band(row.height),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_grid_cell", table_name="measurements")
+    with op.batch_alter_table("measurements") as batch_op:
+        batch_op.drop_column("height_band")
+        batch_op.drop_column("grid_cell")
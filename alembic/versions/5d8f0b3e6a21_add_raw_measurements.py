@@ -0,0 +1,49 @@
+"""add raw measurements
+
+Revision ID: 5d8f0b3e6a21
+Revises: e3a7c1f9d2b4
+Create Date: 2026-10-18 19:14:32.208417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8f0b3e6a21'
+down_revision: Union[str, None] = 'e3a7c1f9d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("raw_measurements"):
+        return
+    op.create_table(
+        "raw_measurements",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("height", sa.Float(), nullable=True),
+        sa.Column("download_speed", sa.Float(), nullable=True),
+        sa.Column("upload_speed", sa.Float(), nullable=True),
+        sa.Column("ping", sa.Integer(), nullable=True),
+        sa.Column(
+            "received_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")
+        ),
+        sa.Column("aggregate_id", sa.Integer(), sa.ForeignKey("measurements.id"), nullable=True),
+    )
+    op.create_index(
+        "idx_raw_pending", "raw_measurements", ["id"], sqlite_where=sa.text("aggregate_id IS NULL")
+    )
+    op.create_index("idx_raw_aggregate", "raw_measurements", ["aggregate_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_raw_aggregate", table_name="raw_measurements")
+    op.drop_index("idx_raw_pending", table_name="raw_measurements")
+    op.drop_table("raw_measurements")
@@ -0,0 +1,34 @@
+"""add dataset versions
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 14:03:27.550912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f1a93'
+down_revision: Union[str, None] = '3f1c2a9d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("dataset_versions"):
+        return
+    op.create_table(
+        "dataset_versions",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("dataset_versions")
@@ -0,0 +1,160 @@
+"""add hourly and daily rollups
+
+Revision ID: 9a4c6e2f7b35
+Revises: 5d8f0b3e6a21
+Create Date: 2026-10-18 20:03:11.493826
+
+"""
+import math
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from decouple import config
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c6e2f7b35'
+down_revision: Union[str, None] = '5d8f0b3e6a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 50_000
+
+# Komórki rollupów jak w app.crud.rollups w tej rewizji – zamrożone, żeby migracja
+# nie zależała od kodu aplikacji
+ROLLUP_CELL_SIZE_METERS = config("ROLLUP_CELL_SIZE_METERS", default=100.0, cast=float)
+METERS_PER_DEGREE = math.pi * 6371000 / 180
+
+
+def _rollup_cell(lat: float, lon: float) -> int:
+    lat_step = ROLLUP_CELL_SIZE_METERS / METERS_PER_DEGREE
+    row = math.floor(lat / lat_step)
+    lon_step = lat_step / max(math.cos(math.radians((row + 0.5) * lat_step)), 1e-6)
+    col = math.floor(lon / lon_step)
+    return row * (1 << 32) + col + (1 << 31)
+
+
+def _buckets(timestamp):
+    """(okres, początek przedziału) godzinowego i dziennego"""
+    hour = timestamp.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+    return ("hour", hour), ("day", hour.replace(hour=0))
+
+
+def _rollup_table(name: str, scope_column):
+    return sa.table(
+        name,
+        scope_column,
+        sa.column("period", sa.String),
+        sa.column("bucket_start", sa.DateTime),
+        sa.column("measurement_count", sa.Integer),
+        sa.column("download_speed_sum", sa.Float),
+        sa.column("upload_speed_sum", sa.Float),
+        sa.column("ping_sum", sa.Integer),
+    )
+
+
+def _insert_sums(bind, table, scope_name: str, sums: dict) -> None:
+    rows = [
+        {
+            scope_name: scope,
+            "period": period,
+            "bucket_start": bucket_start,
+            "measurement_count": count,
+            "download_speed_sum": download_sum,
+            "upload_speed_sum": upload_sum,
+            "ping_sum": ping_sum,
+        }
+        for (scope, period, bucket_start), (count, download_sum, upload_sum, ping_sum) in sums.items()
+    ]
+    for chunk_start in range(0, len(rows), BACKFILL_CHUNK):
+        bind.execute(table.insert(), rows[chunk_start:chunk_start + BACKFILL_CHUNK])
+
+
+def _sum_columns():
+    return [
+        sa.Column("measurement_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("download_speed_sum", sa.Float(), nullable=False, server_default=sa.text("0.0")),
+        sa.Column("upload_speed_sum", sa.Float(), nullable=False, server_default=sa.text("0.0")),
+        sa.Column("ping_sum", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if inspector.has_table("building_rollups"):
+        return
+
+    op.create_table(
+        "building_rollups",
+        sa.Column("building_name", sa.String(), primary_key=True),
+        sa.Column("period", sa.String(length=4), primary_key=True),
+        sa.Column("bucket_start", sa.DateTime(), primary_key=True),
+        *_sum_columns(),
+    )
+    op.create_index("idx_building_rollups_period", "building_rollups", ["period", "bucket_start"])
+    op.create_table(
+        "cell_rollups",
+        sa.Column("cell", sa.Integer(), primary_key=True),
+        sa.Column("period", sa.String(length=4), primary_key=True),
+        sa.Column("bucket_start", sa.DateTime(), primary_key=True),
+        *_sum_columns(),
+    )
+    if not inspector.has_table("raw_measurements"):
+        return
+
+    # tylko próbki z dziennika mają własny czas pomiaru – agregaty pamiętają wyłącznie ostatnią aktualizację
+    raw = sa.table(
+        "raw_measurements",
+        sa.column("id", sa.Integer),
+        sa.column("latitude", sa.Float),
+        sa.column("longitude", sa.Float),
+        sa.column("download_speed", sa.Float),
+        sa.column("upload_speed", sa.Float),
+        sa.column("ping", sa.Integer),
+        sa.column("received_at", sa.DateTime),
+        sa.column("aggregate_id", sa.Integer),
+    )
+    m = sa.table("measurements", sa.column("id", sa.Integer), sa.column("building_name", sa.String))
+    # sumy liczone w pamięci (przedziałów jest dużo mniej niż próbek) i wstawiane do pustych tabel
+    building_sums, cell_sums = {}, {}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                raw.c.id, m.c.building_name, raw.c.latitude, raw.c.longitude, raw.c.received_at,
+                raw.c.download_speed, raw.c.upload_speed, raw.c.ping,
+            )
+            .join(m, m.c.id == raw.c.aggregate_id)
+            .where(raw.c.id > last_id)
+            .order_by(raw.c.id)
+            .limit(BACKFILL_CHUNK)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            values = (1, row.download_speed or 0.0, row.upload_speed or 0.0, row.ping or 0)
+            cell = _rollup_cell(row.latitude, row.longitude)
+            for period, bucket_start in _buckets(row.received_at):
+                keys = [(cell_sums, cell)]
+                if row.building_name is not None:
+                    keys.append((building_sums, row.building_name))
+                for sums, scope in keys:
+                    current = sums.get((scope, period, bucket_start), (0, 0.0, 0.0, 0))
+                    sums[(scope, period, bucket_start)] = tuple(a + b for a, b in zip(current, values))
+        last_id = rows[-1].id
+
+    _insert_sums(
+        bind, _rollup_table("building_rollups", sa.column("building_name", sa.String)),
+        "building_name", building_sums,
+    )
+    _insert_sums(bind, _rollup_table("cell_rollups", sa.column("cell", sa.Integer)), "cell", cell_sums)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("cell_rollups")
+    op.drop_index("idx_building_rollups_period", table_name="building_rollups")
+    op.drop_table("building_rollups")
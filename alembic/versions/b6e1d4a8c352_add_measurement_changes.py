@@ -0,0 +1,41 @@
+"""add measurement changes
+
+Revision ID: b6e1d4a8c352
+Revises: 9a4c6e2f7b35
+Create Date: 2026-10-18 21:26:47.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1d4a8c352'
+down_revision: Union[str, None] = '9a4c6e2f7b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("measurement_changes"):
+        return
+    op.create_table(
+        "measurement_changes",
+        sa.Column("seq", sa.Integer(), primary_key=True),
+        sa.Column("measurement_id", sa.Integer(), nullable=False, unique=True),
+        sa.Column("deleted", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sqlite_autoincrement=True,
+    )
+    # istniejące agregaty jako pierwsze zmiany – since=0 zwraca cały zbiór
+    op.execute(
+        "INSERT INTO measurement_changes (measurement_id, deleted) "
+        "SELECT id, 0 FROM measurements ORDER BY id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("measurement_changes")
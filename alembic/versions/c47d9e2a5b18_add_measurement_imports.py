@@ -0,0 +1,39 @@
+"""add measurement imports
+
+Revision ID: c47d9e2a5b18
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-18 16:21:05.104477
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d9e2a5b18'
+down_revision: Union[str, None] = '8b2e4d6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("measurement_imports"):
+        return
+    op.create_table(
+        "measurement_imports",
+        sa.Column("source_hash", sa.String(length=64), primary_key=True),
+        sa.Column("source_name", sa.String(), nullable=False),
+        sa.Column("rows_imported", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("completed", sa.Boolean(), nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "updated_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("measurement_imports")
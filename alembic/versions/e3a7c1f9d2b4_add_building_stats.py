@@ -0,0 +1,111 @@
+"""add building stats
+
+Revision ID: e3a7c1f9d2b4
+Revises: c47d9e2a5b18
+Create Date: 2026-10-18 18:02:47.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c1f9d2b4'
+down_revision: Union[str, None] = 'c47d9e2a5b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _building_color(download_speed_sum, upload_speed_sum, ping_sum, count):
+    """
+    Kolor średnich budynku jak w building_color w tej rewizji (domyślny ScoringEngine) –
+    zamrożony, żeby migracja nie zależała od kodu aplikacji
+    """
+    download_speed = download_speed_sum / count
+    upload_speed = upload_speed_sum / count
+    ping = sa.cast(sa.cast(ping_sum, sa.Float) / count, sa.Integer)
+    score = (
+        5.0 * (((download_speed - 1.0) / (150.0 - 1.0)) * 100)
+        + 3.0 * (((upload_speed - 1.0) / (100.0 - 1.0)) * 100)
+        + 2.0 * ((1 - ((ping - 8.0) / (600.0 - 8.0))) * 100)
+    ) / (5.0 + 3.0 + 2.0)
+    return sa.case(
+        (score <= 20.0, '#B22D2D'),
+        (score <= 60.0, '#E4A316'),
+        else_='#67B22D',
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if inspector.has_table("building_stats"):
+        return
+
+    building_stats = op.create_table(
+        "building_stats",
+        sa.Column("building_name", sa.String(), primary_key=True),
+        sa.Column("measurement_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("download_speed_sum", sa.Float(), nullable=False, server_default=sa.text("0.0")),
+        sa.Column("upload_speed_sum", sa.Float(), nullable=False, server_default=sa.text("0.0")),
+        sa.Column("ping_sum", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("min_download_speed", sa.Float(), nullable=True),
+        sa.Column("max_download_speed", sa.Float(), nullable=True),
+        sa.Column("min_upload_speed", sa.Float(), nullable=True),
+        sa.Column("max_upload_speed", sa.Float(), nullable=True),
+        sa.Column("min_ping", sa.Integer(), nullable=True),
+        sa.Column("max_ping", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("color", sa.String(length=7), nullable=True),
+    )
+    if not inspector.has_table("measurements"):
+        return
+
+    # podsumowania istniejących danych jednym INSERT ... SELECT; min/max – ze średnich agregatów,
+    # bo pojedyncze wartości nie są przechowywane
+    m = sa.table(
+        "measurements",
+        sa.column("building_name", sa.String),
+        sa.column("measurement_count", sa.Integer),
+        sa.column("download_speed_sum", sa.Float),
+        sa.column("upload_speed_sum", sa.Float),
+        sa.column("ping_sum", sa.Integer),
+        sa.column("download_speed", sa.Float),
+        sa.column("upload_speed", sa.Float),
+        sa.column("ping", sa.Integer),
+        sa.column("timestamp", sa.DateTime),
+    )
+    count = sa.func.sum(m.c.measurement_count)
+    download_sum = sa.func.sum(m.c.download_speed_sum)
+    upload_sum = sa.func.sum(m.c.upload_speed_sum)
+    ping_sum = sa.func.sum(m.c.ping_sum)
+    op.execute(
+        building_stats.insert().from_select(
+            [c.name for c in building_stats.columns],
+            sa.select(
+                m.c.building_name,
+                count,
+                download_sum,
+                upload_sum,
+                ping_sum,
+                sa.func.min(m.c.download_speed),
+                sa.func.max(m.c.download_speed),
+                sa.func.min(m.c.upload_speed),
+                sa.func.max(m.c.upload_speed),
+                sa.func.min(m.c.ping),
+                sa.func.max(m.c.ping),
+                sa.func.max(m.c.timestamp),
+                _building_color(download_sum, upload_sum, ping_sum, count),
+            )
+            .where(m.c.building_name.is_not(None), m.c.measurement_count > 0)
+            .group_by(m.c.building_name)
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("building_stats")
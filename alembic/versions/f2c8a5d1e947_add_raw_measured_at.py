@@ -0,0 +1,33 @@
+"""add raw measured_at
+
+Revision ID: f2c8a5d1e947
+Revises: b6e1d4a8c352
+Create Date: 2026-10-18 23:52:08.641275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8a5d1e947'
+down_revision: Union[str, None] = 'b6e1d4a8c352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("raw_measurements")}
+    if "measured_at" in columns:
+        return
+    # istniejące próbki zostają z NULL – ich rollupy liczone były według received_at
+    op.add_column("raw_measurements", sa.Column("measured_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("raw_measurements") as batch_op:
+        batch_op.drop_column("measured_at")
@@ -0,0 +1,79 @@
+"""
+Dependency uwierzytelniająca żądania tokenem JWT z /user/login (Authorization: Bearer ...).
+
+Każdy zapis pomiaru z tokenem płaciłby dekodowanie JWT i zapytanie do tabeli users,
+więc oba wyniki są trzymane w małych pamięciach podręcznych z czasem życia:
+zweryfikowane tokeny (najdłużej do ich wygaśnięcia) i id użytkowników po emailu.
+Zmiana lub usunięcie użytkownika w tym procesie usuwa go z pamięci od razu,
+w innych workerach – najpóźniej po AUTH_CACHE_TTL_SECONDS.
+"""
+import time
+from typing import Optional
+
+from decouple import config
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
+from fastapi.security.utils import get_authorization_scheme_param
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.auth_handler import decode_jwt
+from app.db.database import get_session_factory
+from app.models import User
+from app.utils.cache import TTLCache
+
+AUTH_CACHE_SIZE = config("AUTH_CACHE_SIZE", default=1024, cast=int)
+AUTH_CACHE_TTL_SECONDS = config("AUTH_CACHE_TTL_SECONDS", default=60.0, cast=float)
+
+# token -> email z tokenu
+token_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS, name="jwt")
+# email -> id aktywnego użytkownika
+user_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS, name="users")
+
+
+def _active_user_id(session_factory, email: str) -> Optional[int]:
+    # własna, krótka sesja – połączenie wraca do puli od razu, a nie po całym żądaniu
+    with session_factory() as db:
+        return db.scalar(select(User.id).where(User.email == email, User.is_active.is_not(False)))
+
+
+class JWTBearer(HTTPBearer):
+    """
+    Zwraca id użytkownika z tokenu. Z auto_error=False żądanie bez nagłówka Authorization
+    jest anonimowe (None), ale nagłówek z innym schematem niż Bearer (wielkość liter bez
+    znaczenia), bez tokenu albo z nieważnym tokenem nadal kończy się 403.
+    """
+
+    def __init__(self, auto_error: bool = True):
+        super().__init__(auto_error=auto_error)
+
+    async def __call__(self, request: Request, session_factory=Depends(get_session_factory)) -> Optional[int]:
+        # HTTPBearer(auto_error=False) zwraca None także dla złego nagłówka – sprawdzamy sami
+        authorization = request.headers.get("Authorization")
+        if authorization is None:
+            if self.auto_error:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated")
+            return None
+        scheme, token = get_authorization_scheme_param(authorization)
+        if scheme.lower() != "bearer" or not token:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid authentication scheme.")
+
+        email = token_cache.get(token)
+        if email is None:
+            payload = decode_jwt(token)
+            if not payload:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token or expired token.")
+            email = payload["user_id"]
+            token_cache.put(token, email, ttl_seconds=payload["expires"] - time.time())
+
+        user_id = user_cache.get(email)
+        if user_id is None:
+            user_id = await run_in_threadpool(_active_user_id, session_factory, email)
+            if user_id is None:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not found or inactive.")
+            user_cache.put(email, user_id)
+        return user_id
+
+
+jwt_bearer = JWTBearer()
+optional_jwt_bearer = JWTBearer(auto_error=False)
@@ -1,3 +1,4 @@
+import logging
 import time
 from typing import Dict
 
@@ -5,6 +6,8 @@ import jwt
 from decouple import config
 
 
+logger = logging.getLogger(__name__)
+
 JWT_SECRET = config("SECRET")
 JWT_ALGORITHM = config("ALGORITHM")
 
@@ -27,5 +30,6 @@ def decode_jwt(token: str) -> dict:
         decoded_token = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         return decoded_token if decoded_token["expires"] >= time.time() else None
     except Exception as e:
-        print(f"JWT decode error: {e}")
+        # na ścieżce zapisu pomiarów – bez print() przy każdym nieważnym tokenie
+        logger.debug(f"JWT decode error: {e}")
         return None # return {} zwraca pusty slownik, None chyba bardziej pasuje ale idk
@@ -0,0 +1,77 @@
+"""
+Hashowanie i weryfikacja haseł (bcrypt) poza pętlą zdarzeń.
+
+Jedno hashpw/checkpw to setki milisekund CPU – wołane wprost w handlerze async zatrzymuje
+cały worker, łącznie z endpointami pomiarów. Tu wykonują się w osobnej, ograniczonej puli
+wątków (bcrypt zwalnia GIL na czas liczenia, więc wątki wystarczą), a liczba zadań czekających
+na pulę jest ograniczona – nadmiarowe logowania dostają 503 z Retry-After zamiast kolejki bez końca.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+from decouple import config
+from fastapi import HTTPException, status
+
+BCRYPT_ROUNDS = config("BCRYPT_ROUNDS", default=12, cast=int)
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+PASSWORD_HASH_MAX_WAITING = config("PASSWORD_HASH_MAX_WAITING", default=32, cast=int)
+
+
+class PasswordHasher:
+    """Pula wątków dla bcrypt z limitem równoczesnych i oczekujących zadań"""
+
+    def __init__(
+        self,
+        rounds: int = BCRYPT_ROUNDS,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_waiting: int = PASSWORD_HASH_MAX_WAITING,
+    ):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_waiting = max_waiting
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, function, *args):
+        if self._in_flight >= self.workers + self.max_waiting:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Zbyt wiele równoczesnych logowań",
+                headers={"Retry-After": "1"},
+            )
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), function, *args)
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        hashed = await self._run(bcrypt.hashpw, password.encode("utf-8"), salt)
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await password_hasher.verify(password, hashed)
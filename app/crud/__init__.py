@@ -1,4 +1,5 @@
 from .user import UserService
 from .measurement import MeasurementService
+from .measurement_async import AsyncMeasurementService
 
-__all__ = ["UserService", "MeasurementService"]
+__all__ = ["UserService", "MeasurementService", "AsyncMeasurementService"]
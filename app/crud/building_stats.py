@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import Float, Integer, bindparam, cast, delete, func, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models import BuildingStats
+from app.utils.scoring import ScoringEngine, scoring_engine
+
+
+@dataclass
+class BuildingStatsDelta:
+    """Zmiana podsumowania jednego budynku w bieżącej transakcji"""
+
+    measurement_count: int = 0
+    download_speed_sum: float = 0.0
+    upload_speed_sum: float = 0.0
+    ping_sum: int = 0
+    min_download_speed: Optional[float] = None
+    max_download_speed: Optional[float] = None
+    min_upload_speed: Optional[float] = None
+    max_upload_speed: Optional[float] = None
+    min_ping: Optional[int] = None
+    max_ping: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+    def add(
+        self,
+        download_speed: Optional[float],
+        upload_speed: Optional[float],
+        ping: Optional[int],
+        timestamp: Optional[datetime],
+        count: int = 1,
+    ) -> None:
+        """
+        Dolicz pomiar; przy count > 1 prędkości i ping są sumami (jak w increment_params),
+        a do min/max trafiają ich średnie
+        """
+        self.measurement_count += count
+        self.download_speed_sum += download_speed or 0.0
+        self.upload_speed_sum += upload_speed or 0.0
+        self.ping_sum += ping or 0
+        if download_speed is not None:
+            self.min_download_speed, self.max_download_speed = _extend(
+                self.min_download_speed, self.max_download_speed, download_speed / count
+            )
+        if upload_speed is not None:
+            self.min_upload_speed, self.max_upload_speed = _extend(
+                self.min_upload_speed, self.max_upload_speed, upload_speed / count
+            )
+        if ping is not None:
+            self.min_ping, self.max_ping = _extend(self.min_ping, self.max_ping, int(ping / count))
+        if timestamp is not None:
+            timestamp = timestamp.replace(tzinfo=None)
+            self.updated_at = timestamp if self.updated_at is None else max(self.updated_at, timestamp)
+
+
+def _extend(low, high, value):
+    return (value if low is None else min(low, value)), (value if high is None else max(high, value))
+
+
+def _least(current, new):
+    """Mniejsza z dwóch wartości; NULL (brak danych) nie wygrywa"""
+    return func.min(func.coalesce(current, new), func.coalesce(new, current))
+
+
+def _greatest(current, new):
+    return func.max(func.coalesce(current, new), func.coalesce(new, current))
+
+
+def building_color(
+    download_speed_sum, upload_speed_sum, ping_sum, count, engine: ScoringEngine = scoring_engine
+):
+    """Kolor średnich budynku jako wyrażenie SQL – te same średnie co w derived_values agregatów"""
+    return engine.color_expression(
+        download_speed_sum / count,
+        upload_speed_sum / count,
+        cast(cast(ping_sum, Float) / count, Integer),
+    )
+
+
+def apply_building_deltas(db: Session, deltas: Dict[str, BuildingStatsDelta]) -> None:
+    """
+    Dopisz zmiany do building_stats jednym INSERT ... ON CONFLICT DO UPDATE (po wierszu na budynek).
+    Sumy rosną atomowo w bazie, więc równoległe transakcje się nie nadpisują.
+    """
+    rows = []
+    for building_name, delta in deltas.items():
+        if building_name is None or delta.measurement_count == 0:
+            continue
+        count = delta.measurement_count
+        rows.append({
+            "building_name": building_name,
+            "measurement_count": count,
+            "download_speed_sum": delta.download_speed_sum,
+            "upload_speed_sum": delta.upload_speed_sum,
+            "ping_sum": delta.ping_sum,
+            "min_download_speed": delta.min_download_speed,
+            "max_download_speed": delta.max_download_speed,
+            "min_upload_speed": delta.min_upload_speed,
+            "max_upload_speed": delta.max_upload_speed,
+            "min_ping": delta.min_ping,
+            "max_ping": delta.max_ping,
+            "updated_at": delta.updated_at,
+            "color": scoring_engine.color(
+                delta.download_speed_sum / count, delta.upload_speed_sum / count, int(delta.ping_sum / count)
+            ),
+        })
+    if not rows:
+        return
+
+    table = BuildingStats.__table__
+    statement = insert(table)
+    new = statement.excluded
+    sums = {
+        "measurement_count": table.c.measurement_count + new.measurement_count,
+        "download_speed_sum": table.c.download_speed_sum + new.download_speed_sum,
+        "upload_speed_sum": table.c.upload_speed_sum + new.upload_speed_sum,
+        "ping_sum": table.c.ping_sum + new.ping_sum,
+    }
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.building_name],
+            set_={
+                **sums,
+                "min_download_speed": _least(table.c.min_download_speed, new.min_download_speed),
+                "max_download_speed": _greatest(table.c.max_download_speed, new.max_download_speed),
+                "min_upload_speed": _least(table.c.min_upload_speed, new.min_upload_speed),
+                "max_upload_speed": _greatest(table.c.max_upload_speed, new.max_upload_speed),
+                "min_ping": _least(table.c.min_ping, new.min_ping),
+                "max_ping": _greatest(table.c.max_ping, new.max_ping),
+                "updated_at": _greatest(table.c.updated_at, new.updated_at),
+                "color": building_color(
+                    sums["download_speed_sum"], sums["upload_speed_sum"], sums["ping_sum"], sums["measurement_count"]
+                ),
+            },
+        ),
+        rows,
+    )
+
+
+def subtract_building_stats(
+    db: Session,
+    building_name: Optional[str],
+    download_speed: Optional[float],
+    upload_speed: Optional[float],
+    ping: Optional[int],
+    count: int = 1,
+) -> None:
+    """
+    Odejmij usunięte pomiary (przy count > 1 – sumy) od podsumowania budynku.
+    Min/max obejmują wszystkie kiedykolwiek zapisane pomiary i nie są cofane.
+    """
+    if building_name is None:
+        return
+
+    table = BuildingStats.__table__
+    sums = {
+        "measurement_count": table.c.measurement_count - bindparam("b_count"),
+        "download_speed_sum": table.c.download_speed_sum - bindparam("b_dl"),
+        "upload_speed_sum": table.c.upload_speed_sum - bindparam("b_ul"),
+        "ping_sum": table.c.ping_sum - bindparam("b_ping"),
+    }
+    db.execute(
+        update(table)
+        .where(table.c.building_name == building_name)
+        .values(
+            **sums,
+            color=building_color(
+                sums["download_speed_sum"], sums["upload_speed_sum"], sums["ping_sum"], sums["measurement_count"]
+            ),
+        ),
+        {"b_count": count, "b_dl": download_speed or 0.0, "b_ul": upload_speed or 0.0, "b_ping": ping or 0},
+    )
+    db.execute(
+        delete(table).where(table.c.building_name == building_name, table.c.measurement_count <= 0)
+    )
+
+
+def building_stats_dict(stats: BuildingStats) -> dict:
+    """Podsumowanie budynku ze średnimi, w kształcie BuildingStatsResponse"""
+    count = stats.measurement_count
+    return {
+        "building_name": stats.building_name,
+        "measurement_count": count,
+        "download_speed": stats.download_speed_sum / count,
+        "upload_speed": stats.upload_speed_sum / count,
+        "ping": int(stats.ping_sum / count),
+        "min_download_speed": stats.min_download_speed,
+        "max_download_speed": stats.max_download_speed,
+        "min_upload_speed": stats.min_upload_speed,
+        "max_upload_speed": stats.max_upload_speed,
+        "min_ping": stats.min_ping,
+        "max_ping": stats.max_ping,
+        "updated_at": stats.updated_at,
+        "color": stats.color,
+    }
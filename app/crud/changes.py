@@ -0,0 +1,35 @@
+from typing import Iterable, Union
+
+from sqlalchemy import Select, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models import MeasurementChange
+
+# znacznik w Session.info: transakcja zapisała zmiany agregatów (po commicie budzi app.crud.live)
+CHANGES_RECORDED = "measurement_changes_recorded"
+
+
+def record_changes(
+    db: Session, measurement_ids: Union[Iterable[int], Select], deleted: bool = False
+) -> None:
+    """
+    Zapisz zmianę agregatów w bieżącej transakcji – razem z zapisem, który je zmienia.
+
+    INSERT OR REPLACE usuwa poprzedni wiersz agregatu i wstawia nowy, więc agregat dostaje
+    nowy, większy seq, a tabela ma najwyżej jeden wiersz na agregat. measurement_ids to
+    lista id albo SELECT zwracający id (zmiany wielu agregatów jednym INSERT ... SELECT).
+    """
+    db.info[CHANGES_RECORDED] = True
+    table = MeasurementChange.__table__
+    statement = insert(table).prefix_with("OR REPLACE")
+    if isinstance(measurement_ids, Select):
+        ids = measurement_ids.subquery()
+        db.execute(statement.from_select(
+            ["measurement_id", "deleted"], select(ids.c[0], literal(deleted))
+        ))
+        return
+
+    # posortowane – kolejne wstawienia trafiają w sąsiednie strony indeksu measurement_id
+    rows = [{"measurement_id": measurement_id, "deleted": deleted} for measurement_id in sorted(set(measurement_ids))]
+    if rows:
+        db.execute(statement, rows)
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from decouple import config
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.crud.measurement import MAX_BATCH_SIZE, MeasurementService
+from app.db.database import SessionLocal
+from app.db.profiling import QueryStats, collect_query_stats, current_query_stats
+from app.models import Measurement
+from app.schemas import MeasurementBase
+
+INGEST_QUEUE = config("INGEST_QUEUE", default=False, cast=bool)
+INGEST_QUEUE_MAX_DEPTH = config("INGEST_QUEUE_MAX_DEPTH", default=1000, cast=int)
+INGEST_GROUP_SIZE = config("INGEST_GROUP_SIZE", default=200, cast=int)
+INGEST_GROUP_WAIT_MS = config("INGEST_GROUP_WAIT_MS", default=10, cast=int)
+
+
+class MeasurementWriter:
+    """
+    Jedyny zapisujący pomiary w procesie.
+
+    Żądania wrzucają pomiary do ograniczonej kolejki i czekają na swój wynik,
+    a osobne zadanie zbiera je w grupy (do group_size pomiarów lub group_wait_ms)
+    i zapisuje każdą grupę jedną transakcją przez MeasurementService.create_measurements.
+    Dzięki temu zapisy nie konkurują o blokadę SQLite, a commit (fsync) jest jeden na grupę.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_queue_depth: int = INGEST_QUEUE_MAX_DEPTH,
+        group_size: int = INGEST_GROUP_SIZE,
+        group_wait_ms: int = INGEST_GROUP_WAIT_MS,
+    ):
+        self.session_factory = session_factory
+        self.max_queue_depth = max_queue_depth
+        self.group_size = min(group_size, MAX_BATCH_SIZE)
+        self.group_wait = group_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._carry = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Dokończ zapis wszystkiego, co jest w kolejce, i zatrzymaj zadanie"""
+        if not self.running:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(
+        self, measurements: List[MeasurementBase], user_id: Optional[int] = None
+    ) -> List[Tuple[Measurement, bool]]:
+        """Dodaj pomiary (autora user_id) do kolejki i poczekaj na wynik ich zapisu"""
+        if len(measurements) > MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Maksymalny rozmiar paczki to {MAX_BATCH_SIZE}",
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            # statystyki zapytań żądania (SQL_PROFILING) – zadanie zapisu działa poza jego kontekstem
+            self._queue.put_nowait((measurements, user_id, current_query_stats(), future))
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Kolejka zapisu pomiarów jest pełna",
+                headers={"Retry-After": "1"},
+            )
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._carry is not None:
+                group, self._carry = [self._carry], None
+            else:
+                group = [await self._queue.get()]
+            size = len(group[0][0])
+            deadline = loop.time() + self.group_wait
+
+            while size < self.group_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if size + len(item[0]) > MAX_BATCH_SIZE:
+                    # nie mieści się w limicie jednej transakcji – otworzy następną grupę
+                    self._carry = item
+                    break
+                group.append(item)
+                size += len(item[0])
+
+            await self._write_group(group)
+            for _ in group:
+                self._queue.task_done()
+
+    async def _write_group(self, group: list) -> None:
+        measurements = [m for item_measurements, _, _, _ in group for m in item_measurements]
+        user_ids = [user_id for item_measurements, user_id, _, _ in group for _ in item_measurements]
+        request_stats = [stats for _, _, stats, _ in group if stats is not None]
+        group_stats = QueryStats() if request_stats else None
+        try:
+            results = await run_in_threadpool(self._write, measurements, user_ids, group_stats)
+        except Exception as e:
+            logging.error(f"[MeasurementWriter] Error while writing {len(measurements)} measurements: {e}")
+            for _, _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            for stats in request_stats:
+                stats.add(group_stats)
+
+        offset = 0
+        for item_measurements, _, _, future in group:
+            if not future.done():
+                future.set_result(results[offset:offset + len(item_measurements)])
+            offset += len(item_measurements)
+
+    def _write(
+        self,
+        measurements: List[MeasurementBase],
+        user_ids: List[Optional[int]],
+        stats: Optional[QueryStats] = None,
+    ) -> List[Tuple[Measurement, bool]]:
+        with self.session_factory() as db:
+            if stats is None:
+                return MeasurementService(db).create_measurements(measurements, user_ids)
+            with collect_query_stats(stats):
+                return MeasurementService(db).create_measurements(measurements, user_ids)
+
+
+measurement_writer = MeasurementWriter()
@@ -0,0 +1,253 @@
+"""
+Wypychanie zmian agregatów do klientów na żywo (GET/WebSocket /measurements/stream).
+
+Jeden koncentrator na proces czyta nowe wiersze measurement_changes – od razu po commicie
+zapisu w tym procesie (zdarzenie after_commit sesji) i co poll_interval sekund, żeby dotarły
+też zmiany z innych procesów (importer, kompaktor, inne workery) – i rozdaje je subskrybentom.
+Każdy subskrybent ma własny bufor oczekujących zmian ze scalaniem po id agregatu: seria
+zmian jednego punktu przed wysłaniem to jedna wiadomość z jego ostatnim stanem. Bufor jest
+ograniczony (max_pending agregatów) – subskrybent, który nie nadąża, jest odłączany, zamiast
+zbierać zmiany bez końca; po ponownym połączeniu dociąga brakujące przez /measurements/changes.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+
+from decouple import config
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.crud.changes import CHANGES_RECORDED
+from app.crud.measurement import EXPORT_COLUMNS, MAX_PAGE_LIMIT, MeasurementService
+from app.db.database import SessionLocal
+from app.utils.metrics import registry
+
+LIVE_POLL_INTERVAL_SECONDS = config("LIVE_POLL_INTERVAL_SECONDS", default=1.0, cast=float)
+LIVE_MAX_PENDING = config("LIVE_MAX_PENDING", default=1000, cast=int)
+
+# klucze obiektów w wiadomościach – pola MeasurementResponse, jak w /measurements/changes
+_COLUMNS = [column.key for column in EXPORT_COLUMNS]
+
+logger = logging.getLogger(__name__)
+
+live_subscribers = registry.gauge(
+    "live_subscribers", "Clients subscribed to /measurements/stream"
+)
+live_dropped_total = registry.counter(
+    "live_dropped_total", "Subscribers disconnected from /measurements/stream for falling behind"
+)
+
+
+class SlowConsumer(Exception):
+    """Subskrybent nie odbierał zmian i jego bufor się przepełnił"""
+
+
+class LiveSubscription:
+    """
+    Zmiany czekające na wysłanie do jednego klienta, po filtrze budynku i obszaru.
+    bbox to (min_latitude, max_latitude, min_longitude, max_longitude).
+    Usunięć nie da się przefiltrować (agregatu już nie ma), więc trafiają do wszystkich.
+    """
+
+    def __init__(
+        self,
+        building_name: Optional[str] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        max_pending: int = LIVE_MAX_PENDING,
+    ):
+        self.building_name = building_name
+        self.bbox = bbox
+        self.max_pending = max_pending
+        self.dropped = False
+        self._pending: Dict[int, Optional[dict]] = {}
+        self._cursor = 0
+        self._ready = asyncio.Event()
+
+    def matches(self, measurement: dict) -> bool:
+        if self.building_name and measurement["building_name"] != self.building_name:
+            return False
+        if self.bbox:
+            min_lat, max_lat, min_lon, max_lon = self.bbox
+            return (
+                min_lat <= measurement["latitude"] <= max_lat
+                and min_lon <= measurement["longitude"] <= max_lon
+            )
+        return True
+
+    def offer(self, changed: list, deleted: list, cursor: int) -> bool:
+        """Dodaj porcję zmian do bufora; False, jeśli bufor się przepełnił"""
+        for measurement in changed:
+            if self.matches(measurement):
+                self._pending[measurement["id"]] = measurement
+        for measurement_id in deleted:
+            self._pending[measurement_id] = None
+        self._cursor = cursor
+
+        if len(self._pending) > self.max_pending:
+            self.dropped = True
+            self._pending.clear()
+            self._ready.set()
+            return False
+        if self._pending:
+            self._ready.set()
+        return True
+
+    async def next_batch(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        Poczekaj na zmiany i zabierz wszystkie oczekujące jako jedną wiadomość
+        (None po timeout bez zmian). Po przepełnieniu bufora – SlowConsumer.
+        """
+        if not self._ready.is_set():
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        self._ready.clear()
+        if self.dropped:
+            raise SlowConsumer()
+
+        pending, self._pending = self._pending, {}
+        return {
+            "changed": [m for m in pending.values() if m is not None],
+            "deleted": [measurement_id for measurement_id, m in pending.items() if m is None],
+            "cursor": self._cursor,
+        }
+
+
+class LiveHub:
+    """
+    Rozsyłanie zmian z measurement_changes do subskrybentów w pętli zdarzeń aplikacji.
+    Zadanie czytające działa tylko wtedy, gdy ktoś subskrybuje – startuje z pierwszym
+    subskrybentem (od bieżącego kursora) i kończy się z ostatnim.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        poll_interval_seconds: float = LIVE_POLL_INTERVAL_SECONDS,
+        max_pending: int = LIVE_MAX_PENDING,
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval_seconds
+        self.max_pending = max_pending
+        self._subscribers: Set[LiveSubscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._loop is asyncio.get_running_loop()
+        )
+
+    def notify(self) -> None:
+        """Obudź zadanie czytające – bezpieczne z dowolnego wątku (wołane po commicie)"""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or not self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # pętla już zamknięta
+            pass
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        building_name: Optional[str] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        session_factory=None,
+    ) -> AsyncIterator[LiveSubscription]:
+        """
+        Subskrypcja zmian od chwili wejścia do bloku. session_factory (np. z dependency
+        get_session_factory) zastępuje domyślną fabrykę przy starcie zadania czytającego.
+        """
+        subscription = LiveSubscription(building_name, bbox, self.max_pending)
+        await self._ensure_running(session_factory or self.session_factory)
+        self._subscribers.add(subscription)
+        live_subscribers.inc()
+        try:
+            yield subscription
+        finally:
+            self._unsubscribe(subscription)
+
+    def _unsubscribe(self, subscription: LiveSubscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            live_subscribers.dec()
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _ensure_running(self, session_factory) -> None:
+        if self.running:
+            return
+        # kursor czytany przed startem, żeby subskrybent dostał wszystko, co zapisano po wejściu
+        cursor = await run_in_threadpool(self._read_cursor, session_factory)
+        if self.running:
+            # w międzyczasie wystartował inny subskrybent
+            return
+        self.session_factory = session_factory
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(cursor))
+
+    async def _run(self, cursor: int) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                has_more = True
+                while has_more:
+                    changes = await run_in_threadpool(self._read_changes, cursor)
+                    self._publish(changes)
+                    cursor, has_more = changes["cursor"], changes["has_more"]
+            except Exception as e:
+                logger.error(f"[LiveHub] {e}")
+
+    def _read_cursor(self, session_factory) -> int:
+        with session_factory() as db:
+            return MeasurementService(db).get_changes_cursor()
+
+    def _read_changes(self, since: int) -> dict:
+        with self.session_factory() as db:
+            changes = MeasurementService(db).get_changes(since=since, limit=MAX_PAGE_LIMIT)
+        changes["changed"] = [dict(zip(_COLUMNS, row)) for row in changes["changed"]]
+        return changes
+
+    def _publish(self, changes: dict) -> None:
+        if not changes["changed"] and not changes["deleted"]:
+            return
+        for subscription in list(self._subscribers):
+            if not subscription.offer(changes["changed"], changes["deleted"], changes["cursor"]):
+                logger.warning("[LiveHub] odłączono subskrybenta, który nie nadążał ze zmianami")
+                live_dropped_total.inc()
+                self._unsubscribe(subscription)
+
+
+live_hub = LiveHub()
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(CHANGES_RECORDED, False):
+        live_hub.notify()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(CHANGES_RECORDED, None)
+
+
+def notify_on_commit() -> None:
+    """Budź live_hub po każdym commicie, który zapisał zmiany agregatów"""
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
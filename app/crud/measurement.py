@@ -1,104 +1,518 @@
+import logging
+
+import numpy as np
+from decouple import config
 from fastapi import HTTPException, status
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text, func
-from app.models import Measurement
+from sqlalchemy import Float, Integer, bindparam, case, cast, delete, insert, select, text, func, or_, tuple_, update
+from app.crud.building_stats import (
+    BuildingStatsDelta,
+    apply_building_deltas,
+    building_stats_dict,
+    subtract_building_stats,
+)
+from app.crud.changes import record_changes
+from app.crud.rollups import apply_rollup_deltas, rollup_cell
+from app.models import (
+    BuildingRollup,
+    BuildingStats,
+    CellRollup,
+    DatasetVersion,
+    Measurement,
+    MeasurementChange,
+    RawMeasurement,
+)
 from app.schemas import MeasurementBase, MeasurementUpdate, MeasurementResponse
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Tuple, Union
 from app.utils.distance_utils import (
+    bounding_box,
     haversine_distance,
+    haversine_distances,
 )
-from app.utils.buildings import find_building
+from app.utils.buildings import find_buildings
+from app.utils.metrics import count_ingested, raw_measurements_received_total
+from app.utils.grid import HEIGHT_BAND_METERS, grid_cell, height_band, neighbour_cells
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.scoring import scoring_engine
+from app.utils.tiles import TILE_GRID_SIZE, tile_bounds, tile_cache, tile_row_edges
+
+logger = logging.getLogger(__name__)
+
+# Pomiary bliżej niż MERGE_RADIUS_METERS (i na tej samej wysokości) trafiają do jednego agregatu
+MERGE_RADIUS_METERS = config("MERGE_RADIUS_METERS", default=5.0, cast=float)
+
+MAX_PAGE_LIMIT = 1000
+MAX_BATCH_SIZE = 1000
+
+# Kolumny listy i eksportu (jak w MeasurementResponse) i liczba wierszy pobieranych z kursora naraz
+EXPORT_COLUMNS = (
+    Measurement.id,
+    Measurement.latitude,
+    Measurement.longitude,
+    Measurement.height,
+    Measurement.building_name,
+    Measurement.download_speed,
+    Measurement.upload_speed,
+    Measurement.ping,
+    Measurement.download_speed_sum,
+    Measurement.upload_speed_sum,
+    Measurement.ping_sum,
+    Measurement.measurement_count,
+    Measurement.color,
+    Measurement.timestamp,
+)
+EXPORT_PARTITION_SIZE = 1000
+
+# Nazwa zbioru w tabeli dataset_versions, której wersja zmienia się przy każdym zapisie pomiarów
+DATASET_NAME = "measurements"
+
+# Maksymalna liczba parametrów w jednej klauzuli IN (limit zmiennych SQLite)
+IN_CLAUSE_CHUNK = 500
+
+
+def _naive(timestamp: datetime) -> datetime:
+    """Znaczniki czasu wczytane z SQLite nie mają strefy – porównuj bez niej"""
+    return timestamp.replace(tzinfo=None)
+
+
+def derived_values(download_speed_sum, upload_speed_sum, ping_sum, count) -> dict:
+    """Wartości SET średnich i koloru agregatu, wyliczone w SQL z podanych sum i liczby pomiarów"""
+    download_speed = download_speed_sum / count
+    upload_speed = upload_speed_sum / count
+    ping = cast(cast(ping_sum, Float) / count, Integer)
+
+    return {
+        "download_speed": download_speed,
+        "upload_speed": upload_speed,
+        "ping": ping,
+        "color": scoring_engine.color_expression(download_speed, upload_speed, ping),
+    }
+
+
+def increment_values(derived: bool = True) -> dict:
+    """
+    Wartości SET dopisujące pomiary (parametry b_dl, b_ul, b_ping – sumy, b_count – liczba,
+    b_timestamp) do agregatu w jednym UPDATE. Wszystkie prawe strony odwołują się do wartości sprzed
+    aktualizacji, więc równoległe zapisy do tego samego agregatu się nie nadpisują.
+    Przy derived=False zmieniane są tylko sumy, liczba i czas – średnie i kolor można wtedy
+    przeliczyć dla wielu agregatów naraz jednym UPDATE z derived_values() na kolumnach sum.
+    """
+    values = {
+        "download_speed_sum": Measurement.download_speed_sum + bindparam("b_dl"),
+        "upload_speed_sum": Measurement.upload_speed_sum + bindparam("b_ul"),
+        "ping_sum": Measurement.ping_sum + bindparam("b_ping"),
+        "measurement_count": Measurement.measurement_count + bindparam("b_count"),
+        "timestamp": func.coalesce(bindparam("b_timestamp"), Measurement.timestamp),
+    }
+    if derived:
+        values.update(derived_values(
+            values["download_speed_sum"],
+            values["upload_speed_sum"],
+            values["ping_sum"],
+            values["measurement_count"],
+        ))
+    return values
+
+
+def increment_params(
+    download_speed: Optional[float],
+    upload_speed: Optional[float],
+    ping: Optional[int],
+    timestamp: Optional[datetime],
+    count: int = 1,
+) -> dict:
+    """Parametry dla increment_values(); przy count > 1 prędkości i ping są sumami"""
+    return {
+        "b_dl": download_speed or 0.0,
+        "b_ul": upload_speed or 0.0,
+        "b_ping": ping or 0,
+        "b_count": count,
+        "b_timestamp": timestamp,
+    }
 
 
 class MeasurementService:
     def __init__(self, db: Session):
         self.db = db
-        self.proximity_threshold_meters = 4.0
+        self.proximity_threshold_meters = MERGE_RADIUS_METERS
+        self.height_tolerance_meters = HEIGHT_BAND_METERS
 
-    def create_measurement(self, measurement_data: MeasurementBase) -> Measurement:
+    def create_measurement(
+        self, measurement_data: MeasurementBase, user_id: Optional[int] = None
+    ) -> Measurement:
         """Stwórz nowy pomiar i przypisz do odpowiedniej strefy"""
+        measurement, merged = self.create_measurements([measurement_data], [user_id])[0]
+        if merged:
+            logger.debug(f"Measurement ID: {measurement.id} updated.")
+        else:
+            logger.debug("Nearby measurement not found. New measurement added.")
+        return measurement
+
+    def create_measurements(
+        self,
+        measurements_data: List[MeasurementBase],
+        user_ids: Optional[List[Optional[int]]] = None,
+    ) -> List[Tuple[Measurement, bool]]:
+        """
+        Zapisz paczkę pomiarów w jednej transakcji, razem z ich próbkami w dzienniku
+        surowych pomiarów (dokładne usuwanie i odbudowa agregatów z dziennika).
+
+        Budynki są klasyfikowane wsadowo, a kandydaci do scalenia wczytywani jednym
+        zapytaniem po komórkach siatki. Pomiary są przetwarzane w kolejności, więc
+        późniejszy pomiar może trafić do agregatu utworzonego wcześniej w tej samej paczce.
+        user_ids to autorzy poszczególnych pomiarów (None – anonimowy).
+        Zwraca (agregat, czy_scalono) dla każdego pomiaru, w kolejności wejściowej.
+        """
+        if len(measurements_data) > MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Maksymalny rozmiar paczki to {MAX_BATCH_SIZE}",
+            )
+        if not measurements_data:
+            # pusta paczka niczego nie zmienia – bez podbicia wersji zbioru i unieważniania ETagów
+            return []
+
         try:
-            if measurement_data.latitude is None or measurement_data.longitude is None:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Brak wymaganych współrzędnych",
-                )
+            now = self._now()
+            # rollupy według czasu pomiaru – bufor offline odtworzony przez /batch nie trafia
+            # w całości w godzinę wysłania; agregat, jak dotąd, dostaje czas zapisu
+            measured_at = [self._measured_at(m.timestamp, now) for m in measurements_data]
+            results = self.merge_measurements(
+                measurements_data,
+                timestamps=[now] * len(measurements_data),
+                user_ids=user_ids,
+                measured_at=measured_at,
+            )
+            self._log_raw_samples(measurements_data, [m.id for m, _ in results], now, measured_at)
+            record_changes(self.db, (m.id for m, _ in results))
+            self.bump_dataset_version()
+            self.db.commit()
 
-            utc_plus_2 = timezone(timedelta(hours=2))
-            timestamp = datetime.now(utc_plus_2)
+            # odśwież wszystkie agregaty po commicie jednym zapytaniem zamiast po jednym na obiekt;
+            # populate_existing, bo przyrosty scalonych agregatów zostały policzone w bazie
+            touched_ids = list({m.id for m, _ in results})
+            for chunk_start in range(0, len(touched_ids), IN_CLAUSE_CHUNK):
+                self.db.query(Measurement).populate_existing().filter(
+                    Measurement.id.in_(touched_ids[chunk_start:chunk_start + IN_CLAUSE_CHUNK])
+                ).all()
 
-            new_measurement = Measurement(
+            # scalony agregat zachowuje własne współrzędne – unieważniamy jego kafelki, nie próbki
+            tile_cache.invalidate_points((m.latitude, m.longitude) for m, _ in results)
+            merged = sum(1 for _, was_merged in results if was_merged)
+            count_ingested("api", merged, len(results) - merged)
+            raw_measurements_received_total.inc(amount=len(results))
+            return results
+
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error podczas tworzenia pomiaru: {str(e)}",
+            )
+
+    def create_raw_measurement(self, measurement_data: MeasurementBase) -> RawMeasurement:
+        """
+        Dopisz surowy pomiar do dziennika (raw_measurements) jednym INSERT-em.
+        Do agregatu trafi dopiero przy kompaktowaniu (app.jobs.compactor), więc wersja
+        zbioru i kafelki się tu nie zmieniają.
+        """
+        try:
+            now = self._now()
+            raw = RawMeasurement(
                 latitude=measurement_data.latitude,
                 longitude=measurement_data.longitude,
                 height=measurement_data.height,
                 download_speed=measurement_data.download_speed,
                 upload_speed=measurement_data.upload_speed,
                 ping=measurement_data.ping,
-                building_name=find_building(
-                    measurement_data.latitude,
-                    measurement_data.longitude ),
+                received_at=now,
+                measured_at=self._measured_at(measurement_data.timestamp, now),
+            )
+            self.db.add(raw)
+            self.db.commit()
+            raw_measurements_received_total.inc()
+            return raw
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error podczas zapisu surowego pomiaru: {str(e)}",
+            )
+
+    def _log_raw_samples(
+        self,
+        measurements_data: List[MeasurementBase],
+        aggregate_ids: List[int],
+        received_at: datetime,
+        measured_at: List[datetime],
+    ) -> None:
+        """Dopisz do dziennika próbki już scalone z agregatami – jeden executemany, bez commita"""
+        self.db.execute(
+            insert(RawMeasurement),
+            [
+                {
+                    "latitude": data.latitude,
+                    "longitude": data.longitude,
+                    "height": data.height,
+                    "download_speed": data.download_speed,
+                    "upload_speed": data.upload_speed,
+                    "ping": data.ping,
+                    "received_at": received_at,
+                    "measured_at": sample_measured_at,
+                    "aggregate_id": aggregate_id,
+                }
+                for data, aggregate_id, sample_measured_at in zip(measurements_data, aggregate_ids, measured_at)
+            ],
+        )
+
+    def merge_measurements(
+        self,
+        measurements_data: List[MeasurementBase],
+        timestamps: Optional[List[datetime]] = None,
+        user_ids: Optional[List[Optional[int]]] = None,
+        measured_at: Optional[List[datetime]] = None,
+    ) -> List[Tuple[Measurement, bool]]:
+        """
+        Scal pomiary z agregatami w bieżącej transakcji, bez commita (wspólne dla API
+        i kompaktora – commit, zmiany i wersja zbioru należą do wołającego).
+        timestamps to czasy zapisu do agregatów (domyślnie – teraz), a measured_at – czasy
+        wykonania pomiarów, według których liczone są rollupy (domyślnie – timestamps).
+        Po flush nowe agregaty mają już id. Nowy agregat dostaje user_id autora pomiaru, który go
+        utworzył – scalenie nie zmienia autora agregatu.
+        """
+        if timestamps is None:
+            timestamps = [self._now()] * len(measurements_data)
+        if user_ids is None:
+            user_ids = [None] * len(measurements_data)
+        if measured_at is None:
+            measured_at = timestamps
+
+        buildings = find_buildings(
+            [m.latitude for m in measurements_data],
+            [m.longitude for m in measurements_data],
+        )
+        cells = [
+            neighbour_cells(m.latitude, m.longitude, self.proximity_threshold_meters)
+            for m in measurements_data
+        ]
+        aggregates_by_cell = self._load_aggregates_by_cell(
+            {cell for item_cells in cells for cell in item_cells},
+            set(buildings),
+            self.candidate_height_bands([m.height for m in measurements_data]),
+        )
+
+        results = []
+        created = []
+        increments = []
+        building_deltas = {}
+        for data, building_name, item_cells, timestamp, user_id in zip(
+            measurements_data, buildings, cells, timestamps, user_ids
+        ):
+            building_deltas.setdefault(building_name, BuildingStatsDelta()).add(
+                data.download_speed, data.upload_speed, data.ping, timestamp
+            )
+            aggregate = self.find_nearby_aggregate(
+                aggregates_by_cell, item_cells,
+                data.latitude, data.longitude, data.height, building_name,
+            )
+            if aggregate is not None:
+                if aggregate.id is None:
+                    # agregat utworzony w tej paczce – jeszcze nie ma go w bazie
+                    self._add_to_aggregate(
+                        aggregate, data.download_speed, data.upload_speed, data.ping, timestamp
+                    )
+                else:
+                    increments.append({
+                        "b_id": aggregate.id,
+                        **increment_params(
+                            data.download_speed, data.upload_speed, data.ping, timestamp
+                        ),
+                    })
+                    # tylko na potrzeby wyboru najnowszego agregatu w dalszej części paczki
+                    set_committed_value(aggregate, "timestamp", timestamp)
+                results.append((aggregate, True))
+                continue
+
+            aggregate = Measurement(
+                user_id=user_id,
+                latitude=data.latitude,
+                longitude=data.longitude,
+                height=data.height,
+                download_speed=data.download_speed,
+                upload_speed=data.upload_speed,
+                ping=data.ping,
+                building_name=building_name,
                 timestamp=timestamp,
+                # brak wartości liczy się jak 0 – tak jak w sumach i przy imporcie
                 color=self.calculate_color(
-                    measurement_data.download_speed, 
-                    measurement_data.upload_speed,
-                    measurement_data.ping ),
+                    data.download_speed or 0.0,
+                    data.upload_speed or 0.0,
+                    data.ping or 0 ),
                 measurement_count=1,
-                download_speed_sum=measurement_data.download_speed,
-                upload_speed_sum=measurement_data.upload_speed,
-                ping_sum=measurement_data.ping
+                download_speed_sum=data.download_speed or 0.0,
+                upload_speed_sum=data.upload_speed or 0.0,
+                ping_sum=data.ping or 0,
+                grid_cell=grid_cell(data.latitude, data.longitude),
+                height_band=height_band(data.height),
             )
+            aggregates_by_cell.setdefault(aggregate.grid_cell, []).append(aggregate)
+            created.append(aggregate)
+            results.append((aggregate, False))
 
-            # Get measurements in the same building
-            measurements_in_bulidng = ( 
-                self.db.query(Measurement)
-                .filter(Measurement.building_name == new_measurement.building_name)
-                .order_by(Measurement.timestamp.desc())
-                .all() 
+        self.db.add_all(created)
+        if increments:
+            # jeden wiersz parametrów na scalony pomiar – atomowe przyrosty w jednym executemany
+            self.db.execute(
+                update(Measurement.__table__)
+                .where(Measurement.__table__.c.id == bindparam("b_id"))
+                .values(increment_values()),
+                increments,
             )
+        apply_building_deltas(self.db, building_deltas)
+        apply_rollup_deltas(
+            self.db,
+            buildings,
+            [m.latitude for m in measurements_data],
+            [m.longitude for m in measurements_data],
+            measured_at,
+            [m.download_speed for m in measurements_data],
+            [m.upload_speed for m in measurements_data],
+            [m.ping for m in measurements_data],
+        )
+        self.db.flush()
+        return results
 
-            updated_or_created_measurement = None
+    def _now(self) -> datetime:
+        utc_plus_2 = timezone(timedelta(hours=2))
+        return datetime.now(utc_plus_2)
 
-            for measurement in measurements_in_bulidng:
-                d = haversine_distance( 
-                    new_measurement.latitude,
-                    new_measurement.longitude, 
-                    measurement.latitude, 
-                    measurement.longitude   
-                )
+    def _measured_at(self, timestamp: Optional[datetime], now: datetime) -> datetime:
+        """
+        Czas pomiaru podany przez klienta (np. z bufora offline), w strefie _now(),
+        nie późniejszy niż teraz; bez czasu – teraz. Czas bez strefy traktujemy jako lokalny.
+        """
+        if timestamp is None:
+            return now
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=now.tzinfo)
+        return min(timestamp.astimezone(now.tzinfo), now)
 
-                # if new measurement is within 5 meters of exisitng measurement and on the same alt then update
-                if d <= 5 and (measurement.height-1 <= measurement.height <= measurement.height+1):
-                    update_measurement_data = MeasurementUpdate(
-                        latitude=new_measurement.latitude,
-                        longitude=new_measurement.longitude,
-                        height=new_measurement.height,
-                        download_speed=new_measurement.download_speed,
-                        upload_speed=new_measurement.upload_speed,
-                        ping=new_measurement.ping,
-                        timestamp=timestamp,
-                        building_name=new_measurement.building_name 
-                    )
-                    updated_or_created_measurement = self.update_measurement(measurement.id, update_measurement_data)
-                    print(f'Measurement ID: {measurement.id} updated.')
-                    break
-            
-            if not updated_or_created_measurement:
-                self.db.add(new_measurement)
-                self.db.commit()
-                self.db.refresh(new_measurement)
-                updated_or_created_measurement = new_measurement
-                print(f'Nearby measurement not found. New measurement added.')
-            
-            return updated_or_created_measurement
+    def candidate_height_bands(self, heights: List[Optional[float]]) -> Optional[set]:
+        """
+        Pasma wysokości, w których mogą leżeć agregaty do scalenia, lub None gdy
+        któraś wysokość jest nieznana (wtedy pasuje każde pasmo).
+        Szerokość pasma równa jest tolerancji wysokości, więc wystarczą pasma sąsiednie.
+        """
+        bands = set()
+        for height in heights:
+            band = height_band(height)
+            if band is None:
+                return None
+            bands.update((band - 1, band, band + 1))
+        return bands
 
-        except SQLAlchemyError as e:
-            self.db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error podczas tworzenia pomiaru: {str(e)}",
+    def _load_aggregates_by_cell(
+        self, cells: set, building_names: set, height_bands: Optional[set] = None
+    ) -> dict[int, List[Measurement]]:
+        """
+        Wczytaj agregaty z podanych komórek siatki, budynków i pasm wysokości
+        (indeks idx_grid_cell), pogrupowane po komórce.
+        """
+        cells = list(cells)
+        aggregates_by_cell: dict[int, List[Measurement]] = {}
+        for chunk_start in range(0, len(cells), IN_CLAUSE_CHUNK):
+            query = self.db.query(Measurement).filter(
+                Measurement.grid_cell.in_(cells[chunk_start:chunk_start + IN_CLAUSE_CHUNK]),
+                Measurement.building_name.in_(building_names),
             )
+            if height_bands is not None:
+                query = query.filter(
+                    or_(
+                        Measurement.height_band.in_(height_bands),
+                        Measurement.height_band.is_(None),
+                    )
+                )
+            for measurement in query:
+                aggregates_by_cell.setdefault(measurement.grid_cell, []).append(measurement)
+        return aggregates_by_cell
+
+    def find_nearby_aggregate(
+        self,
+        aggregates_by_cell: dict[int, List[Measurement]],
+        cells: List[int],
+        latitude: float,
+        longitude: float,
+        height: Optional[float],
+        building_name: Optional[str],
+    ) -> Optional[Measurement]:
+        """
+        Znajdź najnowszy agregat w tym samym budynku, w promieniu scalania i na tej samej wysokości.
+        """
+        nearest = None
+        for cell in cells:
+            for measurement in aggregates_by_cell.get(cell, ()):
+                if measurement.building_name != building_name:
+                    continue
+                if not self._heights_match(height, measurement.height):
+                    continue
+                d = haversine_distance(latitude, longitude, measurement.latitude, measurement.longitude)
+                if d > self.proximity_threshold_meters:
+                    continue
+                if nearest is None or _naive(measurement.timestamp) > _naive(nearest.timestamp):
+                    nearest = measurement
+        return nearest
+
+    def _add_to_aggregate(
+        self,
+        aggregate: Measurement,
+        download_speed: Optional[float],
+        upload_speed: Optional[float],
+        ping: Optional[int],
+        timestamp: datetime,
+    ) -> None:
+        """Dolicz pojedynczy pomiar do agregatu w pamięci"""
+        aggregate.download_speed_sum += download_speed or 0.0
+        aggregate.upload_speed_sum += upload_speed or 0.0
+        aggregate.ping_sum += ping or 0
+        aggregate.measurement_count += 1
+
+        count = aggregate.measurement_count
+        aggregate.download_speed = aggregate.download_speed_sum / count
+        aggregate.upload_speed = aggregate.upload_speed_sum / count
+        aggregate.ping = int(aggregate.ping_sum / count)
+        aggregate.color = self.calculate_color(
+            aggregate.download_speed,
+            aggregate.upload_speed,
+            aggregate.ping,
+        )
+        aggregate.timestamp = timestamp
+
+    def get_dataset_version(self) -> int:
+        """Aktualna wersja zbioru pomiarów (0, jeśli nic jeszcze nie zapisano)"""
+        version = self.db.scalar(
+            select(DatasetVersion.version).where(DatasetVersion.name == DATASET_NAME)
+        )
+        return version or 0
+
+    def bump_dataset_version(self) -> None:
+        """Podbij wersję zbioru w bieżącej transakcji – razem z zapisem, który ją zmienia"""
+        bumped = self.db.execute(
+            update(DatasetVersion)
+            .where(DatasetVersion.name == DATASET_NAME)
+            .values(version=DatasetVersion.version + 1)
+        )
+        if bumped.rowcount == 0:
+            self.db.add(DatasetVersion(name=DATASET_NAME, version=1))
+
+    def _heights_match(self, height: Optional[float], other_height: Optional[float]) -> bool:
+        """Nieznana wysokość pasuje do każdej innej"""
+        if height is None or other_height is None:
+            return True
+        return abs(height - other_height) <= self.height_tolerance_meters
 
     def get_measurement(self, measurement_id: int):
         measurement = self.db.get(Measurement, measurement_id)
@@ -110,120 +524,393 @@ class MeasurementService:
 
     def get_measurements(
         self,
-        # skip: int = 0,
-        # limit: int = 50,
-        # building_name: Optional[str] = None,
-        # latitude: Optional[float] = None,
-        # longitude: Optional[float] = None,
-        # radius_km: float = 1.0,
-    ) -> List[Measurement]:
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        building_name: Optional[str] = None,
+        bbox: Optional[Tuple[Optional[float], ...]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[Row], Optional[str]]:
         """
-        Jeśli podano building_name – zwróć pomiary dla tego budynku.
-        Jeśli podano latitude i longitude – zwróć agregaty w promieniu radius_km.
+        Zwróć stronę agregatów (od najnowszych) i kursor następnej strony.
+
+        Stronicowanie po kluczu (timestamp, id) – kolejne strony nie używają OFFSET,
+        więc koszt strony nie rośnie wraz z jej numerem. Filtry są wykonywane w SQL
+        z użyciem indeksów idx_timestamp, idx_building_name i idx_coordinates.
+        bbox to (min_latitude, max_latitude, min_longitude, max_longitude).
+        Wiersze mają kolumny EXPORT_COLUMNS – bez obiektów ORM i walidacji Pydantic.
         """
+        if limit > MAX_PAGE_LIMIT:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Maksymalny limit to {MAX_PAGE_LIMIT}"
+            )
 
-        all_measurements = ( self.db.query(Measurement)
-                            .order_by(Measurement.timestamp.desc())
-                            .all() )
+        query = select(*EXPORT_COLUMNS)
 
-        if not all_measurements:
+        if building_name:
+            query = query.where(Measurement.building_name == building_name)
+
+        if bbox and any(v is not None for v in bbox):
+            if any(v is None for v in bbox):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Podaj wszystkie granice obszaru: min/max latitude i min/max longitude",
+                )
+            min_lat, max_lat, min_lon, max_lon = bbox
+            query = query.where(
+                Measurement.latitude.between(min_lat, max_lat),
+                Measurement.longitude.between(min_lon, max_lon),
+            )
+
+        if since:
+            query = query.where(Measurement.timestamp >= since)
+        if until:
+            query = query.where(Measurement.timestamp < until)
+
+        if cursor:
+            try:
+                cursor_timestamp, cursor_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            query = query.where(
+                tuple_(Measurement.timestamp, Measurement.id) < tuple_(cursor_timestamp, cursor_id)
+            )
+
+        page = self.db.execute(
+            query.order_by(Measurement.timestamp.desc(), Measurement.id.desc()).limit(limit)
+        ).all()
+
+        if not page and not cursor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Nie znaleziono pomiarów"
             )
-        
-        return all_measurements
-     
-        # MAX_LIMIT = 200
-        # if limit > MAX_LIMIT:
-        #     raise HTTPException(
-        #         status_code=status.HTTP_400_BAD_REQUEST,
-        #         detail=f"Maksymalny limit to {MAX_LIMIT}"
-        #     )
-
-        # if building_name:
-        #     return (
-        #         self.db.query(Measurement)
-        #         .filter(Measurement.building_name == building_name)
-        #         .order_by(Measurement.timestamp.desc())
-        #         .offset(skip)
-        #         .limit(limit)
-        #         .all()
-        #     )
-
-        # if latitude is not None and longitude is not None:
-        #     radius_m = radius_km * 1000
-        #     delta = radius_km * 0.01
-        #     records = self.db.query(Measurement).filter(
-        #         Measurement.latitude.between(latitude - delta, latitude + delta),
-        #         Measurement.longitude.between(longitude - delta, longitude + delta)
-        #     ).all()
-
-        #     results: List[dict] = []
-        #     for m in records:
-        #         d = haversine_distance(latitude, longitude, m.latitude, m.longitude)
-        #         if d <= radius_m:
-        #             results.append({
-        #                 "id": m.id,
-        #                 "latitude": m.latitude,
-        #                 "longitude": m.longitude,
-        #                 "building_name": m.building_name,
-        #                 # sumy
-        #                 "download_speed_sum": m.download_speed_sum,
-        #                 "upload_speed_sum": m.upload_speed_sum,
-        #                 "ping_sum": m.ping_sum,
-        #                 "measurement_count": m.measurement_count,
-        #                 # średnie
-        #                 "download_speed": m.download_speed,
-        #                 "upload_speed": m.upload_speed,
-        #                 "ping": m.ping,
-        #                 "color": m.color,
-        #                 "timestamp": m.timestamp,
-        #                 # dodatkowo
-        #                 "distance_m": d,
-        #             })
-        #     results.sort(key=lambda x: x["distance_m"])
-        #     return results[skip: skip + limit]
-
-        # raise HTTPException(
-        #     status_code=status.HTTP_400_BAD_REQUEST,
-        #     detail="Podaj albo building_name, albo latitude i longitude"
-        # )
 
-    def update_measurement(self, measurement_id: int, new_data: MeasurementUpdate):
-        """Add a new measurement to an existing geographic point"""
-        db_measurement = self.get_measurement(measurement_id)
-        update_data = new_data.model_dump(exclude_unset=True)
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = encode_cursor(page[-1].timestamp, page[-1].id)
+
+        return page, next_cursor
+
+    def iter_export_partitions(
+        self,
+        building_name: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        partition_size: int = EXPORT_PARTITION_SIZE,
+    ) -> Iterator[List[tuple]]:
+        """
+        Wiersze eksportu (kolumny EXPORT_COLUMNS, po id) w partycjach po partition_size.
 
-        if "timestamp" in update_data:
-            db_measurement.timestamp = update_data["timestamp"]
-
-        # 1. Update the sum fields and count
-        new_dl = update_data.get("download_speed", 0.0) or 0.0
-        new_ul = update_data.get("upload_speed", 0.0) or 0.0
-        new_ping = update_data.get("ping", 0) or 0
-
-        db_measurement.download_speed_sum += new_dl
-        db_measurement.upload_speed_sum += new_ul
-        db_measurement.ping_sum += new_ping
-        db_measurement.measurement_count += 1
-
-        # 2. Recalculate averages
-        count = db_measurement.measurement_count
-        db_measurement.download_speed = db_measurement.download_speed_sum / count
-        db_measurement.upload_speed = db_measurement.upload_speed_sum / count
-        db_measurement.ping = int(db_measurement.ping_sum / count)
-
-        # 3. Update color if relevant
-        db_measurement.color = self.calculate_color(
-            db_measurement.download_speed,
-            db_measurement.upload_speed,
-            db_measurement.ping,
+        Zwracane są krotki z kursora (yield_per), bez obiektów ORM, więc pamięć
+        nie zależy od liczby wierszy. Generator trzyma otwarty kursor – sesja musi
+        żyć do końca iteracji.
+        """
+        query = select(*EXPORT_COLUMNS)
+        if building_name:
+            query = query.where(Measurement.building_name == building_name)
+        if since:
+            query = query.where(Measurement.timestamp >= since)
+        if until:
+            query = query.where(Measurement.timestamp < until)
+
+        result = self.db.execute(
+            query.order_by(Measurement.id).execution_options(yield_per=partition_size)
         )
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    def get_changes(self, since: int = 0, limit: int = MAX_PAGE_LIMIT) -> dict:
+        """
+        Agregaty zmienione po zmianie numer since (w kolejności zmian) i id usuniętych.
+
+        Koszt zależy od liczby zmian, a nie od rozmiaru zbioru – wyszukiwanie po kluczu
+        głównym measurement_changes i po id agregatu. cursor to numer ostatniej zwróconej
+        zmiany (since dla kolejnego zapytania); has_more oznacza, że zmian jest więcej niż limit.
+        """
+        if limit > MAX_PAGE_LIMIT:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Maksymalny limit to {MAX_PAGE_LIMIT}"
+            )
+
+        rows = self.db.execute(
+            select(MeasurementChange.seq, MeasurementChange.measurement_id, MeasurementChange.deleted, *EXPORT_COLUMNS)
+            .outerjoin(Measurement, Measurement.id == MeasurementChange.measurement_id)
+            .where(MeasurementChange.seq > since)
+            .order_by(MeasurementChange.seq)
+            .limit(limit + 1)
+        ).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        changed, deleted = [], []
+        for row in rows:
+            if row.deleted or row.id is None:
+                deleted.append(row.measurement_id)
+            else:
+                changed.append(row[3:])
+        return {
+            "changed": changed,
+            "deleted": deleted,
+            "cursor": rows[-1].seq if rows else since,
+            "has_more": has_more,
+        }
+
+    def get_changes_cursor(self) -> int:
+        """Numer ostatniej zmiany (0, jeśli nic jeszcze nie zapisano) – kursor „od teraz”"""
+        return self.db.scalar(select(func.max(MeasurementChange.seq))) or 0
+
+    def get_nearby_measurements(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_meters: float,
+        limit: int = 100,
+    ) -> List[Tuple[Measurement, float]]:
+        """
+        Zwróć co najwyżej `limit` agregatów w promieniu radius_meters od punktu,
+        posortowanych rosnąco po odległości, razem z odległością w metrach.
+
+        Kandydaci są wstępnie wybierani w SQL prostokątem (idx_coordinates),
+        a odległości liczone są jednym wektorowym przebiegiem NumPy.
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_meters)
+        candidates = self.db.execute(
+            select(Measurement.id, Measurement.latitude, Measurement.longitude).where(
+                Measurement.latitude.between(min_lat, max_lat),
+                Measurement.longitude.between(min_lon, max_lon),
+            )
+        ).all()
+        if not candidates:
+            return []
+
+        ids, lats, lons = (np.array(column) for column in zip(*candidates))
+        distances = haversine_distances(latitude, longitude, lats, lons)
+
+        within = np.flatnonzero(distances <= radius_meters)
+        if within.size > limit:
+            within = within[np.argpartition(distances[within], limit - 1)[:limit]]
+        within = within[np.argsort(distances[within], kind="stable")]
+
+        nearest_ids = ids[within].tolist()
+        measurements = {
+            m.id: m
+            for m in self.db.query(Measurement).filter(Measurement.id.in_(nearest_ids))
+        }
+        return [(measurements[i], float(d)) for i, d in zip(nearest_ids, distances[within])]
+
+    def get_tile(self, z: int, x: int, y: int) -> List[dict]:
+        """
+        Zagreguj agregaty kafelka z/x/y (Web Mercator) w siatkę TILE_GRID_SIZE x TILE_GRID_SIZE.
+
+        Grupowanie odbywa się w SQL na kolumnach sum i liczników, więc odpowiedź ma
+        najwyżej TILE_GRID_SIZE² komórek niezależnie od liczby pomiarów w kafelku.
+        Położenie komórki to środek ciężkości jej agregatów ważony liczbą pomiarów.
+        """
+        min_lat, max_lat, min_lon, max_lon = tile_bounds(z, x, y)
+
+        col = func.min(
+            cast((Measurement.longitude - min_lon) * (TILE_GRID_SIZE / (max_lon - min_lon)), Integer),
+            TILE_GRID_SIZE - 1,
+        )
+        # wiersze w Mercatorze nie są równe w stopniach – krawędzie wyznaczone z góry
+        edges = tile_row_edges(z, y)
+        row = case(
+            *((Measurement.latitude > edge, index) for index, edge in enumerate(edges[:-1])),
+            else_=len(edges) - 1,
+        )
+        count = func.sum(Measurement.measurement_count)
+
+        rows = self.db.execute(
+            select(
+                row,
+                col,
+                count,
+                func.sum(Measurement.latitude * Measurement.measurement_count),
+                func.sum(Measurement.longitude * Measurement.measurement_count),
+                func.sum(Measurement.download_speed_sum),
+                func.sum(Measurement.upload_speed_sum),
+                func.sum(Measurement.ping_sum),
+            )
+            .where(
+                Measurement.latitude > min_lat,
+                Measurement.latitude <= max_lat,
+                Measurement.longitude >= min_lon,
+                Measurement.longitude < max_lon,
+                Measurement.measurement_count > 0,
+            )
+            .group_by(row, col)
+            .order_by(row, col)
+        ).all()
+
+        cells = []
+        for cell_row, cell_col, n, lat_sum, lon_sum, dl_sum, ul_sum, ping_sum in rows:
+            download_speed = dl_sum / n
+            upload_speed = ul_sum / n
+            ping = int(ping_sum / n)
+            cells.append({
+                "row": cell_row,
+                "col": cell_col,
+                "latitude": lat_sum / n,
+                "longitude": lon_sum / n,
+                "measurement_count": n,
+                "download_speed": download_speed,
+                "upload_speed": upload_speed,
+                "ping": ping,
+                "color": self.calculate_color(download_speed, upload_speed, ping),
+            })
+        return cells
+
+    def get_building_stats(self, building_name: str) -> dict:
+        """Podsumowanie budynku z tabeli building_stats – jeden odczyt po kluczu"""
+        stats = self.db.get(BuildingStats, building_name)
+        if stats is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Brak pomiarów w budynku"
+            )
+        return building_stats_dict(stats)
+
+    def get_all_building_stats(self) -> List[dict]:
+        """Podsumowania wszystkich budynków, alfabetycznie"""
+        return [
+            building_stats_dict(stats)
+            for stats in self.db.scalars(select(BuildingStats).order_by(BuildingStats.building_name))
+        ]
+
+    def get_trends(
+        self,
+        period: str = "hour",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        building_name: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ) -> List[dict]:
+        """
+        Średnie w przedziałach czasu z rollupów (bez czytania pomiarów): dla budynku,
+        dla komórki siatki wokół punktu albo dla całego kampusu.
+        period = "hour_of_day" składa godzinowe rollupy w profil doby (24 przedziały).
+        """
+        if latitude is not None and longitude is not None:
+            table = CellRollup.__table__
+            scope = table.c.cell == rollup_cell(latitude, longitude)
+        else:
+            table = BuildingRollup.__table__
+            scope = table.c.building_name == building_name if building_name is not None else None
+
+        hour_of_day = period == "hour_of_day"
+        bucket = (
+            cast(func.strftime("%H", table.c.bucket_start), Integer) if hour_of_day else table.c.bucket_start
+        ).label("bucket")
+        count = func.sum(table.c.measurement_count)
+        query = (
+            select(
+                bucket,
+                count,
+                func.sum(table.c.download_speed_sum),
+                func.sum(table.c.upload_speed_sum),
+                func.sum(table.c.ping_sum),
+            )
+            .where(table.c.period == ("hour" if hour_of_day else period))
+            .group_by(bucket)
+            .having(count > 0)
+            .order_by(bucket)
+        )
+        if scope is not None:
+            query = query.where(scope)
+        if since is not None:
+            query = query.where(table.c.bucket_start >= _naive(since))
+        if until is not None:
+            query = query.where(table.c.bucket_start < _naive(until))
+
+        trends = []
+        for bucket_value, n, download_speed_sum, upload_speed_sum, ping_sum in self.db.execute(query):
+            download_speed = download_speed_sum / n
+            upload_speed = upload_speed_sum / n
+            ping = int(ping_sum / n)
+            trends.append({
+                "bucket_start": None if hour_of_day else bucket_value,
+                "hour_of_day": bucket_value if hour_of_day else None,
+                "measurement_count": n,
+                "download_speed": download_speed,
+                "upload_speed": upload_speed,
+                "ping": ping,
+                "color": self.calculate_color(download_speed, upload_speed, ping),
+            })
+        return trends
+
+    def update_measurement(self, measurement_id: int, new_data: MeasurementUpdate):
+        """
+        Add a new measurement to an existing geographic point.
+
+        Sums, count, averages and color are updated by a single atomic
+        UPDATE ... RETURNING, so concurrent updates of the same point are not lost.
+        """
+        update_data = new_data.model_dump(exclude_unset=True)
 
-        # 4. Commit updates
         try:
+            db_measurement = self.db.scalars(
+                update(Measurement)
+                .where(Measurement.id == measurement_id)
+                .values(increment_values())
+                .returning(Measurement),
+                increment_params(
+                    update_data.get("download_speed"),
+                    update_data.get("upload_speed"),
+                    update_data.get("ping"),
+                    update_data.get("timestamp"),
+                ),
+            ).one_or_none()
+            if db_measurement is None:
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Pomiar nie znaleziony"
+                )
+
+            now = self._now()
+            measured_at = self._measured_at(update_data.get("timestamp"), now)
+            # próbka w dzienniku w miejscu agregatu – odbudowa scali ją z tym samym punktem
+            self._log_raw_samples(
+                [MeasurementBase.model_construct(
+                    latitude=db_measurement.latitude,
+                    longitude=db_measurement.longitude,
+                    height=db_measurement.height,
+                    download_speed=update_data.get("download_speed"),
+                    upload_speed=update_data.get("upload_speed"),
+                    ping=update_data.get("ping"),
+                )],
+                [db_measurement.id],
+                now,
+                [measured_at],
+            )
+
+            delta = BuildingStatsDelta()
+            delta.add(
+                update_data.get("download_speed"),
+                update_data.get("upload_speed"),
+                update_data.get("ping"),
+                db_measurement.timestamp,
+            )
+            apply_building_deltas(self.db, {db_measurement.building_name: delta})
+            apply_rollup_deltas(
+                self.db,
+                [db_measurement.building_name],
+                [db_measurement.latitude],
+                [db_measurement.longitude],
+                [measured_at],
+                [update_data.get("download_speed")],
+                [update_data.get("upload_speed")],
+                [update_data.get("ping")],
+            )
+            record_changes(self.db, [db_measurement.id])
+            self.bump_dataset_version()
             self.db.commit()
-            self.db.refresh(db_measurement)
+            tile_cache.invalidate_points([(db_measurement.latitude, db_measurement.longitude)])
+            count_ingested("api", 1, 0)
+            raw_measurements_received_total.inc()
             return db_measurement
 
         except SQLAlchemyError as e:
@@ -240,28 +927,65 @@ class MeasurementService:
 
         # jeśli jest więcej niż 1 pomiar w agregacie
         if measurement.measurement_count > 1:
-            measurement.measurement_count -= 1
+            try:
+                raw = self.db.scalar(
+                    select(RawMeasurement)
+                    .where(RawMeasurement.aggregate_id == measurement.id)
+                    .order_by(RawMeasurement.id.desc())
+                    .limit(1)
+                )
+                if raw is not None:
+                    # najnowsza próbka z dziennika – odejmujemy dokładnie jej wartości
+                    self._remove_raw_sample(raw)
+                else:
+                    # agregat sprzed dziennika – zostaje tylko odjęcie średniej (rollupów nie ma)
+                    measurement.measurement_count -= 1
 
-            dl = measurement.download_speed or 0.0
-            ul = measurement.upload_speed or 0.0
-            pg = measurement.ping or 0
+                    dl = measurement.download_speed or 0.0
+                    ul = measurement.upload_speed or 0.0
+                    pg = measurement.ping or 0
 
-            measurement.download_speed_sum -= dl
-            measurement.upload_speed_sum -= ul
-            measurement.ping_sum -= pg
+                    measurement.download_speed_sum -= dl
+                    measurement.upload_speed_sum -= ul
+                    measurement.ping_sum -= pg
 
-            # przeliczamy nowe średnie
-            measurement.download_speed = measurement.download_speed_sum / measurement.measurement_count
-            measurement.upload_speed = measurement.upload_speed_sum / measurement.measurement_count
-            measurement.ping = int(measurement.ping_sum / measurement.measurement_count)
+                    # przeliczamy nowe średnie
+                    measurement.download_speed = measurement.download_speed_sum / measurement.measurement_count
+                    measurement.upload_speed = measurement.upload_speed_sum / measurement.measurement_count
+                    measurement.ping = int(measurement.ping_sum / measurement.measurement_count)
 
-            self.db.commit()
-            self.db.refresh(measurement)
-            return measurement
+                    subtract_building_stats(self.db, measurement.building_name, dl, ul, pg)
+                    record_changes(self.db, [measurement.id])
+
+                self.bump_dataset_version()
+                self.db.commit()
+                self.db.refresh(measurement)
+                tile_cache.invalidate_points([(measurement.latitude, measurement.longitude)])
+                return measurement
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Error podczas usuwania pomiaru: {str(e)}",
+                )
 
         try:
+            point = (measurement.latitude, measurement.longitude)
+            subtract_building_stats(
+                self.db,
+                measurement.building_name,
+                measurement.download_speed_sum,
+                measurement.upload_speed_sum,
+                measurement.ping_sum,
+                measurement.measurement_count,
+            )
+            self._subtract_raw_rollups(measurement)
+            self.db.execute(delete(RawMeasurement).where(RawMeasurement.aggregate_id == measurement.id))
             self.db.delete(measurement)
+            record_changes(self.db, [measurement.id], deleted=True)
+            self.bump_dataset_version()
             self.db.commit()
+            tile_cache.invalidate_points([point])
             return {"message": "Pomiar usunięty"}
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -270,35 +994,103 @@ class MeasurementService:
                 detail=f"Error podczas usuwania pomiaru: {str(e)}",
             )
 
+    def delete_raw_measurement(self, raw_id: int):
+        """Usuń surowy pomiar z dziennika i dokładnie jego wartości z agregatu, do którego trafił"""
+        raw = self.db.get(RawMeasurement, raw_id)
+        if raw is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Pomiar nie znaleziony"
+            )
+
+        try:
+            point = self._remove_raw_sample(raw)
+            if point is not None:
+                self.bump_dataset_version()
+            self.db.commit()
+            if point is not None:
+                tile_cache.invalidate_points([point])
+            return {"message": "Pomiar usunięty"}
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error podczas usuwania pomiaru: {str(e)}",
+            )
+
+    def _remove_raw_sample(self, raw: RawMeasurement) -> Optional[Tuple[float, float]]:
+        """
+        Usuń próbkę z dziennika w bieżącej transakcji, bez commita. Jeśli była już
+        skompaktowana, jej wartości są odejmowane od agregatu i budynku ujemnym przyrostem,
+        a agregat bez pomiarów jest usuwany (zmiana agregatu trafia do measurement_changes).
+        Zwraca współrzędne zmienionego agregatu (None dla próbki nieskompaktowanej).
+        """
+        self.db.execute(delete(RawMeasurement).where(RawMeasurement.id == raw.id))
+        if raw.aggregate_id is None:
+            return None
+
+        table = Measurement.__table__
+        aggregate = self.db.execute(
+            update(table)
+            .where(table.c.id == raw.aggregate_id)
+            .values(increment_values())
+            .returning(
+                table.c.measurement_count, table.c.building_name, table.c.latitude, table.c.longitude
+            ),
+            increment_params(
+                -(raw.download_speed or 0.0), -(raw.upload_speed or 0.0), -(raw.ping or 0), None, count=-1
+            ),
+        ).one()
+        subtract_building_stats(
+            self.db, aggregate.building_name, raw.download_speed, raw.upload_speed, raw.ping
+        )
+        apply_rollup_deltas(
+            self.db,
+            [aggregate.building_name],
+            [raw.latitude],
+            [raw.longitude],
+            [raw.measured_at or raw.received_at],
+            [-(raw.download_speed or 0.0)],
+            [-(raw.upload_speed or 0.0)],
+            [-(raw.ping or 0)],
+            counts=[-1],
+        )
+        deleted = aggregate.measurement_count <= 0
+        if deleted:
+            self.db.execute(delete(table).where(table.c.id == raw.aggregate_id))
+        record_changes(self.db, [raw.aggregate_id], deleted=deleted)
+        return aggregate.latitude, aggregate.longitude
+
+    def _subtract_raw_rollups(self, measurement: Measurement) -> None:
+        """
+        Odejmij od rollupów próbki z dziennika należące do usuwanego agregatu. API, kompaktor
+        i importer zapisują każdą próbkę do dziennika, a migracja liczy rollupy tylko z dziennika,
+        więc pomiary bez próbek (sprzed dziennika) nie mają rollupów do odjęcia.
+        """
+        raw = RawMeasurement.__table__
+        samples = self.db.execute(
+            select(
+                raw.c.latitude, raw.c.longitude, func.coalesce(raw.c.measured_at, raw.c.received_at),
+                raw.c.download_speed, raw.c.upload_speed, raw.c.ping,
+            ).where(raw.c.aggregate_id == measurement.id)
+        ).all()
+        if not samples:
+            return
+        latitudes, longitudes, timestamps, download_speeds, upload_speeds, pings = zip(*samples)
+        apply_rollup_deltas(
+            self.db,
+            [measurement.building_name] * len(samples),
+            latitudes,
+            longitudes,
+            timestamps,
+            [-(value or 0.0) for value in download_speeds],
+            [-(value or 0.0) for value in upload_speeds],
+            [-(value or 0) for value in pings],
+            counts=[-1] * len(samples),
+        )
+
     def calculate_color(self, download_speed: float, upload_speed: float, ping: float) -> str:
         """
         Wyznacz kolor na podstawie znormalizowanych i uśrednionych prędkości wyników testu
         """
-        
-        min_download = 1
-        max_download = 150
-        min_upload = 1
-        max_upload = 100
-        min_ping = 8
-        max_ping = 600
-
-        normalized_download = ((download_speed - min_download) / (max_download - min_download)) * 100
-        normalized_upload = ((upload_speed - min_upload) / (max_upload - min_upload)) * 100
-        normalized_ping = (1 - ((ping - min_ping) / (max_ping - min_ping))) * 100
-
-        download_w = 5
-        upload_w = 3
-        ping_w = 2
-
-        score = (
-            (download_w * normalized_download) + 
-            (upload_w * normalized_upload) +
-            (ping_w * normalized_ping)) / (download_w + upload_w + ping_w)
-        
-        if score <= 20:
-            return '#B22D2D'
-        elif score > 20 and score <= 60:
-            return '#E4A316'
-        elif score > 60:
-            return '#67B22D'
+        return scoring_engine.color(download_speed, upload_speed, ping)
         
\ No newline at end of file
@@ -0,0 +1,48 @@
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.crud.measurement import MeasurementService
+
+
+class AsyncMeasurementService:
+    """
+    Asynchroniczna nakładka na MeasurementService – każda publiczna metoda
+    serwisu jest dostępna jako korutyna, więc handlery nie blokują pętli zdarzeń.
+
+    Z AsyncSession (aiosqlite) logika serwisu działa przez AsyncSession.run_sync,
+    a zapytania i commity wykonuje sterownik asynchroniczny. Z klasyczną Session
+    wywołanie trafia do puli wątków.
+    """
+
+    def __init__(self, runner: Callable[..., Awaitable[Any]]):
+        self._run = runner
+
+    @classmethod
+    def from_session(cls, db: Session) -> "AsyncMeasurementService":
+        service = MeasurementService(db)
+
+        def runner(method: str, *args, **kwargs):
+            return run_in_threadpool(getattr(service, method), *args, **kwargs)
+
+        return cls(runner)
+
+    @classmethod
+    def from_async_session(cls, db: AsyncSession) -> "AsyncMeasurementService":
+        def runner(method: str, *args, **kwargs):
+            return db.run_sync(
+                lambda sync_db: getattr(MeasurementService(sync_db), method)(*args, **kwargs)
+            )
+
+        return cls(runner)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not callable(getattr(MeasurementService, name, None)):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self._run(name, *args, **kwargs)
+
+        return call
@@ -0,0 +1,129 @@
+from typing import Optional, Sequence
+
+import numpy as np
+from decouple import config
+from sqlalchemy import delete, tuple_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models import BuildingRollup, CellRollup
+from app.utils.grid import grid_cells
+
+# Bok komórki siatki trendów – dużo większy niż komórka scalania, żeby przedziałów nie było zbyt wiele
+ROLLUP_CELL_SIZE_METERS = config("ROLLUP_CELL_SIZE_METERS", default=100.0, cast=float)
+
+# Okresy rollupów i odpowiadające im jednostki numpy.datetime64
+ROLLUP_PERIODS = {"hour": "h", "day": "D"}
+
+_SUM_COLUMNS = ("measurement_count", "download_speed_sum", "upload_speed_sum", "ping_sum")
+
+
+def rollup_cell(latitude: float, longitude: float) -> int:
+    """Komórka rollupu, w której leży punkt"""
+    return int(grid_cells([latitude], [longitude], ROLLUP_CELL_SIZE_METERS)[0])
+
+
+def _values(values, dtype) -> np.ndarray:
+    """Tablica wartości; brak wartości (None) liczy się jak 0 – tak jak w sumach agregatów"""
+    if isinstance(values, np.ndarray):
+        return values.astype(dtype)
+    return np.array([value or 0 for value in values], dtype=dtype)
+
+
+def _timestamps(timestamps) -> np.ndarray:
+    """Znaczniki czasu jako datetime64 bez strefy (czas lokalny, jak w kolumnach DateTime)"""
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == "M":
+        return timestamps.astype("datetime64[us]")
+    return np.array([timestamp.replace(tzinfo=None) for timestamp in timestamps], dtype="datetime64[us]")
+
+
+def _rollup_rows(scope_column: str, scopes: np.ndarray, timestamps: np.ndarray, sums: dict) -> list:
+    """Wiersze rollupu – sumy zgrupowane po (zakres, okres, początek przedziału), w kolejności klucza"""
+    rows = []
+    for period, unit in ROLLUP_PERIODS.items():
+        buckets = timestamps.astype(f"datetime64[{unit}]")
+        keys, group = np.unique(
+            np.stack([scopes, buckets.astype(np.int64)], axis=1), axis=0, return_inverse=True
+        )
+        group = group.reshape(-1)
+        grouped = {}
+        for name, values in sums.items():
+            grouped[name] = np.zeros(len(keys), dtype=values.dtype)
+            np.add.at(grouped[name], group, values)
+
+        starts = keys[:, 1].astype(f"datetime64[{unit}]").astype("datetime64[us]").tolist()
+        for i, (scope, start) in enumerate(zip(keys[:, 0].tolist(), starts)):
+            rows.append({
+                scope_column: scope,
+                "period": period,
+                "bucket_start": start,
+                **{name: grouped[name][i].item() for name in _SUM_COLUMNS},
+            })
+    return rows
+
+
+def _upsert_rollups(db: Session, model, scope_column: str, rows: list) -> None:
+    if not rows:
+        return
+    table = model.__table__
+    statement = insert(table)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c[scope_column], table.c.period, table.c.bucket_start],
+            set_={name: table.c[name] + statement.excluded[name] for name in _SUM_COLUMNS},
+        ),
+        rows,
+    )
+    if any(row["measurement_count"] < 0 for row in rows):
+        # odjęte próbki – przedziały, w których nic nie zostało, znikają
+        touched = [(row[scope_column], row["period"], row["bucket_start"]) for row in rows]
+        db.execute(
+            delete(table).where(
+                tuple_(table.c[scope_column], table.c.period, table.c.bucket_start).in_(touched),
+                table.c.measurement_count <= 0,
+            )
+        )
+
+
+def apply_rollup_deltas(
+    db: Session,
+    building_names: Sequence[Optional[str]],
+    latitudes,
+    longitudes,
+    timestamps,
+    download_speeds,
+    upload_speeds,
+    pings,
+    counts=None,
+) -> None:
+    """
+    Dolicz pomiary do godzinowych i dziennych rollupów budynków i komórek – jeden
+    INSERT ... ON CONFLICT DO UPDATE na tabelę, z wierszem na przedział.
+    Przy count > 1 prędkości i ping są sumami (jak w increment_params); wartości ujemne
+    (z ujemnym count) odejmują usunięte próbki.
+    """
+    if len(timestamps) == 0:
+        return
+
+    timestamps = _timestamps(timestamps)
+    sums = {
+        "measurement_count": np.ones(len(timestamps), dtype=np.int64) if counts is None else _values(counts, np.int64),
+        "download_speed_sum": _values(download_speeds, float),
+        "upload_speed_sum": _values(upload_speeds, float),
+        "ping_sum": _values(pings, np.int64),
+    }
+
+    cells = grid_cells(latitudes, longitudes, ROLLUP_CELL_SIZE_METERS)
+    _upsert_rollups(db, CellRollup, "cell", _rollup_rows("cell", cells, timestamps, sums))
+
+    known = np.array([name is not None for name in building_names], dtype=bool)
+    if known.any():
+        names, codes = np.unique(np.array(building_names, dtype=object)[known].astype(str), return_inverse=True)
+        rows = _rollup_rows(
+            "building_name", codes.reshape(-1), timestamps[known],
+            {name: values[known] for name, values in sums.items()},
+        )
+        for row in rows:
+            row["building_name"] = names[row["building_name"]].item()
+        _upsert_rollups(db, BuildingRollup, "building_name", rows)
+
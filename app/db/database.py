@@ -1,22 +1,75 @@
+from decouple import config
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from app.db.profiling import SQL_PROFILING, instrument_engine
 import os
 
-DATABASE_URL = "sqlite:///./database.db"
+DATABASE_URL = config("DATABASE_URL", default="sqlite:///./database.db")
+
+# Asynchroniczna ścieżka (aiosqlite) dla routerów; Alembic zawsze używa DATABASE_URL
+ASYNC_DB = config("ASYNC_DB", default=False, cast=bool)
+ASYNC_DATABASE_URL = config(
+    "ASYNC_DATABASE_URL",
+    default=DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1),
+)
+
+# Jak długo połączenie SQLite czeka na zwolnienie blokady zapisu, zanim zgłosi "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = config("SQLITE_BUSY_TIMEOUT_MS", default=5000, cast=int)
 
 engine = create_engine(
     DATABASE_URL, 
     connect_args={"check_same_thread": False}
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# bez wygaszania po commicie – zwracane obiekty nie wymagają ponownego SELECT-a
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 Base = declarative_base()
 
+async_engine = create_async_engine(ASYNC_DATABASE_URL) if ASYNC_DB else None
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if ASYNC_DB
+    else None
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL pozwala czytać w trakcie zapisu; busy_timeout zamiast natychmiastowego błędu blokady"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # w trybie WAL synchronous=NORMAL nie grozi uszkodzeniem bazy, a oszczędza fsync przy każdym commicie
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+if async_engine is not None and async_engine.dialect.name == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+if SQL_PROFILING:
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+
 def get_db():
     """Dependency for getting a database session"""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_session_factory():
+    """
+    Dependency zwracająca fabrykę sesji – dla odpowiedzi strumieniowanych,
+    które otwierają i zamykają sesję same, na czas wysyłania treści
+    """
+    return SessionLocal
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
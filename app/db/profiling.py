@@ -0,0 +1,153 @@
+"""
+Opcjonalne profilowanie zapytań SQL (SQL_PROFILING=True).
+
+Zdarzenia before/after_cursor_execute silnika liczą zapytania i ich czas w obrębie
+żądania HTTP (zmienna kontekstowa ustawiana przez QueryProfilingMiddleware), a odpowiedź
+dostaje nagłówek Server-Timing, np. `db;dur=3.2;desc="4 queries", app;dur=7.9`.
+Zapytania dłuższe niż SLOW_QUERY_MS trafiają do logu razem z EXPLAIN QUERY PLAN.
+
+Zapisy przez kolejkę (INGEST_QUEUE=True) wykonuje zadanie MeasurementWriter poza
+kontekstem żądania – submit() przekazuje statystyki żądania razem z pomiarami, a każde
+żądanie grupy dostaje zapytania całej transakcji grupy, na którą czekało.
+
+Przy wyłączonym profilowaniu nasłuchy i middleware nie są w ogóle rejestrowane,
+więc ścieżka zapytań jest taka sama jak bez tego modułu.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from decouple import config
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQL_PROFILING = config("SQL_PROFILING", default=False, cast=bool)
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=100.0, cast=float)
+
+# Polecenia, dla których SQLite potrafi pokazać plan zapytania
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Zapytania wykonane w trakcie jednego żądania"""
+
+    count: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.seconds += other.seconds
+
+
+# Obiekt jest współdzielony z wątkami puli (run_in_threadpool kopiuje kontekst),
+# więc zapytania z synchronicznych endpointów trafiają do statystyk tego samego żądania
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _request_stats.get()
+
+
+@contextmanager
+def collect_query_stats(stats: QueryStats) -> Iterator[QueryStats]:
+    """Licz zapytania w bloku do stats – dla pracy wykonywanej poza kontekstem żądania"""
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.profiling_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.profiling_started
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            f"[slow_query] {elapsed * 1000:.1f} ms"
+            f"{' (executemany)' if executemany else ''}: {statement}"
+            f"{_query_plan(conn, statement, parameters, executemany)}"
+        )
+
+
+def _query_plan(conn, statement: str, parameters, executemany: bool) -> str:
+    """EXPLAIN QUERY PLAN na tym samym połączeniu (w tej samej transakcji) co zapytanie"""
+    if conn.dialect.name != "sqlite" or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return ""
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            rows = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        finally:
+            cursor.close()
+    except Exception as e:
+        return f"\n  (brak planu: {e})"
+    # wiersze (id, parent, notused, detail) – wcięcie według głębokości w drzewie planu
+    depth = {0: 0}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, 0) + 1
+        lines.append(f"\n  {'  ' * (depth[node_id] - 1)}{detail}")
+    return "".join(lines)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Podepnij liczenie zapytań i log wolnych zapytań pod silnik (dla AsyncEngine – pod sync_engine)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _server_timing(stats: QueryStats, total_seconds: float) -> bytes:
+    return (
+        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries", '
+        f"app;dur={total_seconds * 1000:.1f}"
+    ).encode()
+
+
+class QueryProfilingMiddleware:
+    """
+    Czysty middleware ASGI: statystyki zapytań żądania w nagłówku Server-Timing.
+    Nagłówek wysyłany jest na początku odpowiedzi, więc zapytania z treści
+    strumieniowanej (np. eksport, kafelki) nie są w nim uwzględnione.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - started)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
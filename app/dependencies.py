@@ -0,0 +1,20 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.crud import AsyncMeasurementService
+from app.db.database import ASYNC_DB, get_async_db, get_db
+
+
+if ASYNC_DB:
+    async def get_measurement_service(
+        db: AsyncSession = Depends(get_async_db),
+    ) -> AsyncMeasurementService:
+        """Serwis pomiarów na sesji asynchronicznej (aiosqlite)"""
+        return AsyncMeasurementService.from_async_session(db)
+else:
+    async def get_measurement_service(
+        db: Session = Depends(get_db),
+    ) -> AsyncMeasurementService:
+        """Serwis pomiarów na sesji synchronicznej wykonywanej w puli wątków"""
+        return AsyncMeasurementService.from_session(db)
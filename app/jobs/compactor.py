@@ -0,0 +1,226 @@
+"""
+Kompaktowanie dziennika surowych pomiarów (raw_measurements) do agregatów.
+
+POST /measurements/raw zapisuje pomiar jednym INSERT-em, a kompaktor co
+COMPACTION_INTERVAL_SECONDS zbiera oczekujące próbki (aggregate_id IS NULL, indeks częściowy
+idx_raw_pending) w porcje po COMPACTION_BATCH_SIZE i scala każdą porcję jedną transakcją –
+tą samą logiką co create_measurements – z czasem odebrania próbki jako czasem agregatu,
+a rollupami według czasu pomiaru podanego przez klienta (measured_at).
+Zwykłe zapisy przez API trafiają do dziennika od razu, już z aggregate_id.
+Próbki zachowują aggregate_id, więc usuwanie pomiaru odejmuje dokładne wartości,
+a agregaty można odbudować od zera z innym promieniem scalania (--rebuild).
+
+Użycie (z katalogu głównego repozytorium):
+    python -m app.jobs.compactor [--once]
+    python -m app.jobs.compactor --rebuild [--radius 10]
+"""
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from decouple import config
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.crud.changes import record_changes
+from app.crud.measurement import MAX_BATCH_SIZE, MERGE_RADIUS_METERS, MeasurementService
+from app.db.database import SessionLocal
+from app.models import BuildingRollup, BuildingStats, CellRollup, Measurement, RawMeasurement
+from app.schemas import MeasurementBase
+from app.utils.metrics import count_ingested
+from app.utils.tiles import tile_cache
+
+logger = logging.getLogger(__name__)
+
+COMPACTOR = config("COMPACTOR", default=False, cast=bool)
+COMPACTION_INTERVAL_SECONDS = config("COMPACTION_INTERVAL_SECONDS", default=1.0, cast=float)
+COMPACTION_BATCH_SIZE = config("COMPACTION_BATCH_SIZE", default=MAX_BATCH_SIZE, cast=int)
+
+
+class MeasurementCompactor:
+    """Scala oczekujące surowe pomiary z agregatami, porcja po porcji"""
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = COMPACTION_BATCH_SIZE,
+        merge_radius_meters: float = MERGE_RADIUS_METERS,
+    ):
+        self.db = db
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.service = MeasurementService(db)
+        self.service.proximity_threshold_meters = merge_radius_meters
+
+    def compact_once(self) -> int:
+        """Skompaktuj jedną porcję najstarszych oczekujących próbek; zwraca ich liczbę"""
+        raw = RawMeasurement.__table__
+        rows = self.db.execute(
+            select(raw)
+            .where(raw.c.aggregate_id.is_(None))
+            .order_by(raw.c.id)
+            .limit(self.batch_size)
+        ).all()
+        if not rows:
+            return 0
+
+        try:
+            results = self.service.merge_measurements(
+                [
+                    MeasurementBase.model_construct(
+                        latitude=row.latitude,
+                        longitude=row.longitude,
+                        height=row.height,
+                        download_speed=row.download_speed,
+                        upload_speed=row.upload_speed,
+                        ping=row.ping,
+                    )
+                    for row in rows
+                ],
+                timestamps=[row.received_at for row in rows],
+                measured_at=[row.measured_at or row.received_at for row in rows],
+            )
+            # posortowane po id – kolejne UPDATE trafiają w sąsiednie strony B-drzewa
+            assigned = self.db.execute(
+                update(raw)
+                .where(raw.c.id == bindparam("b_id"), raw.c.aggregate_id.is_(None))
+                .values(aggregate_id=bindparam("b_aggregate_id")),
+                sorted(
+                    ({"b_id": row.id, "b_aggregate_id": aggregate.id} for row, (aggregate, _) in zip(rows, results)),
+                    key=lambda params: params["b_id"],
+                ),
+            )
+            if assigned.rowcount != len(rows):
+                # część próbek usunięto w międzyczasie – porcja zostanie powtórzona przy następnym przebiegu
+                self.db.rollback()
+                return 0
+            record_changes(self.db, (aggregate.id for aggregate, _ in results))
+            self.service.bump_dataset_version()
+            # scalony agregat zachowuje własne współrzędne – unieważniamy jego kafelki, nie próbki
+            points = [(aggregate.latitude, aggregate.longitude) for aggregate, _ in results]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        tile_cache.invalidate_points(points)
+        merged = sum(1 for _, was_merged in results if was_merged)
+        count_ingested("compactor", merged, len(rows) - merged)
+        return len(rows)
+
+    def compact_all(self) -> int:
+        """Kompaktuj porcjami, aż nie zostanie żadna oczekująca próbka"""
+        total = 0
+        while True:
+            compacted = self.compact_once()
+            if compacted == 0:
+                return total
+            total += compacted
+            logger.info(f"[compactor] skompaktowano {total:,} próbek")
+
+    def pending_count(self) -> int:
+        return self.db.scalar(
+            select(func.count()).select_from(RawMeasurement).where(RawMeasurement.aggregate_id.is_(None))
+        )
+
+    def rebuild(self) -> int:
+        """
+        Zbuduj wszystkie agregaty, podsumowania budynków i rollupy od nowa z dziennika,
+        z promieniem scalania tego kompaktora. Do uruchamiania offline – w trakcie
+        odbudowy API widzi niepełny zbiór.
+        """
+        covered = self.db.scalar(
+            select(func.count()).select_from(RawMeasurement).where(RawMeasurement.aggregate_id.is_not(None))
+        )
+        aggregated = self.db.scalar(select(func.coalesce(func.sum(Measurement.measurement_count), 0)))
+        if covered != aggregated:
+            raise RuntimeError(
+                f"Agregaty zawierają {aggregated} pomiarów, a dziennik tylko {covered} – "
+                "odbudowa straciłaby pomiary spoza dziennika"
+            )
+
+        self.db.execute(update(RawMeasurement).values(aggregate_id=None))
+        # nagrobki wszystkich agregatów – nowe (nawet z tym samym id) dostaną późniejsze zmiany
+        record_changes(self.db, select(Measurement.id), deleted=True)
+        self.db.execute(delete(Measurement))
+        self.db.execute(delete(BuildingStats))
+        self.db.execute(delete(BuildingRollup))
+        self.db.execute(delete(CellRollup))
+        self.service.bump_dataset_version()
+        self.db.commit()
+        # SQLite użyje tych samych id dla nowych agregatów – stare obiekty nie mogą zostać w sesji
+        self.db.expunge_all()
+        tile_cache.clear()
+        return self.compact_all()
+
+
+class BackgroundCompactor:
+    """Zadanie w pętli zdarzeń aplikacji, które co interval_seconds kompaktuje dziennik w puli wątków"""
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        interval_seconds: float = COMPACTION_INTERVAL_SECONDS,
+        batch_size: int = COMPACTION_BATCH_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self._compact)
+            except Exception as e:
+                logger.error(f"[BackgroundCompactor] {e}")
+            await asyncio.sleep(self.interval)
+
+    def _compact(self) -> int:
+        with self.session_factory() as db:
+            return MeasurementCompactor(db, batch_size=self.batch_size).compact_all()
+
+
+background_compactor = BackgroundCompactor()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Kompaktowanie surowych pomiarów do agregatów")
+    parser.add_argument("--once", action="store_true", help="jedna porcja zamiast wszystkich oczekujących")
+    parser.add_argument("--rebuild", action="store_true", help="odbuduj wszystkie agregaty z dziennika")
+    parser.add_argument("--radius", type=float, default=MERGE_RADIUS_METERS, help="promień scalania w metrach")
+    parser.add_argument("--batch-size", type=int, default=COMPACTION_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    with SessionLocal() as db:
+        compactor = MeasurementCompactor(db, batch_size=args.batch_size, merge_radius_meters=args.radius)
+        if args.rebuild:
+            compacted = compactor.rebuild()
+        elif args.once:
+            compacted = compactor.compact_once()
+        else:
+            compacted = compactor.compact_all()
+        logger.info(f"[compactor] gotowe – {compacted:,} próbek, oczekuje {compactor.pending_count():,}")
+
+
+if __name__ == "__main__":
+    main()
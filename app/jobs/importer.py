@@ -0,0 +1,608 @@
+"""
+Import historycznych kampanii pomiarowych do bazy.
+
+Obsługiwane formaty (wykrywane automatycznie):
+- tabele z powłoki sqlite w trybie kolumnowym (pomiary/*.txt) – nagłówek, linia kresek, wiersze,
+- wiersze rozdzielane znakiem | z nagłówkiem (data.txt).
+
+Wiersze z kolumną measurement_count są traktowane jako gotowe agregaty (sumy + liczba),
+pozostałe jako pojedyncze pomiary. Budynki są klasyfikowane na nowo, a pomiary scalane
+tak jak w MeasurementService.create_measurements (promień 5 m, ta sama wysokość i budynek).
+
+Każdy pomiar trafia też do dziennika surowych pomiarów (raw_measurements), już z aggregate_id
+i czasem z pliku – gotowy agregat jako measurement_count próbek ze średnimi, których sumy są
+dokładnie sumami z pliku. Usuwanie odejmuje więc próbki (razem z ich rollupami),
+a kompaktor może odbudować agregaty z dziennika.
+
+Import jest idempotentny: postęp zapisywany jest w measurement_imports w tej samej
+transakcji co każda porcja, więc ponowne uruchomienie pomija zaimportowane pliki
+i wznawia przerwane od pierwszego niezatwierdzonego wiersza.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m app.jobs.importer pomiary/*.txt data.txt [--chunk-size 250000]
+"""
+import argparse
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy import String, bindparam, func, insert, or_, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+from app.crud.building_stats import BuildingStatsDelta, apply_building_deltas
+from app.crud.changes import record_changes
+from app.crud.rollups import apply_rollup_deltas
+from app.crud.measurement import (
+    IN_CLAUSE_CHUNK,
+    MeasurementService,
+    derived_values,
+    increment_params,
+    increment_values,
+)
+from app.db.database import SessionLocal
+from app.models import Measurement, MeasurementImport, RawMeasurement
+from app.utils.buildings import find_buildings
+from app.utils.distance_utils import EARTH_RADIUS_METERS, bounding_box, haversine_distances
+from app.utils.grid import grid_cell, height_band, neighbour_cell_pairs, neighbour_cells
+from app.utils.metrics import count_ingested, raw_measurements_received_total
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 250_000
+HASH_BLOCK_SIZE = 1 << 20
+
+
+@dataclass(slots=True)
+class SurveyRecord:
+    """Pojedynczy pomiar lub gotowy agregat z pliku kampanii"""
+
+    latitude: float
+    longitude: float
+    height: Optional[float]
+    download_speed_sum: float
+    upload_speed_sum: float
+    ping_sum: int
+    measurement_count: int
+    timestamp: datetime
+
+
+@dataclass(slots=True)
+class _Aggregate:
+    """
+    Lekki odpowiednik Measurement dla agregatów tworzonych w bieżącej porcji –
+    utworzenie setek tysięcy obiektów ORM kosztowałoby więcej niż sam import.
+    """
+
+    latitude: float
+    longitude: float
+    height: Optional[float]
+    building_name: str
+    timestamp: datetime
+    grid_cell: int
+    height_band: Optional[int] = None
+    measurement_count: int = 0
+    download_speed_sum: float = 0.0
+    upload_speed_sum: float = 0.0
+    ping_sum: int = 0
+    id: Optional[int] = None
+
+
+@dataclass
+class _Candidates:
+    """Agregaty z bazy jako tablice kolumn – do dopasowania całej porcji naraz"""
+
+    ids: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    heights: np.ndarray
+    buildings: List[Optional[str]]
+    timestamps: np.ndarray
+    cells: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "_Candidates":
+        return cls(
+            ids=np.empty(0, dtype=np.int64),
+            latitudes=np.empty(0),
+            longitudes=np.empty(0),
+            heights=np.empty(0),
+            buildings=[],
+            timestamps=np.empty(0, dtype="datetime64[us]"),
+            cells=np.empty(0, dtype=np.int64),
+        )
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    created: int = 0
+    merged: int = 0
+    skipped: int = 0
+    already_imported: bool = False
+
+
+def _pipe_rows(header: str, lines: Iterable[str]) -> Iterator[dict]:
+    columns = header.rstrip("\r\n").split("|")
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line:
+            yield dict(zip(columns, line.split("|")))
+
+
+def _fixed_width_rows(header: str, rule: str, lines: Iterable[str]) -> Iterator[dict]:
+    """Kolumny wyznacza linia kresek pod nagłówkiem; kolumna trwa do początku następnej"""
+    starts = [i for i, char in enumerate(rule) if char == "-" and (i == 0 or rule[i - 1] != "-")]
+    bounds = list(zip(starts, starts[1:] + [None]))
+    columns = [header[start:end].strip() for start, end in bounds]
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.strip():
+            yield {column: line[start:end].strip() for column, (start, end) in zip(columns, bounds)}
+
+
+def read_rows(lines: Iterable[str]) -> Iterator[dict]:
+    """Wiersze pliku kampanii jako słowniki kolumna -> tekst (wartość pusta = '')"""
+    lines = iter(lines)
+    header = next(lines, "")
+    if not header.strip():
+        return
+    if "|" in header:
+        yield from _pipe_rows(header, lines)
+    else:
+        yield from _fixed_width_rows(header, next(lines, ""), lines)
+
+
+def _number(value: Optional[str], cast=float):
+    return cast(value) if value not in (None, "") else None
+
+
+def parse_record(row: dict) -> Optional[SurveyRecord]:
+    """Zamień wiersz na SurveyRecord; None dla wierszy niepełnych lub spoza zakresów"""
+    try:
+        latitude = _number(row.get("latitude"))
+        longitude = _number(row.get("longitude"))
+        height = _number(row.get("height"))
+        timestamp = datetime.fromisoformat(row["timestamp"]) if row.get("timestamp") else None
+        count = _number(row.get("measurement_count"), int)
+
+        if count:
+            download_sum = _number(row.get("download_speed_sum")) or 0.0
+            upload_sum = _number(row.get("upload_speed_sum")) or 0.0
+            ping_sum = _number(row.get("ping_sum"), int) or 0
+        else:
+            count = 1
+            download_sum = _number(row.get("download_speed")) or 0.0
+            upload_sum = _number(row.get("upload_speed")) or 0.0
+            ping_sum = _number(row.get("ping"), int) or 0
+    except (TypeError, ValueError):
+        return None
+
+    if latitude is None or longitude is None or timestamp is None:
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or (height is not None and height < 0):
+        return None
+    if count < 0 or download_sum < 0 or upload_sum < 0 or ping_sum < 0:
+        return None
+
+    return SurveyRecord(
+        latitude=latitude,
+        longitude=longitude,
+        height=height,
+        download_speed_sum=download_sum,
+        upload_speed_sum=upload_sum,
+        ping_sum=ping_sum,
+        measurement_count=count,
+        timestamp=timestamp.replace(tzinfo=None),
+    )
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MeasurementImporter:
+    """Importuje pliki kampanii porcjami po chunk_size wierszy, każda porcja w jednej transakcji"""
+
+    def __init__(self, db: Session, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.service = MeasurementService(db)
+
+    def import_file(self, path: str) -> ImportStats:
+        stats = ImportStats()
+        source_hash = file_hash(path)
+        progress = self.db.get(MeasurementImport, source_hash)
+        if progress is not None and progress.completed:
+            stats.already_imported = True
+            logger.info(f"[importer] {path}: już zaimportowany, pomijam")
+            return stats
+        if progress is None:
+            progress = MeasurementImport(
+                source_hash=source_hash, source_name=os.path.basename(path), rows_imported=0
+            )
+            self.db.add(progress)
+            self.db.commit()
+
+        started = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            rows = read_rows(f)
+            # wiersze zatwierdzone w przerwanym imporcie
+            stats.rows = sum(1 for _ in islice(rows, progress.rows_imported))
+
+            while chunk := list(islice(rows, self.chunk_size)):
+                records = [record for record in map(parse_record, chunk) if record is not None]
+                stats.skipped += len(chunk) - len(records)
+                created, merged, logged = self._apply_chunk(records)
+                stats.created += created
+                stats.merged += merged
+                stats.rows += len(chunk)
+
+                progress.rows_imported = stats.rows
+                progress.updated_at = datetime.now()
+                self.service.bump_dataset_version()
+                self.db.commit()
+                count_ingested("import", merged, created)
+                raw_measurements_received_total.inc(amount=logged)
+                # zatwierdzone agregaty nie są już potrzebne – pamięć nie rośnie z rozmiarem pliku
+                self.db.expunge_all()
+                self.db.add(progress)
+
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    f"[importer] {path}: {stats.rows:,} wierszy ({stats.rows / elapsed:,.0f}/s), "
+                    f"nowe agregaty {stats.created:,}, scalone {stats.merged:,}, pominięte {stats.skipped:,}"
+                )
+
+        progress.completed = True
+        self.db.commit()
+        return stats
+
+    def _apply_chunk(self, records: List[SurveyRecord]) -> tuple[int, int, int]:
+        """
+        Scal porcję z bazą: dopasowanie do agregatów z bazy wektorowo (numpy), nowe agregaty
+        jednym INSERT, przyrosty jednym executemany UPDATE, próbki do dziennika jednym executemany INSERT.
+        Zwraca (nowe agregaty, scalone rekordy, próbki w dzienniku).
+
+        W odróżnieniu od create_measurements agregat z bazy ma pierwszeństwo przed utworzonym
+        wcześniej w tej samej porcji, a "najnowszy" oznacza najnowszy na początku porcji.
+        """
+        if not records:
+            return 0, 0, 0
+
+        service = self.service
+        radius = service.proximity_threshold_meters
+        latitudes = np.array([r.latitude for r in records])
+        longitudes = np.array([r.longitude for r in records])
+        heights = np.array([np.nan if r.height is None else r.height for r in records])
+        timestamps = np.array([r.timestamp for r in records], dtype="datetime64[us]")
+        buildings = find_buildings(latitudes, longitudes)
+
+        points, cells = neighbour_cell_pairs(latitudes, longitudes, radius)
+        stored = self._load_candidates(
+            latitudes, longitudes, np.unique(cells), set(buildings),
+            service.candidate_height_bands([r.height for r in records]),
+        )
+        match = self._match_candidates(stored, points, cells, latitudes, longitudes, heights, buildings)
+        matched = np.flatnonzero(match >= 0)
+        target = match[matched]
+
+        # przyrosty dla agregatów z bazy – jeden wiersz UPDATE na agregat
+        touched, target = np.unique(target, return_inverse=True)
+        deltas = {}
+        for name in ("download_speed_sum", "upload_speed_sum", "ping_sum", "measurement_count"):
+            values = np.array([getattr(records[i], name) for i in matched.tolist()])
+            delta = np.zeros(len(touched), dtype=values.dtype if len(values) else float)
+            np.add.at(delta, target, values)
+            deltas[name] = delta.tolist()
+        latest = stored.timestamps[touched]
+        np.maximum.at(latest, target, timestamps[matched])
+        increments = [
+            {"b_id": aggregate_id, **increment_params(dl, ul, ping, timestamp, count)}
+            for aggregate_id, dl, ul, ping, count, timestamp in zip(
+                stored.ids[touched].tolist(),
+                deltas["download_speed_sum"],
+                deltas["upload_speed_sum"],
+                deltas["ping_sum"],
+                deltas["measurement_count"],
+                latest.tolist(),
+            )
+        ]
+        # w kolejności id UPDATE-y przechodzą B-drzewo po kolei – wyraźnie szybciej niż losowo
+        increments.sort(key=lambda increment: increment["b_id"])
+
+        # pozostałe rekordy scalane między sobą, kolejno – jak w create_measurements
+        unmatched = np.ones(len(records), dtype=bool)
+        unmatched[matched] = False
+        created: List[_Aggregate] = []
+        aggregates_by_cell: dict[int, List[_Aggregate]] = {}
+        # agregat z porcji każdego niedopasowanego rekordu – id dostanie po INSERT
+        unmatched_aggregates: dict[int, _Aggregate] = {}
+        for i in np.flatnonzero(unmatched).tolist():
+            record, building_name = records[i], buildings[i]
+            aggregate = service.find_nearby_aggregate(
+                aggregates_by_cell,
+                neighbour_cells(record.latitude, record.longitude, radius),
+                record.latitude, record.longitude, record.height, building_name,
+            )
+            if aggregate is None:
+                aggregate = _Aggregate(
+                    latitude=record.latitude,
+                    longitude=record.longitude,
+                    height=record.height,
+                    building_name=building_name,
+                    timestamp=record.timestamp,
+                    measurement_count=record.measurement_count,
+                    download_speed_sum=record.download_speed_sum,
+                    upload_speed_sum=record.upload_speed_sum,
+                    ping_sum=record.ping_sum,
+                    grid_cell=grid_cell(record.latitude, record.longitude),
+                    height_band=height_band(record.height),
+                )
+                aggregates_by_cell.setdefault(aggregate.grid_cell, []).append(aggregate)
+                created.append(aggregate)
+                unmatched_aggregates[i] = aggregate
+                continue
+
+            aggregate.measurement_count += record.measurement_count
+            aggregate.download_speed_sum += record.download_speed_sum
+            aggregate.upload_speed_sum += record.upload_speed_sum
+            aggregate.ping_sum += record.ping_sum
+            aggregate.timestamp = max(aggregate.timestamp, record.timestamp)
+            unmatched_aggregates[i] = aggregate
+
+        if created:
+            table = Measurement.__table__
+            last_id = self.db.scalar(select(func.coalesce(func.max(table.c.id), 0)))
+            self.db.execute(insert(table), [self._row(m) for m in created])
+            # nowe agregaty mają id większe niż dotychczasowe, w kolejności wstawiania –
+            # zmiany jednym INSERT ... SELECT
+            new_ids = select(table.c.id).where(table.c.id > last_id)
+            for aggregate, aggregate_id in zip(created, self.db.scalars(new_ids.order_by(table.c.id))):
+                aggregate.id = aggregate_id
+            record_changes(self.db, new_ids)
+        if increments:
+            table = Measurement.__table__
+            self.db.execute(
+                update(table).where(table.c.id == bindparam("b_id")).values(increment_values(derived=False)),
+                increments,
+            )
+            # średnie i kolor raz na agregat, zbiorczo – wyrażenie koloru jest zbyt drogie na executemany
+            merged_ids = [increment["b_id"] for increment in increments]
+            record_changes(self.db, merged_ids)
+            derived = derived_values(
+                table.c.download_speed_sum, table.c.upload_speed_sum, table.c.ping_sum, table.c.measurement_count
+            )
+            # jawne timestamp = timestamp – inaczej onupdate kolumny nadpisałby czas ostatniego pomiaru
+            derived["timestamp"] = table.c.timestamp
+            for chunk_start in range(0, len(merged_ids), IN_CLAUSE_CHUNK):
+                self.db.execute(
+                    update(table)
+                    .where(table.c.id.in_(merged_ids[chunk_start:chunk_start + IN_CLAUSE_CHUNK]))
+                    .values(derived)
+                )
+        aggregate_ids = np.empty(len(records), dtype=np.int64)
+        aggregate_ids[matched] = stored.ids[match[matched]]
+        for i, aggregate in unmatched_aggregates.items():
+            aggregate_ids[i] = aggregate.id
+        raw_rows = [
+            row
+            for record, aggregate_id in zip(records, aggregate_ids.tolist())
+            for row in self._raw_rows(record, aggregate_id)
+        ]
+        self.db.execute(insert(RawMeasurement.__table__), raw_rows)
+
+        apply_building_deltas(self.db, self._building_deltas(records, buildings, timestamps))
+        # rollupy według czasu rekordu z pliku – zgrupowane wektorowo, wiersz na przedział
+        apply_rollup_deltas(
+            self.db,
+            buildings,
+            latitudes,
+            longitudes,
+            timestamps,
+            np.array([r.download_speed_sum for r in records]),
+            np.array([r.upload_speed_sum for r in records]),
+            np.array([r.ping_sum for r in records]),
+            counts=np.array([r.measurement_count for r in records]),
+        )
+        return len(created), len(records) - len(created), len(raw_rows)
+
+    def _raw_rows(self, record: SurveyRecord, aggregate_id: int) -> Iterator[dict]:
+        """
+        Próbki rekordu do dziennika: measurement_count próbek ze średnimi rekordu, tak żeby
+        sumy próbek były sumami z pliku – prędkości z resztą zaokrągleń w ostatniej próbce,
+        ping (całkowity, jak ping_sum) z resztą dzielenia rozłożoną po 1 ms
+        """
+        count = record.measurement_count
+        download_speed = record.download_speed_sum / count
+        upload_speed = record.upload_speed_sum / count
+        ping, ping_remainder = divmod(record.ping_sum, count)
+        for i in range(count):
+            last = i == count - 1
+            yield {
+                "latitude": record.latitude,
+                "longitude": record.longitude,
+                "height": record.height,
+                "download_speed": record.download_speed_sum - download_speed * (count - 1) if last else download_speed,
+                "upload_speed": record.upload_speed_sum - upload_speed * (count - 1) if last else upload_speed,
+                "ping": (ping + (i < ping_remainder)) or None,
+                "received_at": record.timestamp,
+                "measured_at": record.timestamp,
+                "aggregate_id": aggregate_id,
+            }
+
+    def _building_deltas(self, records: List[SurveyRecord], buildings: List[str], timestamps) -> dict:
+        """Zmiany building_stats dla porcji – sumy i min/max średnich rekordów, wektorowo po budynku"""
+        counts = np.array([r.measurement_count for r in records])
+        download_sums = np.array([r.download_speed_sum for r in records])
+        upload_sums = np.array([r.upload_speed_sum for r in records])
+        ping_sums = np.array([r.ping_sum for r in records])
+        names, building = np.unique(np.array(buildings, dtype=object), return_inverse=True)
+
+        deltas = {}
+        for code, name in enumerate(names.tolist()):
+            mask = building == code
+            count = counts[mask]
+            download, upload, ping = download_sums[mask], upload_sums[mask], ping_sums[mask]
+            pings = np.trunc(ping / count).astype(int)
+            deltas[name] = BuildingStatsDelta(
+                measurement_count=int(count.sum()),
+                download_speed_sum=float(download.sum()),
+                upload_speed_sum=float(upload.sum()),
+                ping_sum=int(ping.sum()),
+                min_download_speed=float((download / count).min()),
+                max_download_speed=float((download / count).max()),
+                min_upload_speed=float((upload / count).min()),
+                max_upload_speed=float((upload / count).max()),
+                min_ping=int(pings.min()),
+                max_ping=int(pings.max()),
+                updated_at=timestamps[mask].max().tolist(),
+            )
+        return deltas
+
+    def _load_candidates(
+        self, latitudes, longitudes, cells: np.ndarray, building_names: set, height_bands: Optional[set]
+    ) -> _Candidates:
+        """
+        Agregaty z bazy, z którymi mogą się scalić rekordy porcji, posortowane po komórce siatki.
+        Jedno zapytanie po prostokącie porcji zamiast tysięcy IN po komórkach; nadmiar odcina filtr komórek.
+        """
+        far = int(np.argmax(np.abs(latitudes)))
+        _, _, min_lon, max_lon = bounding_box(latitudes[far], 0.0, self.service.proximity_threshold_meters)
+        dlat = float(np.degrees(self.service.proximity_threshold_meters / EARTH_RADIUS_METERS))
+        query = select(
+            Measurement.id,
+            Measurement.latitude,
+            Measurement.longitude,
+            Measurement.height,
+            Measurement.building_name,
+            # surowy tekst – numpy parsuje daty ISO wielokrotnie szybciej niż konwersja SQLAlchemy
+            type_coerce(Measurement.timestamp, String),
+            Measurement.grid_cell,
+        ).where(
+            Measurement.latitude.between(latitudes.min() - dlat, latitudes.max() + dlat),
+            Measurement.longitude.between(longitudes.min() + min_lon, longitudes.max() + max_lon),
+            Measurement.grid_cell.is_not(None),
+            Measurement.building_name.in_(building_names),
+        )
+        if height_bands is not None:
+            query = query.where(
+                or_(Measurement.height_band.in_(height_bands), Measurement.height_band.is_(None))
+            )
+        rows = self.db.execute(query).all()
+        if not rows:
+            return _Candidates.empty()
+
+        ids, lats, lons, heights, buildings, timestamps, grid_cells = zip(*rows)
+        grid_cells = np.array(grid_cells, dtype=np.int64)
+        keep = np.flatnonzero(np.isin(grid_cells, cells))
+        keep = keep[np.argsort(grid_cells[keep], kind="stable")]
+        return _Candidates(
+            ids=np.array(ids, dtype=np.int64)[keep],
+            latitudes=np.array(lats, dtype=float)[keep],
+            longitudes=np.array(lons, dtype=float)[keep],
+            heights=np.array(heights, dtype=float)[keep],
+            buildings=[buildings[i] for i in keep.tolist()],
+            timestamps=np.array(timestamps, dtype="datetime64[us]")[keep],
+            cells=grid_cells[keep],
+        )
+
+    def _match_candidates(
+        self, stored: _Candidates, points, cells, latitudes, longitudes, heights, buildings
+    ) -> np.ndarray:
+        """
+        Dla każdego rekordu indeks najnowszego pasującego agregatu z bazy (ten sam budynek,
+        wysokość i promień – jak find_nearby_aggregate) albo -1
+        """
+        match = np.full(len(latitudes), -1, dtype=np.int64)
+        if not len(stored.ids):
+            return match
+
+        # pary (rekord, kandydat) ze wspólnej komórki – kandydaci są posortowani po komórce
+        first = np.searchsorted(stored.cells, cells, side="left")
+        counts = np.searchsorted(stored.cells, cells, side="right") - first
+        record = np.repeat(points, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidate = np.repeat(first, counts) + offsets
+
+        codes = {name: code for code, name in enumerate(set(buildings) | set(stored.buildings))}
+        record_building = np.array([codes[name] for name in buildings])
+        stored_building = np.array([codes[name] for name in stored.buildings])
+        height, other_height = heights[record], stored.heights[candidate]
+        ok = (
+            (record_building[record] == stored_building[candidate])
+            & (
+                np.isnan(height) | np.isnan(other_height)
+                | (np.abs(height - other_height) <= self.service.height_tolerance_meters)
+            )
+        )
+        record, candidate = record[ok], candidate[ok]
+        distances = haversine_distances(
+            latitudes[record], longitudes[record], stored.latitudes[candidate], stored.longitudes[candidate]
+        )
+        within = distances <= self.service.proximity_threshold_meters
+        record, candidate = record[within], candidate[within]
+        if not len(record):
+            return match
+
+        # najnowszy kandydat każdego rekordu: ostatni po sortowaniu (rekord, czas)
+        order = np.lexsort((stored.timestamps[candidate].view(np.int64), record))
+        record, candidate = record[order], candidate[order]
+        last = np.r_[record[1:] != record[:-1], True]
+        match[record[last]] = candidate[last]
+        return match
+
+    def _row(self, aggregate: _Aggregate) -> dict:
+        count = aggregate.measurement_count or 1
+        download_speed = aggregate.download_speed_sum / count
+        upload_speed = aggregate.upload_speed_sum / count
+        ping = int(aggregate.ping_sum / count)
+        return {
+            "latitude": aggregate.latitude,
+            "longitude": aggregate.longitude,
+            "height": aggregate.height,
+            "building_name": aggregate.building_name,
+            "timestamp": aggregate.timestamp,
+            "measurement_count": aggregate.measurement_count,
+            "download_speed_sum": aggregate.download_speed_sum,
+            "upload_speed_sum": aggregate.upload_speed_sum,
+            "ping_sum": aggregate.ping_sum,
+            "download_speed": download_speed,
+            "upload_speed": upload_speed,
+            # ping > 0 w schemacie bazy – pomiary bez pingu zostawiają NULL
+            "ping": ping or None,
+            "color": self.service.calculate_color(download_speed, upload_speed, ping),
+            "grid_cell": aggregate.grid_cell,
+            "height_band": aggregate.height_band,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import plików kampanii pomiarowych")
+    parser.add_argument("paths", nargs="+", help="pliki pomiary/*.txt lub data.txt")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    with SessionLocal() as db:
+        importer = MeasurementImporter(db, chunk_size=args.chunk_size)
+        for path in args.paths:
+            stats = importer.import_file(path)
+            if not stats.already_imported:
+                logger.info(
+                    f"[importer] {path}: gotowe – {stats.rows:,} wierszy, nowe agregaty {stats.created:,}, "
+                    f"scalone {stats.merged:,}, pominięte {stats.skipped:,}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Przeliczenie kolorów wszystkich agregatów i podsumowań budynków po zmianie zakresów, wag
+lub progów wyniku (SCORE_* w .env).
+
+Tabela przetwarzana jest porcjami po id: kolory porcji liczone są wektorowo
+(ScoringEngine.colors) z sum i liczby pomiarów, a zmienione wiersze zapisywane jednym
+executemany UPDATE i zatwierdzane od razu – blokada zapisu trwa tylko tyle, ile zapis porcji,
+więc import i zapisy z API nie czekają na całe przeliczenie.
+UPDATE ma warunek measurement_count = odczytana liczba, więc agregat zmieniony w międzyczasie
+nie dostanie koloru policzonego ze starych sum (kolor policzył mu już zapis, który go zmienił).
+
+Użycie (z katalogu głównego repozytorium):
+    python -m app.jobs.recolor [--chunk-size 20000]
+"""
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.crud.building_stats import building_color
+from app.crud.changes import record_changes
+from app.crud.measurement import MeasurementService
+from app.db.database import SessionLocal
+from app.models import BuildingStats, Measurement
+from app.utils.scoring import ScoringEngine, scoring_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 20_000
+
+
+@dataclass
+class RecolorStats:
+    rows: int = 0
+    changed: int = 0
+    # zmienione przez równoległy zapis między odczytem a UPDATE
+    skipped: int = 0
+
+
+class MeasurementRecolorer:
+    """Przelicza kolory agregatów porcjami po chunk_size wierszy, każda porcja w osobnej transakcji"""
+
+    def __init__(
+        self, db: Session, engine: ScoringEngine = scoring_engine, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        self.db = db
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.service = MeasurementService(db)
+
+    def run(self) -> RecolorStats:
+        stats = RecolorStats()
+        table = Measurement.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.measurement_count == bindparam("b_count"))
+            # jawne timestamp = timestamp – inaczej onupdate kolumny nadpisałby czas ostatniego pomiaru
+            .values(color=bindparam("b_color"), timestamp=table.c.timestamp)
+        )
+
+        started = time.perf_counter()
+        last_id = 0
+        while True:
+            rows = self.db.execute(
+                select(
+                    table.c.id,
+                    table.c.download_speed_sum,
+                    table.c.upload_speed_sum,
+                    table.c.ping_sum,
+                    table.c.measurement_count,
+                    table.c.color,
+                )
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(self.chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            ids, download_sums, upload_sums, ping_sums, counts, colors = zip(*rows)
+            counts = np.array(counts, dtype=float)
+            # te same średnie co derived_values (ping obcięty do całkowitej); 0 pomiarów -> NaN, jak NULL w SQL
+            with np.errstate(divide="ignore", invalid="ignore"):
+                new_colors = self.engine.colors(
+                    np.array(download_sums, dtype=float) / counts,
+                    np.array(upload_sums, dtype=float) / counts,
+                    np.trunc(np.array(ping_sums, dtype=float) / counts),
+                )
+            changed = np.flatnonzero(new_colors != np.array(colors, dtype=object))
+
+            if len(changed):
+                result = self.db.execute(statement, [
+                    {"b_id": ids[i], "b_count": int(counts[i]), "b_color": str(new_colors[i])}
+                    for i in changed.tolist()
+                ])
+                stats.changed += result.rowcount
+                stats.skipped += len(changed) - result.rowcount
+                record_changes(self.db, (ids[i] for i in changed.tolist()))
+                self.service.bump_dataset_version()
+                self.db.commit()
+
+            stats.rows += len(rows)
+            last_id = ids[-1]
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"[recolor] {stats.rows:,} agregatów ({stats.rows / elapsed:,.0f}/s), "
+                f"zmienione {stats.changed:,}, pominięte {stats.skipped:,}"
+            )
+
+        # podsumowania budynków – kilkanaście wierszy, wystarczy jeden UPDATE w SQL
+        buildings = BuildingStats.__table__
+        self.db.execute(update(buildings).values(color=building_color(
+            buildings.c.download_speed_sum,
+            buildings.c.upload_speed_sum,
+            buildings.c.ping_sum,
+            buildings.c.measurement_count,
+            engine=self.engine,
+        )))
+        self.db.commit()
+        return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Przeliczenie kolorów agregatów po zmianie progów wyniku")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    with SessionLocal() as db:
+        stats = MeasurementRecolorer(db, chunk_size=args.chunk_size).run()
+    logger.info(
+        f"[recolor] gotowe – {stats.rows:,} agregatów, zmienione {stats.changed:,}, pominięte {stats.skipped:,}"
+    )
+
+
+if __name__ == "__main__":
+    main()
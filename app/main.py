@@ -1,9 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.database import Base
+from app.db.profiling import SQL_PROFILING, QueryProfilingMiddleware
 from app.routers.user import router as user_router
-from app.db.database import engine
+from app.crud.ingest_queue import INGEST_QUEUE, measurement_writer
+from app.crud.live import notify_on_commit
+from app.auth.passwords import password_hasher
+from app.jobs.compactor import COMPACTOR, background_compactor
+from app.db.database import async_engine, engine
 from app.routers.measurements import router as measurements_router
+from app.routers.buildings import router as buildings_router
+from app.routers.metrics import router as metrics_router
+from app.utils.metrics import MetricsMiddleware, instrument_sessions
 import logging
 from app.models import User
 from app.models import Measurement
@@ -11,7 +20,21 @@ from app.models import Measurement
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if INGEST_QUEUE:
+        await measurement_writer.start()
+    if COMPACTOR:
+        await background_compactor.start()
+    yield
+    await measurement_writer.stop()
+    await background_compactor.stop()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = ["*"]
 
@@ -21,11 +44,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+app.add_middleware(MetricsMiddleware)
+if SQL_PROFILING:
+    app.add_middleware(QueryProfilingMiddleware)
+instrument_sessions()
+notify_on_commit()
 
 Base.metadata.create_all(bind=engine)
 app.include_router(user_router)
 app.include_router(measurements_router)
+app.include_router(buildings_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 async def root():
@@ -1,5 +1,22 @@
+from .building_stats import BuildingStats
+from .dataset_version import DatasetVersion
 from .measurement import Measurement
+from .measurement_change import MeasurementChange
+from .measurement_import import MeasurementImport
 from .post import Post
+from .raw_measurement import RawMeasurement
+from .rollup import BuildingRollup, CellRollup
 from .user import User
 
-__all__ = ["Measurement", "Post", "User"]
+__all__ = [
+    "BuildingRollup",
+    "BuildingStats",
+    "CellRollup",
+    "DatasetVersion",
+    "Measurement",
+    "MeasurementChange",
+    "MeasurementImport",
+    "Post",
+    "RawMeasurement",
+    "User",
+]
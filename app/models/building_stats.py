@@ -0,0 +1,54 @@
+from sqlalchemy import Column, DateTime, Float, Integer, String, text
+from app.db.database import Base
+
+
+class BuildingStats(Base):
+    """Podsumowanie pomiarów budynku, aktualizowane w tej samej transakcji co pomiary"""
+
+    __tablename__ = "building_stats"
+
+    building_name = Column(
+        String,
+        primary_key=True,
+        comment="Name of the building, as in measurements.building_name",
+    )
+    measurement_count = Column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="Number of individual measurements in the building",
+    )
+    download_speed_sum = Column(
+        Float,
+        nullable=False,
+        server_default=text("0.0"),
+        comment="Sum of download speeds in Mbps of all measurements in the building",
+    )
+    upload_speed_sum = Column(
+        Float,
+        nullable=False,
+        server_default=text("0.0"),
+        comment="Sum of upload speeds in Mbps of all measurements in the building",
+    )
+    ping_sum = Column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="Sum of pings in milliseconds of all measurements in the building",
+    )
+    min_download_speed = Column(Float, nullable=True, comment="Lowest download speed ever recorded")
+    max_download_speed = Column(Float, nullable=True, comment="Highest download speed ever recorded")
+    min_upload_speed = Column(Float, nullable=True, comment="Lowest upload speed ever recorded")
+    max_upload_speed = Column(Float, nullable=True, comment="Highest upload speed ever recorded")
+    min_ping = Column(Integer, nullable=True, comment="Lowest ping ever recorded")
+    max_ping = Column(Integer, nullable=True, comment="Highest ping ever recorded")
+    updated_at = Column(
+        DateTime,
+        nullable=True,
+        comment="Timestamp of the latest measurement in the building",
+    )
+    color = Column(
+        String(7),
+        nullable=True,
+        comment="Color indicator of the building averages",
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, text
+from app.db.database import Base
+
+
+class DatasetVersion(Base):
+    """Licznik wersji zbioru danych – zmienia się przy każdym zapisie do zbioru"""
+
+    __tablename__ = "dataset_versions"
+
+    name = Column(
+        String(50),
+        primary_key=True,
+        comment="Name of the dataset, e.g. 'measurements'",
+    )
+    version = Column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="Incremented in the same transaction as every write to the dataset",
+    )
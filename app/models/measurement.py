@@ -96,6 +96,17 @@ class Measurement(Base):
         comment="Name of the building, if applicable"
     )
 
+    grid_cell = Column(
+        Integer,
+        nullable=True,
+        comment="Fixed-size metric grid cell of the point, used for proximity lookups",
+    )
+    height_band = Column(
+        Integer,
+        nullable=True,
+        comment="Height band of the point (NULL when height is unknown)",
+    )
+
     timestamp = Column(
         DateTime,
         nullable=False,
@@ -116,4 +127,5 @@ class Measurement(Base):
         Index("idx_coordinates", "latitude", "longitude"),
         Index("idx_timestamp", "timestamp"),
         Index("idx_building_name", "building_name"),
+        Index("idx_grid_cell", "grid_cell", "building_name", "height_band"),
     )
\ No newline at end of file
@@ -0,0 +1,28 @@
+from sqlalchemy import Boolean, Column, Integer, false
+from app.db.database import Base
+
+
+class MeasurementChange(Base):
+    """Ostatnia zmiana agregatu – jeden wiersz na agregat, z rosnącym numerem zmiany"""
+
+    __tablename__ = "measurement_changes"
+
+    seq = Column(
+        Integer,
+        primary_key=True,
+        comment="Change sequence; AUTOINCREMENT, so numbers are never reused",
+    )
+    measurement_id = Column(
+        Integer,
+        nullable=False,
+        unique=True,
+        comment="Changed aggregate; not a foreign key, tombstones outlive the aggregate",
+    )
+    deleted = Column(
+        Boolean,
+        nullable=False,
+        server_default=false(),
+        comment="Tombstone: the aggregate was deleted",
+    )
+
+    __table_args__ = {"sqlite_autoincrement": True}
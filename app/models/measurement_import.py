@@ -0,0 +1,37 @@
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, text
+from app.db.database import Base
+
+
+class MeasurementImport(Base):
+    """Postęp importu pliku z pomiarami – pozwala wznowić import i nie importować pliku dwa razy"""
+
+    __tablename__ = "measurement_imports"
+
+    source_hash = Column(
+        String(64),
+        primary_key=True,
+        comment="SHA-256 of the imported file contents",
+    )
+    source_name = Column(
+        String,
+        nullable=False,
+        comment="File name the import was started from",
+    )
+    rows_imported = Column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="Number of input rows already applied, committed together with them",
+    )
+    completed = Column(
+        Boolean,
+        nullable=False,
+        server_default=text("0"),
+        comment="Whether the whole file has been imported",
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP"),
+        comment="Time of the last committed chunk",
+    )
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, text
+from app.db.database import Base
+
+
+class RawMeasurement(Base):
+    """Pojedynczy pomiar w dzienniku tylko do dopisywania, zanim (i po tym jak) trafi do agregatu"""
+
+    __tablename__ = "raw_measurements"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    latitude = Column(Float, nullable=False, comment="Geographic latitude of the sample")
+    longitude = Column(Float, nullable=False, comment="Geographic longitude of the sample")
+    height = Column(Float, nullable=True, comment="Height above sea level in meters")
+    download_speed = Column(Float, nullable=True, comment="Download speed in Mbps")
+    upload_speed = Column(Float, nullable=True, comment="Upload speed in Mbps")
+    ping = Column(Integer, nullable=True, comment="Network latency in milliseconds")
+    received_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP"),
+        comment="Time the sample was received; used as the aggregate timestamp on compaction",
+    )
+    measured_at = Column(
+        DateTime,
+        nullable=True,
+        comment="Client-reported time of the sample, clamped to received_at; rollup bucket (NULL – received_at)",
+    )
+    aggregate_id = Column(
+        Integer,
+        ForeignKey("measurements.id"),
+        nullable=True,
+        comment="Aggregate the sample was folded into; NULL while waiting for compaction",
+    )
+
+    __table_args__ = (
+        # kompaktor czyta tylko oczekujące próbki – indeks częściowy zostaje mały
+        Index("idx_raw_pending", "id", sqlite_where=text("aggregate_id IS NULL")),
+        Index("idx_raw_aggregate", "aggregate_id"),
+    )
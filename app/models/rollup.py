@@ -0,0 +1,41 @@
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, text
+from app.db.database import Base
+
+
+class _RollupSums:
+    """Sumy pomiarów w jednym przedziale czasu"""
+
+    measurement_count = Column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="Number of individual measurements taken in the bucket",
+    )
+    download_speed_sum = Column(Float, nullable=False, server_default=text("0.0"), comment="Sum of download speeds in Mbps")
+    upload_speed_sum = Column(Float, nullable=False, server_default=text("0.0"), comment="Sum of upload speeds in Mbps")
+    ping_sum = Column(Integer, nullable=False, server_default=text("0"), comment="Sum of pings in milliseconds")
+
+
+class BuildingRollup(_RollupSums, Base):
+    """Godzinowe i dzienne sumy pomiarów budynku, aktualizowane w tej samej transakcji co pomiary"""
+
+    __tablename__ = "building_rollups"
+
+    building_name = Column(String, primary_key=True, comment="Name of the building")
+    period = Column(String(4), primary_key=True, comment="Bucket length: 'hour' or 'day'")
+    bucket_start = Column(DateTime, primary_key=True, comment="Start of the bucket (local time)")
+
+    __table_args__ = (
+        # trendy całego kampusu – bez filtra budynku
+        Index("idx_building_rollups_period", "period", "bucket_start"),
+    )
+
+
+class CellRollup(_RollupSums, Base):
+    """Godzinowe i dzienne sumy pomiarów w komórce siatki ROLLUP_CELL_SIZE_METERS"""
+
+    __tablename__ = "cell_rollups"
+
+    cell = Column(Integer, primary_key=True, comment="Grid cell id (app.utils.grid) at the rollup cell size")
+    period = Column(String(4), primary_key=True, comment="Bucket length: 'hour' or 'day'")
+    bucket_start = Column(DateTime, primary_key=True, comment="Start of the bucket (local time)")
@@ -0,0 +1,40 @@
+import logging
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.crud import AsyncMeasurementService
+from app.dependencies import get_measurement_service
+from app.schemas import BuildingStatsResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/buildings",
+    tags=["Buildings"],
+)
+
+
+@router.get("/stats", response_model=List[BuildingStatsResponse])
+async def get_all_building_stats(
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """Podsumowania wszystkich budynków (przegląd kampusu)."""
+    try:
+        return await service.get_all_building_stats()
+    except Exception as e:
+        logger.error(f"[get_all_building_stats] {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Błąd serwera")
+
+
+@router.get("/{building_name}/stats", response_model=BuildingStatsResponse)
+async def get_building_stats(
+    building_name: str,
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """Podsumowanie pomiarów w jednym budynku."""
+    try:
+        return await service.get_building_stats(building_name)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[get_building_stats] {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Błąd serwera")
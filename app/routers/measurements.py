@@ -1,26 +1,55 @@
+import asyncio
 import logging
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Literal, Optional, Tuple
+import orjson
 from fastapi import (
     APIRouter,
     BackgroundTasks,
     Depends,
+    Header,
     HTTPException,
+    Path,
     Query,
+    Response,
+    WebSocket,
     status,
 )
-from sqlalchemy.orm import Session
-from app.crud import MeasurementService
-from app.db.database import get_db
+from fastapi.responses import StreamingResponse
+from app.auth.auth_bearer import optional_jwt_bearer
+from app.crud import AsyncMeasurementService, MeasurementService
+from app.crud.measurement import EXPORT_COLUMNS
+from app.db.database import get_session_factory
+from app.crud.ingest_queue import measurement_writer
+from app.crud.live import LiveSubscription, SlowConsumer, live_hub
+from app.dependencies import get_measurement_service
 from app.models import (
     Measurement,
 )
 from app.schemas import (
+    MeasurementBatchItemResponse,
+    MeasurementChangesResponse,
     MeasurementCreate,
+    MeasurementNearbyResponse,
     MeasurementResponse,
+    MeasurementTileResponse,
+    MeasurementTrendBucket,
     MeasurementUpdate,
+    RawMeasurementResponse,
 )
 from app.utils.distance_utils import haversine_distance
 from app.utils.buildings import find_building
+from app.utils.columnar import COLUMNS_MEDIA_TYPE, measurement_columns, tile_columns
+from app.utils.export import (
+    accepts_gzip,
+    csv_chunks,
+    gzip_chunks,
+    json_rows,
+    ndjson_chunks,
+    preferred_media_type,
+)
+from app.utils.cache import CachedResponse, VersionedCache, etag_matches, make_etag
+from app.utils.tiles import MAX_TILE_ZOOM, TILE_GRID_SIZE, tile_cache
 
 logger = logging.getLogger(__name__)
 
@@ -29,17 +58,29 @@ router = APIRouter(
     tags=["Measurements"],
 )
 
+# zserializowane strony GET /measurements/, ważne dopóki nie zmieni się wersja zbioru
+measurement_list_cache = VersionedCache(name="measurement_list")
+
+# klucze obiektów listy i eksportu – pola MeasurementResponse
+LIST_COLUMNS = [column.key for column in EXPORT_COLUMNS]
+
+# formaty listy i kafelków wybierane nagłówkiem Accept; pierwszy jest domyślny
+MAP_MEDIA_TYPES = ("application/json", COLUMNS_MEDIA_TYPE)
+
 
 @router.post("/", response_model=MeasurementResponse, status_code=status.HTTP_201_CREATED)
 async def create_measurement(
     measurement: MeasurementCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+    user_id: Optional[int] = Depends(optional_jwt_bearer),
 ):
-    """Stwórz nowy pomiar."""
-    service = MeasurementService(db)
+    """Stwórz nowy pomiar. Z tokenem z /user/login pomiar jest przypisany do użytkownika."""
     try:
-        db_m = service.create_measurement(measurement)
+        if measurement_writer.running:
+            [(db_m, _)] = await measurement_writer.submit([measurement], user_id)
+        else:
+            db_m = await service.create_measurement(measurement, user_id)
         return MeasurementResponse.model_validate(db_m)
     except HTTPException:
         raise
@@ -48,6 +89,73 @@ async def create_measurement(
         raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Błąd serwera")
 
 
+@router.post(
+    "/batch",
+    response_model=List[MeasurementBatchItemResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_measurements_batch(
+    measurements: List[MeasurementCreate],
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+    user_id: Optional[int] = Depends(optional_jwt_bearer),
+):
+    """Zapisz paczkę pomiarów (np. zbuforowanych offline) w jednej transakcji."""
+    try:
+        if measurement_writer.running:
+            results = await measurement_writer.submit(measurements, user_id)
+        else:
+            results = await service.create_measurements(measurements, [user_id] * len(measurements))
+        return [
+            MeasurementBatchItemResponse(
+                index=index,
+                merged=merged,
+                measurement=MeasurementResponse.model_validate(db_m),
+            )
+            for index, (db_m, merged) in enumerate(results)
+        ]
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[create_measurements_batch] {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Błąd serwera")
+
+
+@router.post(
+    "/raw", response_model=RawMeasurementResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def create_raw_measurement(
+    measurement: MeasurementCreate,
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """
+    Przyjmij pomiar do dziennika surowych pomiarów. Agregat zostanie zaktualizowany
+    przy najbliższym kompaktowaniu (COMPACTOR lub python -m app.jobs.compactor).
+    """
+    try:
+        raw = await service.create_raw_measurement(measurement)
+        return RawMeasurementResponse.model_validate(raw)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[create_raw_measurement] {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Błąd serwera")
+
+
+@router.delete("/raw/{raw_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_raw_measurement(
+    raw_id: int,
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """Usuń surowy pomiar – jego wartości są dokładnie odejmowane od agregatu."""
+    try:
+        await service.delete_raw_measurement(raw_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[delete_raw_measurement] {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Błąd serwera")
+
+
 @router.get("/building")
 async def get_building_name(
     latitude: float,
@@ -60,42 +168,361 @@ async def get_building_name(
     return {"building": building}
 
 
+@router.get("/nearby", response_model=List[MeasurementNearbyResponse])
+async def list_nearby_measurements(
+    latitude: float = Query(..., ge=-90, le=90, description="Szerokość geograficzna"),
+    longitude: float = Query(..., ge=-180, le=180, description="Długość geograficzna"),
+    radius_km: float = Query(1.0, gt=0, le=50, description="Promień wyszukiwania w km"),
+    limit: int = Query(100, ge=1, le=1000),
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """
+    Pobierz agregaty w promieniu `radius_km` od (latitude, longitude), od najbliższych.
+    """
+    result = await service.get_nearby_measurements(latitude, longitude, radius_km * 1000, limit)
+
+    return [
+        MeasurementNearbyResponse(
+            **MeasurementResponse.model_validate(m).model_dump(), distance_m=distance
+        )
+        for m, distance in result
+    ]
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_measurements(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format eksportu"),
+    building_name: Optional[str] = Query(None, description="Filtruj po nazwie budynku"),
+    since: Optional[datetime] = Query(None, description="Tylko agregaty zaktualizowane od"),
+    until: Optional[datetime] = Query(None, description="Tylko agregaty zaktualizowane przed"),
+    accept_encoding: Optional[str] = Header(None),
+    session_factory=Depends(get_session_factory),
+):
+    """
+    Eksportuj agregaty jako NDJSON lub CSV, strumieniowo (stała pamięć niezależnie od liczby wierszy).
+    Jeśli klient akceptuje gzip, odpowiedź jest kompresowana w locie.
+    """
+    to_chunks = ndjson_chunks if format == "ndjson" else csv_chunks
+
+    def stream() -> Iterator[bytes]:
+        # sesja żyje tak długo jak strumień, a nie jak obsługa żądania
+        with session_factory() as db:
+            partitions = MeasurementService(db).iter_export_partitions(
+                building_name=building_name, since=since, until=until
+            )
+            yield from to_chunks(LIST_COLUMNS, partitions)
+
+    headers = {"Content-Disposition": f'attachment; filename="measurements.{format}"'}
+    body = stream()
+    if accepts_gzip(accept_encoding):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return StreamingResponse(body, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+
+@router.get("/changes", response_model=MeasurementChangesResponse)
+async def get_measurement_changes(
+    since: int = Query(0, ge=0, description="Kursor z poprzedniej odpowiedzi (0 – od początku)"),
+    limit: int = Query(1000, ge=1, le=1000),
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """
+    Agregaty utworzone, zmienione lub usunięte po zmianie numer `since`, w kolejności zmian.
+    Klient zapamiętuje `cursor` i przy kolejnym odświeżeniu pobiera tylko zmiany;
+    przy `has_more` od razu pyta o następną porcję.
+    """
+    try:
+        changes = await service.get_changes(since=since, limit=limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[get_measurement_changes] {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Błąd serwera")
+
+    body = orjson.dumps({
+        **changes,
+        "changed": [dict(zip(LIST_COLUMNS, row)) for row in changes["changed"]],
+    })
+    return Response(content=body, media_type="application/json")
+
+
+# komentarz SSE co tyle sekund bez zmian – proxy nie zamykają bezczynnego połączenia
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _stream_bbox(
+    min_latitude: Optional[float],
+    max_latitude: Optional[float],
+    min_longitude: Optional[float],
+    max_longitude: Optional[float],
+) -> Optional[Tuple[float, float, float, float]]:
+    bbox = (min_latitude, max_latitude, min_longitude, max_longitude)
+    if all(v is None for v in bbox):
+        return None
+    if any(v is None for v in bbox):
+        raise ValueError("Podaj wszystkie granice obszaru: min/max latitude i min/max longitude")
+    return bbox
+
+
+async def _send_batches(websocket: WebSocket, subscription: LiveSubscription) -> None:
+    while True:
+        batch = await subscription.next_batch()
+        await websocket.send_text(orjson.dumps(batch).decode())
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # wiadomości od klienta nie mają znaczenia – czekamy tylko na rozłączenie
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/stream")
+async def stream_measurements_websocket(
+    websocket: WebSocket,
+    building_name: Optional[str] = Query(None, description="Tylko agregaty w budynku"),
+    min_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    max_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    min_longitude: Optional[float] = Query(None, ge=-180, le=180),
+    max_longitude: Optional[float] = Query(None, ge=-180, le=180),
+    session_factory=Depends(get_session_factory),
+):
+    """
+    Zmiany agregatów na żywo: każda wiadomość to JSON jak z /measurements/changes
+    (`changed`, `deleted`, `cursor`), z kilkoma zmianami jednego punktu scalonymi w jedną.
+    Klient, który nie nadąża, jest rozłączany kodem 1013 – po ponownym połączeniu
+    dociąga brakujące zmiany przez /measurements/changes?since=<ostatni cursor>.
+    """
+    try:
+        bbox = _stream_bbox(min_latitude, max_latitude, min_longitude, max_longitude)
+    except ValueError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    async with live_hub.subscribe(building_name, bbox, session_factory) as subscription:
+        await websocket.accept()
+        sending = asyncio.create_task(_send_batches(websocket, subscription))
+        receiving = asyncio.create_task(_wait_for_disconnect(websocket))
+        done, pending = await asyncio.wait({sending, receiving}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+        if sending in done:
+            try:
+                sending.result()
+            except SlowConsumer:
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Zbyt wolny odbiorca")
+            except Exception as e:
+                logger.error(f"[stream_measurements_websocket] {e}")
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_measurements(
+    building_name: Optional[str] = Query(None, description="Tylko agregaty w budynku"),
+    min_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    max_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    min_longitude: Optional[float] = Query(None, ge=-180, le=180),
+    max_longitude: Optional[float] = Query(None, ge=-180, le=180),
+    session_factory=Depends(get_session_factory),
+):
+    """
+    Te same zmiany co WebSocket /measurements/stream, jako Server-Sent Events – dla klientów
+    bez WebSocketów. Zdarzenie `changes` ma id równe kursorowi; klient, który nie nadąża,
+    dostaje zdarzenie `dropped` i strumień się kończy.
+    """
+    try:
+        bbox = _stream_bbox(min_latitude, max_latitude, min_longitude, max_longitude)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def events() -> AsyncIterator[bytes]:
+        async with live_hub.subscribe(building_name, bbox, session_factory) as subscription:
+            yield b": connected\n\n"
+            while True:
+                try:
+                    batch = await subscription.next_batch(timeout=SSE_KEEPALIVE_SECONDS)
+                except SlowConsumer:
+                    yield b"event: dropped\ndata: {}\n\n"
+                    return
+                if batch is None:
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"id: %d\nevent: changes\ndata: %b\n\n" % (batch["cursor"], orjson.dumps(batch))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/trends", response_model=List[MeasurementTrendBucket])
+async def get_measurement_trends(
+    period: Literal["hour", "day", "hour_of_day"] = Query(
+        "hour", description="Długość przedziału albo profil doby (hour_of_day)"
+    ),
+    since: Optional[datetime] = Query(None, description="Początek zakresu (włącznie)"),
+    until: Optional[datetime] = Query(None, description="Koniec zakresu (wyłącznie)"),
+    building_name: Optional[str] = Query(None, description="Trend jednego budynku"),
+    latitude: Optional[float] = Query(None, ge=-90, le=90, description="Trend komórki siatki wokół punktu"),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """
+    Średnie jakości połączenia w przedziałach godzinowych lub dziennych, liczone z rollupów
+    aktualizowanych przy zapisie – dla budynku, dla punktu (latitude i longitude) albo dla całego kampusu.
+    """
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Podaj latitude i longitude razem",
+        )
+    if latitude is not None and building_name is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Podaj budynek albo punkt, nie oba",
+        )
+
+    try:
+        return await service.get_trends(
+            period=period,
+            since=since,
+            until=until,
+            building_name=building_name,
+            latitude=latitude,
+            longitude=longitude,
+        )
+    except Exception as e:
+        logger.error(f"[get_measurement_trends] {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Błąd serwera")
+
+
+@router.get("/tiles/{z}/{x}/{y}", response_model=MeasurementTileResponse)
+async def get_measurement_tile(
+    z: int = Path(..., ge=0, le=MAX_TILE_ZOOM, description="Poziom przybliżenia"),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    accept: Optional[str] = Header(None),
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """
+    Pobierz kafelek mapy z/x/y (Web Mercator) z agregatami zgrupowanymi w komórki siatki.
+    Kafelki są trzymane w pamięci i unieważniane, gdy zmieni się pomiar w ich obszarze.
+    Z `Accept: application/vnd.wifi-scout.columns` komórki przychodzą w formacie
+    kolumnowym (app.utils.columnar), a grid_size w nagłówku `X-Tile-Grid-Size`.
+    """
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Na poziomie {z} x i y muszą być mniejsze niż {2 ** z}",
+        )
+
+    media_type = preferred_media_type(accept, MAP_MEDIA_TYPES)
+    key = (z, x, y)
+    # obie postaci kafelka w jednym wpisie – unieważnianie po (z, x, y) obejmuje oba formaty
+    bodies = tile_cache.get(key)
+    if bodies is None:
+        token = tile_cache.begin(key)
+        try:
+            cells = await service.get_tile(z, x, y)
+            bodies = {
+                "application/json": MeasurementTileResponse(
+                    z=z, x=x, y=y, grid_size=TILE_GRID_SIZE, cells=cells
+                ).model_dump_json().encode(),
+                COLUMNS_MEDIA_TYPE: tile_columns(cells),
+            }
+        finally:
+            tile_cache.put(key, bodies, token)
+
+    headers = {"Vary": "Accept"}
+    if media_type == COLUMNS_MEDIA_TYPE:
+        headers["X-Tile-Grid-Size"] = str(TILE_GRID_SIZE)
+    return Response(content=bodies[media_type], media_type=media_type, headers=headers)
+
+
 @router.get("/{measurement_id}", response_model=MeasurementResponse)
-async def get_measurement(measurement_id: int, db: Session = Depends(get_db)):
+async def get_measurement(
+    measurement_id: int,
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
     """Pobierz pomiar po ID."""
-    service = MeasurementService(db)
-    db_m = service.get_measurement(measurement_id)
+    db_m = await service.get_measurement(measurement_id)
     return MeasurementResponse.model_validate(db_m)
 
 
 @router.get("/", response_model=List[MeasurementResponse])
 async def list_measurements(
-    # skip: int = Query(0, ge=0),
-    # limit: int = Query(100, ge=1, le=1000),
-    # building_name: Optional[str] = Query(
-    #     None, description="Filtruj po nazwie budynku"
-    # ),
-    # latitude: Optional[float] = Query(
-    #     None, ge=-90, le=90, description="Szerokość geograficzna"
-    # ),
-    # longitude: Optional[float] = Query(
-    #     None, ge=-180, le=180, description="Długość geograficzna"
-    # ),
-    # radius_km: float = Query(1.0, gt=0, description="Promień wyszukiwania w km"),
-    db: Session = Depends(get_db),
-):
-    """
-    Pobierz:
-     - agregaty dla `building_name`, lub
-     - pobliskie punkty w promieniu `radius_km` od (latitude, longitude).
-    """
-    service = MeasurementService(db)
-    result = service.get_measurements()
-
-    if result and isinstance(result[0], dict):
-        return [MeasurementResponse.model_validate(m) for m in result]  # z distance_m
-    
-    return [MeasurementResponse.model_validate(m) for m in result]  # z sumami, count i avg
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(
+        None, description="Kursor następnej strony z nagłówka X-Next-Cursor"
+    ),
+    building_name: Optional[str] = Query(
+        None, description="Filtruj po nazwie budynku"
+    ),
+    min_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    max_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    min_longitude: Optional[float] = Query(None, ge=-180, le=180),
+    max_longitude: Optional[float] = Query(None, ge=-180, le=180),
+    since: Optional[datetime] = Query(None, description="Tylko agregaty zaktualizowane od"),
+    until: Optional[datetime] = Query(None, description="Tylko agregaty zaktualizowane przed"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
+    """
+    Pobierz stronę agregatów, od najnowszych. Kursor kolejnej strony
+    zwracany jest w nagłówku `X-Next-Cursor` (brak nagłówka = ostatnia strona).
+
+    Odpowiedź ma ETag zależny od wersji zbioru – jeśli od poprzedniego zapytania
+    nic się nie zmieniło, `If-None-Match` daje 304 bez czytania pomiarów.
+    Z `Accept: application/vnd.wifi-scout.columns` strona przychodzi w formacie
+    kolumnowym (app.utils.columnar) – kilkanaście razy mniejszym niż JSON.
+    """
+    media_type = preferred_media_type(accept, MAP_MEDIA_TYPES)
+    bbox = (min_latitude, max_latitude, min_longitude, max_longitude)
+    key = (limit, cursor, building_name, bbox, since, until, media_type)
+
+    version = await service.get_dataset_version()
+    etag = make_etag(version, key)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"},
+        )
+
+    cached = measurement_list_cache.get(key, version)
+    if cached is None:
+        result, next_cursor = await service.get_measurements(
+            limit=limit,
+            cursor=cursor,
+            building_name=building_name,
+            bbox=bbox,
+            since=since,
+            until=until,
+        )
+        cached = measurement_list_cache.put(
+            key,
+            version,
+            CachedResponse(
+                body=(
+                    measurement_columns(result)
+                    if media_type == COLUMNS_MEDIA_TYPE
+                    else json_rows(LIST_COLUMNS, result)
+                ),
+                etag=etag,
+                headers={"X-Next-Cursor": next_cursor} if next_cursor else {},
+            ),
+        )
+
+    return Response(
+        content=cached.body,
+        media_type=media_type,
+        headers={"ETag": cached.etag, "Cache-Control": "no-cache", "Vary": "Accept", **cached.headers},
+    )
 
 
 @router.put("/{measurement_id}", response_model=MeasurementResponse)
@@ -103,12 +530,11 @@ async def update_measurement(
     measurement_id: int,
     measurement_update: MeasurementUpdate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    service: AsyncMeasurementService = Depends(get_measurement_service),
 ):
     """Zaktualizuj istniejący agregat pomiarów."""
-    service = MeasurementService(db)
     try:
-        db_m = service.update_measurement(measurement_id, measurement_update)
+        db_m = await service.update_measurement(measurement_id, measurement_update)
         return MeasurementResponse.model_validate(db_m)
     except HTTPException:
         raise
@@ -119,11 +545,13 @@ async def update_measurement(
 
 
 @router.delete("/{measurement_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_measurement(measurement_id: int, db: Session = Depends(get_db)):
+async def delete_measurement(
+    measurement_id: int,
+    service: AsyncMeasurementService = Depends(get_measurement_service),
+):
     """Usuń agregat pomiarów."""
-    service = MeasurementService(db)
     try:
-        service.delete_measurement(measurement_id)
+        await service.delete_measurement(measurement_id)
     except HTTPException:
         raise
     except Exception as e:
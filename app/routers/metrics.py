@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from app.utils.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Metryki procesu w formacie tekstowym Prometheusa (osobno dla każdego workera)."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
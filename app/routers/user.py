@@ -14,14 +14,14 @@ router = APIRouter(
 @router.get("/")
 async def users(db: Session = Depends(get_db)):
     service = UserService(db)
-    return service.get_users(db)
+    return service.get_users()
 
 @router.post("/register")
 async def register(req: UserRegisterSchema, db: Session = Depends(get_db)):
     service = UserService(db)
-    return service.create_user(req)
+    return await service.create_user(req)
 
 @router.post("/login")
 async def login(user: UserLoginSchema = Body(...), db: Session = Depends(get_db)):
     service = UserService(db)
-    return service.login_user(user)
\ No newline at end of file
+    return await service.login_user(user)
\ No newline at end of file
@@ -3,8 +3,11 @@ from .user import (
 )
 from .measurements import (
     MeasurementCreate, MeasurementResponse, 
-    MeasurementUpdate, MeasurementBase,
+    MeasurementUpdate, MeasurementBase, MeasurementNearbyResponse,
+    MeasurementBatchItemResponse, MeasurementTileCell, MeasurementTileResponse,
+    MeasurementTrendBucket, RawMeasurementResponse, MeasurementChangesResponse,
 )
+from .building_stats import BuildingStatsResponse
 
 __all__ = [
     "UserLoginSchema",
@@ -15,6 +18,14 @@ __all__ = [
     "MeasurementResponse",
     "MeasurementUpdate",
     "MeasurementBase",
+    "MeasurementNearbyResponse",
+    "MeasurementBatchItemResponse",
+    "MeasurementTileCell",
+    "MeasurementTileResponse",
+    "MeasurementTrendBucket",
+    "RawMeasurementResponse",
+    "MeasurementChangesResponse",
+    "BuildingStatsResponse",
     "CoordinateResponse",
     "DistanceResponse",
 ]
\ No newline at end of file
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class BuildingStatsResponse(BaseModel):
+    """Schema dla podsumowania pomiarów w budynku"""
+
+    building_name: str = Field(..., examples=["C-3"])
+    measurement_count: int = Field(..., description="Number of measurements in the building")
+    download_speed: float = Field(..., description="Average download speed in Mbps")
+    upload_speed: float = Field(..., description="Average upload speed in Mbps")
+    ping: int = Field(..., description="Average ping in milliseconds")
+    min_download_speed: Optional[float] = Field(None, description="Lowest download speed recorded")
+    max_download_speed: Optional[float] = Field(None, description="Highest download speed recorded")
+    min_upload_speed: Optional[float] = Field(None, description="Lowest upload speed recorded")
+    max_upload_speed: Optional[float] = Field(None, description="Highest upload speed recorded")
+    min_ping: Optional[int] = Field(None, description="Lowest ping recorded")
+    max_ping: Optional[int] = Field(None, description="Highest ping recorded")
+    updated_at: Optional[datetime] = Field(None, description="Timestamp of the latest measurement")
+    color: Optional[str] = Field(None, examples=["#67B22D"], description="Color indicator of the averages")
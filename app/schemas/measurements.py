@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -110,3 +110,79 @@ class MeasurementResponse(MeasurementBase):
     )
     timestamp: datetime = Field(..., description="Last update timestamp")
     model_config = ConfigDict(from_attributes=True)
+
+
+class MeasurementNearbyResponse(MeasurementResponse):
+    """Schema dla agregatu z wyszukiwania w promieniu"""
+
+    distance_m: float = Field(..., description="Distance from the search point in meters")
+
+
+class MeasurementBatchItemResponse(BaseModel):
+    """Schema dla wyniku pojedynczego pomiaru z paczki"""
+
+    index: int = Field(..., description="Position of the measurement in the request batch")
+    merged: bool = Field(
+        ..., description="True if merged into an existing aggregate, False if a new one was created"
+    )
+    measurement: MeasurementResponse
+
+
+class MeasurementTileCell(BaseModel):
+    """Schema dla pojedynczej komórki kafelka mapy"""
+
+    row: int = Field(..., description="Cell row within the tile, from the top")
+    col: int = Field(..., description="Cell column within the tile, from the left")
+    latitude: float = Field(..., description="Measurement-weighted centroid latitude of the cell")
+    longitude: float = Field(..., description="Measurement-weighted centroid longitude of the cell")
+    measurement_count: int = Field(..., description="Number of measurements in the cell")
+    download_speed: float = Field(..., description="Average download speed in the cell")
+    upload_speed: float = Field(..., description="Average upload speed in the cell")
+    ping: int = Field(..., description="Average ping in the cell")
+    color: str = Field(..., examples=["#67B22D"], description="Color indicator of the cell averages")
+
+
+class MeasurementTileResponse(BaseModel):
+    """Schema dla kafelka mapy z zagregowanymi komórkami"""
+
+    z: int
+    x: int
+    y: int
+    grid_size: int = Field(..., description="The tile is split into grid_size x grid_size cells")
+    cells: List[MeasurementTileCell]
+
+
+class RawMeasurementResponse(BaseModel):
+    """Schema dla surowego pomiaru przyjętego do dziennika"""
+
+    id: int = Field(..., examples=[1])
+    received_at: datetime = Field(..., description="Time the sample was received")
+    aggregate_id: Optional[int] = Field(
+        None, description="Aggregate the sample was folded into; null until compaction"
+    )
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MeasurementTrendBucket(BaseModel):
+    """Schema dla jednego przedziału czasu w trendach"""
+
+    bucket_start: Optional[datetime] = Field(
+        None, description="Start of the hourly or daily bucket (local time); null for hour_of_day"
+    )
+    hour_of_day: Optional[int] = Field(
+        None, ge=0, le=23, description="Hour of the day for period=hour_of_day; null otherwise"
+    )
+    measurement_count: int = Field(..., description="Number of measurements in the bucket")
+    download_speed: float = Field(..., description="Average download speed in the bucket")
+    upload_speed: float = Field(..., description="Average upload speed in the bucket")
+    ping: int = Field(..., description="Average ping in the bucket")
+    color: str = Field(..., examples=["#67B22D"], description="Color indicator of the bucket averages")
+
+
+class MeasurementChangesResponse(BaseModel):
+    """Schema dla zmian agregatów od podanego numeru zmiany"""
+
+    changed: List[MeasurementResponse] = Field(..., description="Aggregates created or updated since the cursor")
+    deleted: List[int] = Field(..., description="Ids of aggregates deleted since the cursor")
+    cursor: int = Field(..., description="Pass as `since` in the next request")
+    has_more: bool = Field(..., description="More changes are waiting; request again right away")
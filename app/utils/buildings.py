@@ -1,4 +1,8 @@
-from shapely.geometry import Point, Polygon
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+DEFAULT_BUILDING = "Politechnika Wrocławska"
 
 BUILDINGS = {
     "A-1": [
@@ -69,13 +73,70 @@ BUILDINGS = {
     ],
 }
 
+class BuildingIndex:
+    """
+    Poligony budynków skompilowane raz: przygotowane geometrie w drzewie STRtree
+    oraz prostokąt obejmujący cały kampus do szybkiego odrzucania punktów.
+    """
+
+    def __init__(self, buildings: dict[str, list[tuple[float, float]]], default: str = DEFAULT_BUILDING):
+        self.names = list(buildings)
+        self.default = default
+        # zamiana (lat, lon) -> (lon, lat)
+        self.polygons = np.array(
+            [Polygon((lon, lat) for (lat, lon) in coords) for coords in buildings.values()],
+            dtype=object,
+        )
+        shapely.prepare(self.polygons)
+        self.tree = shapely.STRtree(self.polygons)
+        self.min_lon, self.min_lat, self.max_lon, self.max_lat = shapely.total_bounds(self.polygons)
+        # indeks len(names) oznacza budynek domyślny
+        self._labels = np.array(self.names + [default], dtype=object)
+
+    def find(self, lat: float, lon: float) -> str:
+        if not (self.min_lat <= lat <= self.max_lat and self.min_lon <= lon <= self.max_lon):
+            return self.default
+
+        candidates = self.tree.query(shapely.Point(lon, lat))
+        if candidates.size:
+            # przy nakładających się poligonach wygrywa pierwszy budynek w kolejności BUILDINGS
+            candidates.sort()
+            inside = shapely.contains_xy(self.polygons[candidates], lon, lat)
+            if inside.any():
+                return self.names[candidates[inside.argmax()]]
+        return self.default
+
+    def find_many(self, lats, lons) -> list[str]:
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        result = np.full(lats.shape, len(self.names))
+
+        in_bounds = np.flatnonzero(
+            (lats >= self.min_lat) & (lats <= self.max_lat)
+            & (lons >= self.min_lon) & (lons <= self.max_lon)
+        )
+        if in_bounds.size:
+            point_idx, polygon_idx = self.tree.query(shapely.points(lons[in_bounds], lats[in_bounds]))
+            inside = shapely.contains_xy(
+                self.polygons[polygon_idx], lons[in_bounds[point_idx]], lats[in_bounds[point_idx]]
+            )
+            np.minimum.at(result, in_bounds[point_idx[inside]], polygon_idx[inside])
+
+        return self._labels[result].tolist()
+
+
+_index = BuildingIndex(BUILDINGS)
+
+
 def find_building(lat: float, lon: float) -> str | None:
     """
     sprawdza czy punkt znajduje się wewnątrz budynku i zwraca nazwę budynku lub None
     """
-    point = Point(lon, lat) 
-    for name, coords in BUILDINGS.items():
-        polygon = Polygon((lon, lat) for (lat, lon) in coords)  # zamiana (lat, lon) -> (lon, lat)
-        if polygon.contains(point):
-            return name
-    return "Politechnika Wrocławska"
+    return _index.find(lat, lon)
+
+
+def find_buildings(lats, lons) -> list[str]:
+    """
+    Wersja wsadowa find_building dla tablic szerokości i długości geograficznych
+    """
+    return _index.find_many(lats, lons)
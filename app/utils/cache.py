@@ -0,0 +1,117 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Optional
+
+from decouple import config
+
+from app.utils.metrics import cache_requests_total
+
+RESPONSE_CACHE_SIZE = config("RESPONSE_CACHE_SIZE", default=256, cast=int)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Gotowa, zserializowana odpowiedź razem z jej ETagiem"""
+
+    body: bytes
+    etag: str
+    headers: dict = field(default_factory=dict)
+
+
+def make_etag(version: int, key: Hashable) -> str:
+    """ETag odpowiedzi – zależy tylko od wersji zbioru i parametrów zapytania"""
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Czy nagłówek If-None-Match pasuje do ETagu (porównanie słabe, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class VersionedCache:
+    """
+    Pamięć podręczna LRU gotowych odpowiedzi, kluczowana parametrami zapytania.
+
+    Każdy wpis pamięta wersję zbioru, z której powstał – po podbiciu wersji
+    wpis przestaje być zwracany i zostaje nadpisany przy następnym zapytaniu,
+    więc nie trzeba go jawnie unieważniać.
+    """
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, name: str = "response"):
+        self.maxsize = maxsize
+        self.name = name
+        self._entries: OrderedDict[Hashable, tuple[int, CachedResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                cache_requests_total.inc(self.name, "miss")
+                return None
+            self._entries.move_to_end(key)
+        cache_requests_total.inc(self.name, "hit")
+        return entry[1]
+
+    def put(self, key: Hashable, version: int, response: CachedResponse) -> CachedResponse:
+        with self._lock:
+            self._entries[key] = (version, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TTLCache:
+    """
+    Mała pamięć podręczna LRU, w której każdy wpis wygasa po ttl_seconds
+    (albo wcześniej – put() przyjmuje krótszy czas życia pojedynczego wpisu).
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float, name: str):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                cache_requests_total.inc(self.name, "miss")
+                return None
+            self._entries.move_to_end(key)
+        cache_requests_total.inc(self.name, "hit")
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
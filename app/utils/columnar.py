@@ -0,0 +1,184 @@
+"""
+Zwarty, kolumnowy format binarny dla mapy (Accept: application/vnd.wifi-scout.columns).
+
+Zamiast listy obiektów JSON – po jednej tablicy na pole (jak TypedArray w przeglądarce).
+Wszystkie liczby są little-endian.
+
+    nagłówek: b"WSC1" | u32 liczba wierszy | u8 liczba kolumn
+    kolumna:  u8 długość nazwy | nazwa (UTF-8) | u8 rodzaj | 2 znaki typu (np. b"f4", b"i2", b"u1")
+              | nagłówek rodzaju | liczba_wierszy wartości danego typu
+
+Rodzaje kolumn:
+    0 – wartości wprost; w kolumnach f4 brak wartości (null) to NaN,
+    1 – delty: f8 skala, i8 wartość bazowa; wartość[i] = (baza + suma delt[0..i]) * skala,
+        delta[0] = 0 (współrzędne w punkcie stałym 1e-6°, identyfikatory, czas w sekundach),
+    2 – słownik: u16 liczba wpisów, wpisy (u8 długość + UTF-8); wartość to indeks wpisu
+        liczony od 1, 0 oznacza null (budynki, kolory).
+
+Czas to sekundy od 1970-01-01 liczone z czasu lokalnego bez strefy – ta sama godzina,
+co w JSON, bez ułamków sekund.
+"""
+import struct
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+COLUMNS_MEDIA_TYPE = "application/vnd.wifi-scout.columns"
+
+MAGIC = b"WSC1"
+PLAIN, DELTA, DICTIONARY = 0, 1, 2
+
+# Współrzędne w punkcie stałym – 1e-6° to ok. 11 cm, dużo mniej niż promień scalania
+COORDINATE_SCALE = 1e-6
+
+_SIGNED = (np.int8, np.int16, np.int32, np.int64)
+_UNSIGNED = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+def _narrowest(values: np.ndarray, signed: bool) -> np.dtype:
+    """Najwęższy typ całkowity, w którym mieszczą się wszystkie wartości"""
+    low, high = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+    for candidate in _SIGNED if signed else _UNSIGNED:
+        info = np.iinfo(candidate)
+        if info.min <= low and high <= info.max:
+            return np.dtype(candidate)
+    raise ValueError("Wartości poza zakresem 64 bitów")
+
+
+def _column_header(name: str, kind: int, dtype: np.dtype) -> bytes:
+    encoded = name.encode()
+    code = f"{dtype.kind}{dtype.itemsize}".encode()
+    return struct.pack("<B", len(encoded)) + encoded + struct.pack("<B", kind) + code
+
+
+def plain_column(name: str, values, dtype) -> bytes:
+    """Wartości wprost; None w kolumnach zmiennoprzecinkowych zapisywane jako NaN"""
+    dtype = np.dtype(dtype)
+    if dtype.kind == "f":
+        array = np.array([np.nan if v is None else v for v in values], dtype=dtype)
+    else:
+        array = np.asarray(values, dtype=dtype)
+    return _column_header(name, PLAIN, dtype) + array.astype(dtype.newbyteorder("<")).tobytes()
+
+
+def uint_column(name: str, values) -> bytes:
+    """Liczby naturalne w najwęższym typie bez znaku"""
+    array = np.asarray(values, dtype=np.int64)
+    return plain_column(name, array, _narrowest(array, signed=False))
+
+
+def delta_column(name: str, values, scale: float = 1.0) -> bytes:
+    """Różnice kolejnych wartości (w punkcie stałym o kroku scale) w najwęższym typie ze znakiem"""
+    fixed = np.rint(np.asarray(values, dtype=np.float64) / scale).astype(np.int64)
+    base = int(fixed[0]) if len(fixed) else 0
+    deltas = np.diff(fixed, prepend=base)
+    dtype = _narrowest(deltas, signed=True)
+    return (
+        _column_header(name, DELTA, dtype)
+        + struct.pack("<dq", scale, base)
+        + deltas.astype(dtype.newbyteorder("<")).tobytes()
+    )
+
+
+def timestamp_column(name: str, values: Sequence[datetime]) -> bytes:
+    """Czas bez strefy (jak w kolumnach DateTime) jako delty sekund"""
+    return delta_column(name, np.array(values, dtype="datetime64[s]").astype(np.int64))
+
+
+def dictionary_column(name: str, values: Sequence[Optional[str]]) -> bytes:
+    """Indeksy do listy różnych wartości (od 1; 0 to null)"""
+    entries: Dict[str, int] = {}
+    indexes = [0 if v is None else entries.setdefault(v, len(entries) + 1) for v in values]
+    array = np.asarray(indexes, dtype=np.int64)
+    dtype = _narrowest(array, signed=False)
+    table = b"".join(struct.pack("<B", len(e)) + e for e in (entry.encode() for entry in entries))
+    return (
+        _column_header(name, DICTIONARY, dtype)
+        + struct.pack("<H", len(entries))
+        + table
+        + array.astype(dtype.newbyteorder("<")).tobytes()
+    )
+
+
+def encode_columns(row_count: int, columns: List[bytes]) -> bytes:
+    return MAGIC + struct.pack("<IB", row_count, len(columns)) + b"".join(columns)
+
+
+def decode_columns(body: bytes) -> Dict[str, np.ndarray]:
+    """
+    Odczytaj kolumny (dla testów i benchmarków – referencja dla klientów).
+    Kolumny słownikowe zwracane są jako tablice obiektów z None w miejscu null.
+    """
+    if body[:4] != MAGIC:
+        raise ValueError("To nie jest odpowiedź kolumnowa")
+    rows, count = struct.unpack_from("<IB", body, 4)
+    offset = 9
+    result = {}
+    for _ in range(count):
+        (name_length,) = struct.unpack_from("<B", body, offset)
+        name = body[offset + 1:offset + 1 + name_length].decode()
+        offset += 1 + name_length
+        kind = body[offset]
+        dtype = np.dtype(body[offset + 1:offset + 3].decode()).newbyteorder("<")
+        offset += 3
+
+        if kind == DELTA:
+            scale, base = struct.unpack_from("<dq", body, offset)
+            offset += 16
+        elif kind == DICTIONARY:
+            (entry_count,) = struct.unpack_from("<H", body, offset)
+            offset += 2
+            entries = [None]
+            for _ in range(entry_count):
+                length = body[offset]
+                entries.append(body[offset + 1:offset + 1 + length].decode())
+                offset += 1 + length
+
+        values = np.frombuffer(body, dtype=dtype, count=rows, offset=offset)
+        offset += rows * dtype.itemsize
+
+        if kind == DELTA:
+            fixed = base + np.cumsum(values, dtype=np.int64)
+            values = fixed if scale == 1.0 else fixed * scale
+        elif kind == DICTIONARY:
+            values = np.array(entries, dtype=object)[values]
+        result[name] = values
+    return result
+
+
+def measurement_columns(rows: Sequence) -> bytes:
+    """
+    Strona agregatów (wiersze z kolumnami EXPORT_COLUMNS) dla mapy: pola MeasurementResponse
+    bez sum – te wynikają ze średnich i measurement_count
+    """
+    values = dict(zip(rows[0]._fields, zip(*rows))) if rows else defaultdict(tuple)
+    return encode_columns(len(rows), [
+        delta_column("id", values["id"]),
+        delta_column("latitude", values["latitude"], COORDINATE_SCALE),
+        delta_column("longitude", values["longitude"], COORDINATE_SCALE),
+        plain_column("height", values["height"], np.float32),
+        dictionary_column("building_name", values["building_name"]),
+        plain_column("download_speed", values["download_speed"], np.float32),
+        plain_column("upload_speed", values["upload_speed"], np.float32),
+        plain_column("ping", values["ping"], np.float32),
+        uint_column("measurement_count", values["measurement_count"]),
+        dictionary_column("color", values["color"]),
+        timestamp_column("timestamp", values["timestamp"]),
+    ])
+
+
+def tile_columns(cells: Sequence[dict]) -> bytes:
+    """Komórki kafelka (MeasurementService.get_tile) – pola MeasurementTileCell"""
+    return encode_columns(len(cells), [
+        uint_column("row", [cell["row"] for cell in cells]),
+        uint_column("col", [cell["col"] for cell in cells]),
+        delta_column("latitude", [cell["latitude"] for cell in cells], COORDINATE_SCALE),
+        delta_column("longitude", [cell["longitude"] for cell in cells], COORDINATE_SCALE),
+        uint_column("measurement_count", [cell["measurement_count"] for cell in cells]),
+        plain_column("download_speed", [cell["download_speed"] for cell in cells], np.float32),
+        plain_column("upload_speed", [cell["upload_speed"] for cell in cells], np.float32),
+        uint_column("ping", [cell["ping"] for cell in cells]),
+        dictionary_column("color", [cell["color"] for cell in cells]),
+    ])
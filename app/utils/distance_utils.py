@@ -1,5 +1,11 @@
 import math
 
+import numpy as np
+
+# Promień Ziemi w metrach
+EARTH_RADIUS_METERS = 6371000
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_METERS / 180
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -19,10 +25,44 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     )
     c = 2 * math.asin(math.sqrt(a))
 
-    # Promień Ziemi w metrach
-    r = 6371000
+    return c * EARTH_RADIUS_METERS
 
-    return c * r
+
+def bounding_box(lat: float, lon: float, radius_meters: float) -> tuple[float, float, float, float]:
+    """
+    Oblicz prostokąt (min_lat, max_lat, min_lon, max_lon) zawierający wszystkie
+    punkty odległe o co najwyżej radius_meters od (lat, lon).
+
+    Zakres długości jest skalowany przez cos(lat), więc prostokąt jest ciasny
+    również z dala od równika.
+    """
+    angular = radius_meters / EARTH_RADIUS_METERS
+    dlat = math.degrees(angular)
+    min_lat, max_lat = lat - dlat, lat + dlat
+
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    dlon = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(lat)))))
+    return min_lat, max_lat, lon - dlon, lon + dlon
+
+
+def haversine_distances(lat, lon, lats, lons) -> np.ndarray:
+    """
+    Wektorowa wersja haversine_distance: odległości w metrach od (lat, lon)
+    do wszystkich punktów z tablic lats, lons w jednym przebiegu.
+    Jeśli lat, lon są tablicami tej samej długości, odległości liczone są parami.
+    """
+    lat1 = np.radians(np.asarray(lat, dtype=float))
+    lon1 = np.radians(np.asarray(lon, dtype=float))
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    lon2 = np.radians(np.asarray(lons, dtype=float))
+
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0))) * EARTH_RADIUS_METERS
 
 
 def find_points_within_radius(
@@ -31,14 +71,13 @@ def find_points_within_radius(
     """
     Znajdź punkty w promieniu od danego punktu.
     """
-    nearby_points = []
+    if not points:
+        return []
 
-    for point in points:
-        lat, lon = point[0], point[1]
-        distance = haversine_distance(center_lat, center_lon, lat, lon)
-
-        if distance <= radius_meters:
-            nearby_points.append({"point": point, "distance": distance})
+    distances = haversine_distances(
+        center_lat, center_lon, [p[0] for p in points], [p[1] for p in points]
+    )
+    within = np.flatnonzero(distances <= radius_meters)
+    within = within[np.argsort(distances[within], kind="stable")]
 
-    nearby_points.sort(key=lambda x: x["distance"])
-    return nearby_points
+    return [{"point": points[i], "distance": float(distances[i])} for i in within]
@@ -0,0 +1,84 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Sequence
+
+import orjson
+
+
+def json_rows(columns: Sequence[str], rows: Iterable[Sequence]) -> bytes:
+    """
+    Tablica JSON obiektów {kolumna: wartość} prosto z krotek wiersza – bez modeli
+    Pydantic; orjson zapisuje datetime w ISO 8601, tak samo jak MeasurementResponse
+    """
+    return orjson.dumps([dict(zip(columns, row)) for row in rows])
+
+
+def ndjson_chunks(columns: Sequence[str], partitions: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    """Jeden obiekt JSON na wiersz; jeden fragment odpowiedzi na partycję wierszy"""
+    dumps = orjson.dumps
+    for rows in partitions:
+        yield b"".join(
+            dumps(dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE) for row in rows
+        )
+
+
+def csv_chunks(columns: Sequence[str], partitions: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    """CSV z nagłówkiem; bufor jest czyszczony po każdej partycji, więc pamięć jest stała"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for rows in partitions:
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Kompresuj strumień w locie do formatu gzip"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Czy klient akceptuje gzip (pomija gzip;q=0)"""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*") and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            return True
+    return False
+
+
+def preferred_media_type(accept: str | None, offered: Sequence[str]) -> str:
+    """
+    Typ odpowiedzi wybrany z nagłówka Accept spośród offered (najwyższe q, przy
+    remisie – pierwszy w offered); bez dopasowania zwraca offered[0]
+    """
+    best, best_q = offered[0], 0.0
+    for media_range in (accept or "").split(","):
+        name, _, params = media_range.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        for media_type in offered:
+            matches = name in (media_type, "*/*", media_type.split("/")[0] + "/*")
+            if matches and (q > best_q or (q == best_q and offered.index(media_type) < offered.index(best))):
+                best, best_q = media_type, q
+    return best
@@ -0,0 +1,116 @@
+import math
+
+import numpy as np
+
+from app.utils.distance_utils import EARTH_RADIUS_METERS, METERS_PER_DEGREE, bounding_box
+
+# Rozmiar komórki siatki w metrach – nie mniejszy niż promień scalania pomiarów,
+# dzięki czemu sąsiedzi punktu mieszczą się w kilku sąsiednich komórkach.
+CELL_SIZE_METERS = 5.0
+
+# Szerokość pasma wysokości w metrach (tolerancja wysokości przy scalaniu).
+HEIGHT_BAND_METERS = 1.0
+
+_COL_OFFSET = 1 << 31
+_COL_SPAN = 1 << 32
+
+
+def _lat_step(cell_size: float) -> float:
+    return cell_size / METERS_PER_DEGREE
+
+
+def _lon_step(row: int, cell_size: float) -> float:
+    """Krok długości geograficznej dla danego wiersza siatki (komórki ~kwadratowe w metrach)"""
+    lat_step = _lat_step(cell_size)
+    center_lat = (row + 0.5) * lat_step
+    return lat_step / max(math.cos(math.radians(center_lat)), 1e-6)
+
+
+def _cell_key(row: int, col: int) -> int:
+    return row * _COL_SPAN + col + _COL_OFFSET
+
+
+def grid_cell(lat: float, lon: float, cell_size: float = CELL_SIZE_METERS) -> int:
+    """
+    Zwraca identyfikator komórki stałej siatki metrycznej, w której leży punkt.
+    """
+    row = math.floor(lat / _lat_step(cell_size))
+    col = math.floor(lon / _lon_step(row, cell_size))
+    return _cell_key(row, col)
+
+
+def grid_cells(lats, lons, cell_size: float = CELL_SIZE_METERS) -> np.ndarray:
+    """Wektorowa wersja grid_cell dla tablic współrzędnych"""
+    lat_step = _lat_step(cell_size)
+    rows = np.floor(np.asarray(lats, dtype=float) / lat_step).astype(np.int64)
+    lon_steps = lat_step / np.maximum(np.cos(np.radians((rows + 0.5) * lat_step)), 1e-6)
+    cols = np.floor(np.asarray(lons, dtype=float) / lon_steps).astype(np.int64)
+    return rows * _COL_SPAN + cols + _COL_OFFSET
+
+
+def neighbour_cells(
+    lat: float, lon: float, radius_meters: float, cell_size: float = CELL_SIZE_METERS
+) -> list[int]:
+    """
+    Zwraca identyfikatory wszystkich komórek, które mogą zawierać punkty
+    odległe o co najwyżej radius_meters od (lat, lon).
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_meters)
+    lat_step = _lat_step(cell_size)
+
+    cells = []
+    for row in range(math.floor(min_lat / lat_step), math.floor(max_lat / lat_step) + 1):
+        lon_step = _lon_step(row, cell_size)
+        for col in range(math.floor(min_lon / lon_step), math.floor(max_lon / lon_step) + 1):
+            cells.append(_cell_key(row, col))
+    return cells
+
+
+def neighbour_cell_pairs(
+    lats, lons, radius_meters: float, cell_size: float = CELL_SIZE_METERS
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wektorowa wersja neighbour_cells dla wielu punktów: tablice par (indeks punktu, komórka),
+    dla każdego punktu te same komórki co neighbour_cells.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    angular = radius_meters / EARTH_RADIUS_METERS
+    dlat = math.degrees(angular)
+    lat_step = _lat_step(cell_size)
+
+    # prostokąt przy biegunie obejmuje wszystkie długości – te (rzadkie) punkty liczymy pojedynczo
+    polar = (lats - dlat <= -90) | (lats + dlat >= 90)
+    regular = np.flatnonzero(~polar)
+    lat, lon = lats[regular], lons[regular]
+    dlon = np.degrees(np.arcsin(np.minimum(1.0, math.sin(angular) / np.cos(np.radians(lat)))))
+    first_row = np.floor((lat - dlat) / lat_step).astype(np.int64)
+    last_row = np.floor((lat + dlat) / lat_step).astype(np.int64)
+
+    points, cells = [], []
+    for row_offset in range(int((last_row - first_row).max(initial=-1)) + 1):
+        row = first_row + row_offset
+        in_row = row <= last_row
+        lon_step = lat_step / np.maximum(np.cos(np.radians((row + 0.5) * lat_step)), 1e-6)
+        first_col = np.floor((lon - dlon) / lon_step).astype(np.int64)
+        last_col = np.floor((lon + dlon) / lon_step).astype(np.int64)
+        for col_offset in range(int((last_col - first_col)[in_row].max(initial=-1)) + 1):
+            take = in_row & (first_col + col_offset <= last_col)
+            points.append(regular[take])
+            cells.append(row[take] * _COL_SPAN + first_col[take] + col_offset + _COL_OFFSET)
+
+    for point in np.flatnonzero(polar).tolist():
+        point_cells = neighbour_cells(lats[point], lons[point], radius_meters, cell_size)
+        points.append(np.full(len(point_cells), point, dtype=np.int64))
+        cells.append(np.array(point_cells, dtype=np.int64))
+
+    if not points:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(points), np.concatenate(cells)
+
+
+def height_band(height: float | None, band_size: float = HEIGHT_BAND_METERS) -> int | None:
+    """Zwraca numer pasma wysokości lub None, jeśli wysokość jest nieznana"""
+    if height is None:
+        return None
+    return math.floor(height / band_size)
@@ -0,0 +1,263 @@
+"""
+Metryki procesu w formacie tekstowym Prometheusa (GET /metrics).
+
+Liczniki, wskaźniki i histogramy trzymane są w pamięci procesu – każdy worker
+wystawia własne wartości, a sumowanie między workerami zostaje po stronie Prometheusa.
+Aktualizacja to jedno wyszukanie w słowniku pod blokadą, więc koszt na żądanie jest znikomy.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Przedziały histogramów w sekundach – od pojedynczych milisekund do kilku sekund
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Wartość, która tylko rośnie (np. liczba żądań)"""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Gauge(Counter):
+    """Wartość, która rośnie i maleje (np. liczba żądań w trakcie obsługi)"""
+
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Rozkład wartości w stałych przedziałach, z sumą i liczbą obserwacji"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # liczniki przedziałów (ostatni to +Inf) i suma obserwacji
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, *labels: str) -> int:
+        state = self._values.get(labels)
+        return sum(state[0]) if state is not None else 0
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        names = self.labelnames + ("le",)
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for upper, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    _format_labels(names, labels + (_format_value(upper),)),
+                    cumulative,
+                )
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labels), total
+            yield f"{self.name}_count", _format_labels(self.labelnames, labels), cumulative
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> bytes:
+        lines = [line for metric in self._metrics for line in metric.render()]
+        return ("\n".join(lines) + "\n").encode()
+
+    def clear(self) -> None:
+        for metric in self._metrics:
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds, including the streamed body",
+    ("method", "route"),
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled", ("method",)
+)
+measurements_ingested_total = registry.counter(
+    "measurements_ingested_total",
+    "Measurements written to aggregates by source (api, compactor, import) and result (merged, created)",
+    ("source", "result"),
+)
+raw_measurements_received_total = registry.counter(
+    "raw_measurements_received_total", "Samples appended to the raw measurement log"
+)
+db_commit_duration_seconds = registry.histogram(
+    "db_commit_duration_seconds", "Duration of Session.commit() in seconds, including the final flush"
+)
+cache_requests_total = registry.counter(
+    "cache_requests_total", "In-process response cache lookups by cache and result (hit, miss)",
+    ("cache", "result"),
+)
+
+
+def count_ingested(source: str, merged: int, created: int) -> None:
+    if merged:
+        measurements_ingested_total.inc(source, "merged", amount=merged)
+    if created:
+        measurements_ingested_total.inc(source, "created", amount=created)
+
+
+_COMMIT_STARTED = "metrics_commit_started"
+
+
+def _before_commit(session: Session) -> None:
+    session.info[_COMMIT_STARTED] = time.perf_counter()
+
+
+def _after_commit(session: Session) -> None:
+    started: Optional[float] = session.info.pop(_COMMIT_STARTED, None)
+    if started is not None:
+        db_commit_duration_seconds.observe(time.perf_counter() - started)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_COMMIT_STARTED, None)
+
+
+def instrument_sessions() -> None:
+    """Mierz czas commitów wszystkich sesji SQLAlchemy (również tych pod AsyncSession)"""
+    if not event.contains(Session, "before_commit", _before_commit):
+        event.listen(Session, "before_commit", _before_commit)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+
+
+class MetricsMiddleware:
+    """
+    Czysty middleware ASGI: liczba żądań, czas obsługi i żądania w toku.
+    Trasa to szablon ścieżki (np. /measurements/{measurement_id}) ustawiony przez router
+    w scope, więc liczba serii nie rośnie z liczbą identyfikatorów.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec(method)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            http_requests_total.inc(method, path, str(status))
+            http_request_duration_seconds.observe(elapsed, method, path)
@@ -0,0 +1,22 @@
+import base64
+from datetime import datetime
+
+
+def encode_cursor(timestamp: datetime, measurement_id: int) -> str:
+    """
+    Zakoduj pozycję (timestamp, id) ostatniego zwróconego wiersza jako nieprzezroczysty kursor.
+    """
+    raw = f"{timestamp.isoformat()}|{measurement_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Odkoduj kursor z encode_cursor. Rzuca ValueError dla niepoprawnego kursora.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, measurement_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(measurement_id)
+    except (UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Niepoprawny kursor: {cursor}") from e
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+from decouple import Csv, config
+from sqlalchemy import case
+
+POOR_COLOR, FAIR_COLOR, GOOD_COLOR = '#B22D2D', '#E4A316', '#67B22D'
+
+_pair = Csv(cast=float, post_process=tuple)
+
+# Zakresy normalizacji "min,max", wagi "pobieranie,wysyłanie,ping" i progi wyniku (0-100) "słaby,średni"
+SCORE_DOWNLOAD_RANGE = config("SCORE_DOWNLOAD_RANGE", default="1,150", cast=_pair)
+SCORE_UPLOAD_RANGE = config("SCORE_UPLOAD_RANGE", default="1,100", cast=_pair)
+SCORE_PING_RANGE = config("SCORE_PING_RANGE", default="8,600", cast=_pair)
+SCORE_WEIGHTS = config("SCORE_WEIGHTS", default="5,3,2", cast=_pair)
+SCORE_THRESHOLDS = config("SCORE_THRESHOLDS", default="20,60", cast=_pair)
+
+
+@dataclass(frozen=True)
+class ScoringEngine:
+    """
+    Znormalizowany, ważony wynik połączenia i kolor agregatu.
+
+    Ten sam wzór liczy pojedyncze wartości, tablice NumPy (całe porcje naraz)
+    i wyrażenia SQL, więc kolor wyliczony w Pythonie i w bazie jest ten sam.
+    Wszystkie parametry są floatami, żeby w SQL dzielenie nie było całkowite.
+    """
+
+    download_range: Tuple[float, float] = (1.0, 150.0)
+    upload_range: Tuple[float, float] = (1.0, 100.0)
+    ping_range: Tuple[float, float] = (8.0, 600.0)
+    weights: Tuple[float, float, float] = (5.0, 3.0, 2.0)
+    thresholds: Tuple[float, float] = (20.0, 60.0)
+    palette: Tuple[str, str, str] = (POOR_COLOR, FAIR_COLOR, GOOD_COLOR)
+
+    @classmethod
+    def from_config(cls) -> "ScoringEngine":
+        return cls(
+            download_range=SCORE_DOWNLOAD_RANGE,
+            upload_range=SCORE_UPLOAD_RANGE,
+            ping_range=SCORE_PING_RANGE,
+            weights=SCORE_WEIGHTS,
+            thresholds=SCORE_THRESHOLDS,
+        )
+
+    def score(self, download_speed, upload_speed, ping):
+        """Wynik 0-100 (poza zakresami może z niego wyjść) dla liczb, tablic lub wyrażeń SQL"""
+        (min_download, max_download), (min_upload, max_upload), (min_ping, max_ping) = (
+            self.download_range, self.upload_range, self.ping_range
+        )
+        download_weight, upload_weight, ping_weight = self.weights
+
+        normalized_download = ((download_speed - min_download) / (max_download - min_download)) * 100
+        normalized_upload = ((upload_speed - min_upload) / (max_upload - min_upload)) * 100
+        normalized_ping = (1 - ((ping - min_ping) / (max_ping - min_ping))) * 100
+
+        return (
+            (download_weight * normalized_download) +
+            (upload_weight * normalized_upload) +
+            (ping_weight * normalized_ping)) / (download_weight + upload_weight + ping_weight)
+
+    def color(self, download_speed: float, upload_speed: float, ping: float) -> str:
+        score = self.score(download_speed, upload_speed, ping)
+        poor_score, fair_score = self.thresholds
+        poor_color, fair_color, good_color = self.palette
+
+        if score <= poor_score:
+            return poor_color
+        if score <= fair_score:
+            return fair_color
+        return good_color
+
+    def colors(self, download_speeds, upload_speeds, pings) -> np.ndarray:
+        """
+        Kolory dla tablic wartości w jednym przebiegu. NaN (brak wartości) daje kolor
+        dobry – tak jak NULL w color_expression.
+        """
+        score = self.score(
+            np.asarray(download_speeds, dtype=float),
+            np.asarray(upload_speeds, dtype=float),
+            np.asarray(pings, dtype=float),
+        )
+        poor_score, fair_score = self.thresholds
+        poor_color, fair_color, good_color = self.palette
+        return np.select(
+            [score <= poor_score, score <= fair_score], [poor_color, fair_color], default=good_color
+        )
+
+    def color_expression(self, download_speed, upload_speed, ping):
+        """Wyrażenie SQL CASE z kolorem dla kolumn lub wyrażeń SQL"""
+        score = self.score(download_speed, upload_speed, ping)
+        poor_score, fair_score = self.thresholds
+        poor_color, fair_color, good_color = self.palette
+        return case(
+            (score <= poor_score, poor_color),
+            (score <= fair_score, fair_color),
+            else_=good_color,
+        )
+
+
+scoring_engine = ScoringEngine.from_config()
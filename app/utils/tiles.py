@@ -0,0 +1,133 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Tuple
+
+from decouple import config
+
+from app.utils.metrics import cache_requests_total
+
+# Najwyższy obsługiwany poziom przybliżenia kafelków (standard slippy map)
+MAX_TILE_ZOOM = 22
+
+# Kafelek dzielony jest na TILE_GRID_SIZE x TILE_GRID_SIZE komórek – to ogranicza rozmiar odpowiedzi
+TILE_GRID_SIZE = 16
+
+# Granica szerokości geograficznej rzutu Web Mercator
+MAX_MERCATOR_LATITUDE = 85.05112878
+
+TILE_CACHE_SIZE = config("TILE_CACHE_SIZE", default=2048, cast=int)
+# Zmiany z innych procesów nie unieważniają lokalnej pamięci – ogranicza to czas życia wpisu
+TILE_CACHE_TTL_SECONDS = config("TILE_CACHE_TTL_SECONDS", default=60, cast=int)
+
+
+def _latitude_at(y: float, n: float) -> float:
+    """Szerokość geograficzna górnej krawędzi (ułamkowego) wiersza kafelków y z n"""
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Zwraca (min_lat, max_lat, min_lon, max_lon) kafelka z/x/y"""
+    n = 2 ** z
+    return (
+        _latitude_at(y + 1, n),
+        _latitude_at(y, n),
+        x / n * 360.0 - 180.0,
+        (x + 1) / n * 360.0 - 180.0,
+    )
+
+
+def tile_row_edges(z: int, y: int, rows: int = TILE_GRID_SIZE) -> list[float]:
+    """
+    Szerokości geograficzne dolnych krawędzi wierszy komórek kafelka, od góry.
+    W Mercatorze wiersze nie są równe w stopniach, więc krawędzie liczone są w rzucie.
+    """
+    n = 2 ** z * rows
+    return [_latitude_at(y * rows + row + 1, n) for row in range(rows)]
+
+
+def tile_for_point(latitude: float, longitude: float, z: int) -> Tuple[int, int]:
+    """Zwraca (x, y) kafelka na poziomie z, w którym leży punkt"""
+    n = 2 ** z
+    latitude = max(min(latitude, MAX_MERCATOR_LATITUDE), -MAX_MERCATOR_LATITUDE)
+    x = math.floor((longitude + 180.0) / 360.0 * n)
+    y = math.floor((1 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+class TileCache:
+    """
+    Pamięć podręczna zserializowanych kafelków (treści odpowiedzi, np. w kilku formatach)
+    z unieważnianiem pojedynczych kafelków.
+
+    Zapis pomiaru unieważnia tylko kafelki zawierające jego punkt (po jednym na poziom
+    przybliżenia), pozostałe kafelki zostają w pamięci. Kafelek liczony w trakcie
+    unieważnienia (między begin() a put()) nie zostanie zapisany, bo mógłby nie
+    uwzględniać tej zmiany.
+    """
+
+    def __init__(
+        self, maxsize: int = TILE_CACHE_SIZE, ttl_seconds: float = TILE_CACHE_TTL_SECONDS, name: str = "tiles"
+    ):
+        self.maxsize = maxsize
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+        # kafelki liczone w tej chwili: klucz -> [liczba obliczeń, generacja ostatniego unieważnienia]
+        self._in_flight: dict[tuple, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                cache_requests_total.inc(self.name, "miss")
+                return None
+            self._entries.move_to_end(key)
+        cache_requests_total.inc(self.name, "hit")
+        return entry[1]
+
+    def begin(self, key: tuple) -> int:
+        """Zarejestruj rozpoczęcie liczenia kafelka; zwraca token dla put()"""
+        with self._lock:
+            in_flight = self._in_flight.setdefault(key, [0, -1])
+            in_flight[0] += 1
+            return self._generation
+
+    def put(self, key: tuple, body: Optional[Any], token: int) -> None:
+        """Zapisz kafelek policzony od begin() (body=None tylko kończy obliczenie)"""
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            invalidated = False
+            if in_flight is not None:
+                invalidated = in_flight[1] >= token
+                in_flight[0] -= 1
+                if in_flight[0] <= 0:
+                    del self._in_flight[key]
+            if body is None or invalidated:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_points(self, points: Iterable[Tuple[float, float]]) -> None:
+        """Usuń kafelki wszystkich poziomów, w których leży któryś z punktów"""
+        with self._lock:
+            generation = self._generation
+            self._generation += 1
+            for latitude, longitude in points:
+                for z in range(MAX_TILE_ZOOM + 1):
+                    key = (z, *tile_for_point(latitude, longitude, z))
+                    self._entries.pop(key, None)
+                    if key in self._in_flight:
+                        self._in_flight[key][1] = generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+tile_cache = TileCache()
@@ -0,0 +1,101 @@
+"""
+Przepustowość POST /measurements/ bez tokenu i z tokenem JWT:
+
+- anonymous: bez nagłówka Authorization,
+- uncached:  z tokenem, AUTH_CACHE_SIZE=0 – dekodowanie JWT i zapytanie do users przy każdym żądaniu,
+- cached:    z tokenem i domyślnymi pamięciami podręcznymi tokenów i użytkowników.
+
+Zapisy idą przez kolejkę z grupowym commitem (app.crud.ingest_queue), żeby koszt żądania
+nie był zdominowany przez fsync pojedynczego commita. Każdy tryb działa w osobnym procesie
+na świeżej bazie tymczasowej.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_auth [liczba_żądań]
+"""
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ["anonymous", "uncached", "cached"]
+DEFAULT_REQUESTS = 2000
+CONCURRENCY = 64
+USER = {"email": "bench@example.com", "password": "benchpassword"}
+
+
+def _payload(rng: random.Random) -> dict:
+    return {
+        "latitude": rng.uniform(51.1080, 51.1100),
+        "longitude": rng.uniform(17.0570, 17.0610),
+        "height": 120.0,
+        "download_speed": rng.uniform(1, 150),
+        "upload_speed": rng.uniform(1, 100),
+        "ping": rng.randint(8, 600),
+    }
+
+
+async def _load(mode: str, requests: int) -> None:
+    import httpx
+
+    from app.crud.ingest_queue import measurement_writer
+    from app.main import app
+
+    rng = random.Random(0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {}
+        if mode != "anonymous":
+            await client.post("/user/register", json=USER)
+            token = (await client.post("/user/login", json=USER)).json()["access_token"]
+            headers["Authorization"] = f"Bearer {token}"
+
+        remaining = requests
+        errors = 0
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                response = await client.post("/measurements/", json=_payload(rng), headers=headers)
+                errors += response.status_code != 201
+
+        await measurement_writer.start()
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(CONCURRENCY)])
+        elapsed = time.perf_counter() - start
+        await measurement_writer.stop()
+
+    print(
+        f"{mode:<9} | {requests / elapsed:8.1f} żądań/s ({requests} żądań w {elapsed:.2f} s, błędów: {errors})",
+        file=sys.__stdout__,
+    )
+
+
+def run(mode: str, requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        if mode == "uncached":
+            env["AUTH_CACHE_SIZE"] = "0"
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_auth", "--mode", mode, str(requests)],
+            env=env,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--mode"]:
+        import logging
+
+        logging.disable(logging.INFO)
+        # create_measurement wypisuje komunikaty na stdout – wyciszamy je na czas pomiaru
+        sys.stdout = open(os.devnull, "w")
+        asyncio.run(_load(args[1], int(args[2])))
+    else:
+        requests = int(args[0]) if args else DEFAULT_REQUESTS
+        for mode in MODES:
+            run(mode, requests)
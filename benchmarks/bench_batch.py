@@ -0,0 +1,84 @@
+"""
+Benchmark odtwarzania pomiarów zbuforowanych offline: POST /measurements/
+po jednym vs. jedno żądanie POST /measurements/batch.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_batch [liczba_pomiarów]
+"""
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, get_db
+from app.main import app
+
+DEFAULT_COUNT = 500
+
+
+def _payload(rng: random.Random) -> dict:
+    # punkty wzdłuż trasy przez kampus – część trafi do istniejących agregatów
+    return {
+        "latitude": rng.uniform(51.1080, 51.1100),
+        "longitude": rng.uniform(17.0570, 17.0610),
+        "height": 120.0,
+        "download_speed": rng.uniform(1, 150),
+        "upload_speed": rng.uniform(1, 100),
+        "ping": rng.randint(8, 600),
+    }
+
+
+def run(count: int, batch: bool) -> None:
+    rng = random.Random(0)
+    payloads = [_payload(rng) for _ in range(count)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        commits = 0
+
+        @event.listens_for(engine, "commit")
+        def _count_commit(conn):
+            nonlocal commits
+            commits += 1
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if batch:
+                assert client.post("/measurements/batch", json=payloads).status_code == 201
+            else:
+                for payload in payloads:
+                    assert client.post("/measurements/", json=payload).status_code == 201
+        elapsed = time.perf_counter() - start
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    label = "POST /measurements/batch" if batch else "POST /measurements/ x N"
+    print(f"{label:<26} {count} pomiarów: {elapsed * 1000:9.1f} ms, commitów: {commits}")
+
+
+if __name__ == "__main__":
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    run(count, batch=False)
+    run(count, batch=True)
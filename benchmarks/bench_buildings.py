@@ -0,0 +1,86 @@
+"""
+Benchmark klasyfikacji punktów do budynków: dawna pętla po poligonach
+vs. BuildingIndex (STRtree + przygotowane geometrie) i wersja wsadowa.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_buildings [liczba_budynków_syntetycznych]
+"""
+import random
+import sys
+import time
+
+from shapely.geometry import Point, Polygon
+
+from app.utils.buildings import BUILDINGS, BuildingIndex
+
+POINTS = 20_000
+LEGACY_POINTS = 2_000
+DEFAULT_SYNTHETIC_BUILDINGS = 500
+
+
+def legacy_find_building(buildings: dict, lat: float, lon: float) -> str:
+    """Dawna implementacja: budowa i test każdego poligonu przy każdym wywołaniu"""
+    point = Point(lon, lat)
+    for name, coords in buildings.items():
+        polygon = Polygon((lon, lat) for (lat, lon) in coords)
+        if polygon.contains(point):
+            return name
+    return "Politechnika Wrocławska"
+
+
+def synthetic_campus(count: int) -> dict:
+    """Siatka `count` prostokątnych budynków ~40x60 m w okolicy kampusu"""
+    buildings = {}
+    per_row = int(count ** 0.5) + 1
+    for i in range(count):
+        lat = 51.100 + (i // per_row) * 0.0008
+        lon = 17.050 + (i % per_row) * 0.0012
+        buildings[f"B-{i}"] = [
+            (lat, lon),
+            (lat + 0.00036, lon),
+            (lat + 0.00036, lon + 0.00086),
+            (lat, lon + 0.00086),
+        ]
+    return buildings
+
+
+def _points(buildings: dict, count: int, rng: random.Random) -> tuple[list, list]:
+    coords = [c for polygon in buildings.values() for c in polygon]
+    min_lat, max_lat = min(c[0] for c in coords), max(c[0] for c in coords)
+    min_lon, max_lon = min(c[1] for c in coords), max(c[1] for c in coords)
+    lats = [rng.uniform(min_lat, max_lat) for _ in range(count)]
+    lons = [rng.uniform(min_lon, max_lon) for _ in range(count)]
+    return lats, lons
+
+
+def _per_point_us(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def run(label: str, buildings: dict) -> None:
+    rng = random.Random(0)
+    lats, lons = _points(buildings, POINTS, rng)
+    index = BuildingIndex(buildings)
+
+    legacy = _per_point_us(
+        lambda: [legacy_find_building(buildings, lats[i], lons[i]) for i in range(LEGACY_POINTS)],
+        LEGACY_POINTS,
+    )
+    single = _per_point_us(lambda: [index.find(lat, lon) for lat, lon in zip(lats, lons)], POINTS)
+    batch = _per_point_us(lambda: index.find_many(lats, lons), POINTS)
+
+    expected = [legacy_find_building(buildings, lats[i], lons[i]) for i in range(LEGACY_POINTS)]
+    assert index.find_many(lats[:LEGACY_POINTS], lons[:LEGACY_POINTS]) == expected
+
+    print(
+        f"{label:<32} | dawna pętla {legacy:9.2f} µs/pkt | find {single:7.2f} µs/pkt "
+        f"| find_many {batch:6.3f} µs/pkt"
+    )
+
+
+if __name__ == "__main__":
+    synthetic = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SYNTHETIC_BUILDINGS
+    run(f"kampus ({len(BUILDINGS)} budynków)", BUILDINGS)
+    run(f"syntetyczny ({synthetic} budynków)", synthetic_campus(synthetic))
@@ -0,0 +1,84 @@
+"""
+Benchmark synchronizacji przyrostowej: odświeżenie mapy po kilku zapisach przez pobranie
+wszystkich stron GET /measurements/ (MeasurementService.get_measurements) vs. jedno
+zapytanie o zmiany od zapamiętanego kursora (MeasurementService.get_changes).
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_changes [liczba_agregatów]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.crud.changes import record_changes
+from app.crud.measurement import MAX_PAGE_LIMIT
+from app.db.database import Base, _set_sqlite_pragmas
+from app.models import Measurement, MeasurementChange
+from app.schemas import MeasurementCreate
+from benchmarks.datagen import campus_points, seed_measurements
+
+DEFAULT_SIZE = 100_000
+WRITES = 20
+REPEATS = 5
+
+
+def _full_refresh(service: MeasurementService) -> int:
+    rows, cursor = 0, None
+    while True:
+        page, cursor = service.get_measurements(limit=MAX_PAGE_LIMIT, cursor=cursor)
+        rows += len(page)
+        if cursor is None:
+            return rows
+
+
+def _median_ms(fn) -> tuple[float, int]:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def run(size: int) -> None:
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(bind=engine)
+        seed_measurements(engine, size, rng)
+        Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        with Session() as db:
+            record_changes(db, select(Measurement.id))
+            db.commit()
+            service = MeasurementService(db)
+            cursor = db.scalar(select(func.max(MeasurementChange.seq)))
+
+            lats, lons, _ = campus_points(WRITES, rng)
+            service.create_measurements([
+                MeasurementCreate(latitude=lat, longitude=lon, height=120.0,
+                                  download_speed=50.0, upload_speed=20.0, ping=30)
+                for lat, lon in zip(lats.tolist(), lons.tolist())
+            ])
+
+            full_ms, rows = _median_ms(lambda: _full_refresh(service))
+            delta_ms, changes = _median_ms(lambda: service.get_changes(since=cursor))
+            print(f"{size:,} agregatów, {WRITES} zapisów od ostatniego odświeżenia")
+            print(f"  wszystkie strony GET /measurements/ {full_ms:8.1f} ms ({rows:,} wierszy)")
+            print(
+                f"  GET /measurements/changes           {delta_ms:8.2f} ms "
+                f"({len(changes['changed'])} zmienionych) | x{full_ms / delta_ms:,.0f}"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
@@ -0,0 +1,82 @@
+"""
+Benchmark formatu kolumnowego (app.utils.columnar) względem JSON dla całego kampusu:
+rozmiar odpowiedzi (również po gzip) oraz czas serializacji i odczytu.
+Strony po 1000 agregatów, jak przy pobieraniu mapy przez GET /measurements/.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_columnar [liczba_agregatów]
+"""
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.crud.measurement import EXPORT_COLUMNS, MAX_PAGE_LIMIT
+from app.db.database import Base
+from app.utils.columnar import decode_columns, measurement_columns
+from app.utils.export import json_rows
+from benchmarks.datagen import seed_measurements
+
+DEFAULT_SIZE = 100_000
+REPEATS = 5
+
+
+def _pages(Session) -> list:
+    pages = []
+    with Session() as db:
+        service = MeasurementService(db)
+        cursor = None
+        while True:
+            page, cursor = service.get_measurements(limit=MAX_PAGE_LIMIT, cursor=cursor)
+            pages.append(page)
+            if cursor is None:
+                return pages
+
+
+def _median_ms(fn) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed_measurements(engine, size, np.random.default_rng(0))
+        pages = _pages(sessionmaker(bind=engine, autoflush=False))
+        engine.dispose()
+
+    columns = [column.key for column in EXPORT_COLUMNS]
+    formats = {
+        "JSON": (lambda page: json_rows(columns, page), json.loads),
+        "kolumnowy": (measurement_columns, decode_columns),
+    }
+    print(f"{size:,} agregatów, {len(pages)} stron")
+    json_size = None
+    for label, (encode, decode) in formats.items():
+        bodies = [encode(page) for page in pages]
+        raw = sum(len(body) for body in bodies)
+        compressed = sum(len(gzip.compress(body, 6)) for body in bodies)
+        encode_ms = _median_ms(lambda: [encode(page) for page in pages])
+        decode_ms = _median_ms(lambda: [decode(body) for body in bodies])
+        json_size = json_size or raw
+        print(
+            f"  {label:<10} {raw / 2**20:7.2f} MiB (x{json_size / raw:4.1f} mniej) | gzip {compressed / 2**20:6.2f} MiB"
+            f" | zapis {encode_ms:7.1f} ms | odczyt {decode_ms:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
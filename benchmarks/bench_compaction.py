@@ -0,0 +1,83 @@
+"""
+Benchmark dziennika surowych pomiarów: opóźnienie zapisu create_raw_measurement
+w porównaniu z create_measurement (scalanie w żądaniu) oraz przepustowość
+kompaktowania oczekujących próbek porcjami.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_compaction [liczba_agregatów]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.db.database import Base, _set_sqlite_pragmas
+from app.jobs.compactor import MeasurementCompactor
+from app.schemas import MeasurementCreate
+from benchmarks.bench_ingest import HEIGHT, _offset, _percentile, seed
+
+DEFAULT_SIZE = 100_000
+PROBES = 500
+PENDING = 20_000
+
+
+def _payloads(rng: random.Random, extent: float, count: int) -> list[MeasurementCreate]:
+    payloads = []
+    for _ in range(count):
+        lat, lon = _offset(rng.uniform(0, extent), rng.uniform(0, extent))
+        payloads.append(MeasurementCreate(
+            latitude=lat, longitude=lon, height=HEIGHT,
+            download_speed=rng.uniform(1, 150), upload_speed=rng.uniform(1, 100),
+            ping=rng.randint(8, 600),
+        ))
+    return payloads
+
+
+def _latencies(write, payloads) -> list[float]:
+    timings = []
+    for payload in payloads:
+        start = time.perf_counter()
+        write(payload)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run(size: int) -> None:
+    rng = random.Random(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(bind=engine)
+        extent = seed(engine, size)
+        Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        with Session() as db:
+            service = MeasurementService(db)
+            merged = _latencies(service.create_measurement, _payloads(rng, extent, PROBES))
+            raw = _latencies(service.create_raw_measurement, _payloads(rng, extent, PROBES))
+            for payload in _payloads(rng, extent, PENDING - PROBES):
+                service.create_raw_measurement(payload)
+
+            compactor = MeasurementCompactor(db)
+            start = time.perf_counter()
+            compacted = compactor.compact_all()
+            elapsed = time.perf_counter() - start
+
+        engine.dispose()
+
+    print(
+        f"{size:>10,} agregatów | create_measurement: mediana {statistics.median(merged):6.2f} ms, "
+        f"p95 {_percentile(merged, 0.95):6.2f} ms | create_raw_measurement: mediana "
+        f"{statistics.median(raw):6.2f} ms, p95 {_percentile(raw, 0.95):6.2f} ms"
+    )
+    print(f"kompaktowanie {compacted:,} próbek: {elapsed:.2f} s ({compacted / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
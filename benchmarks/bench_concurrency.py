@@ -0,0 +1,129 @@
+"""
+Benchmark opóźnień GET podczas intensywnego zapisu dla trzech ścieżek bazy danych:
+
+- inline:     synchroniczny MeasurementService wołany wprost w handlerze async (dawne zachowanie),
+- threadpool: ASYNC_DB=0 – synchroniczna sesja wykonywana w puli wątków,
+- aiosqlite:  ASYNC_DB=1 – AsyncSession na sterowniku aiosqlite.
+
+Każdy tryb działa w osobnym procesie na świeżej bazie tymczasowej.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_concurrency [czas_trwania_s]
+"""
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ["inline", "threadpool", "aiosqlite"]
+DEFAULT_DURATION = 5.0
+WRITERS = 8
+READERS = 2
+SEED_COUNT = 500
+
+
+def _payload(rng: random.Random) -> dict:
+    return {
+        "latitude": rng.uniform(51.1080, 51.1100),
+        "longitude": rng.uniform(17.0570, 17.0610),
+        "height": 120.0,
+        "download_speed": rng.uniform(1, 150),
+        "upload_speed": rng.uniform(1, 100),
+        "ping": rng.randint(8, 600),
+    }
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _load(mode: str, duration: float) -> None:
+    import httpx
+    from fastapi import Depends
+
+    from app.crud import AsyncMeasurementService, MeasurementService
+    from app.db.database import async_engine, get_db
+    from app.dependencies import get_measurement_service
+    from app.main import app
+
+    if mode == "inline":
+        def inline_service(db=Depends(get_db)):
+            service = MeasurementService(db)
+
+            async def runner(method, *args, **kwargs):
+                return getattr(service, method)(*args, **kwargs)
+
+            return AsyncMeasurementService(runner)
+
+        app.dependency_overrides[get_measurement_service] = inline_service
+
+    rng = random.Random(0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        seeded = await client.post(
+            "/measurements/batch", json=[_payload(rng) for _ in range(SEED_COUNT)]
+        )
+        ids = [item["measurement"]["id"] for item in seeded.json()]
+
+        deadline = time.perf_counter() + duration
+        latencies: list[float] = []
+        writes = 0
+        errors = 0
+
+        async def writer() -> None:
+            nonlocal writes, errors
+            while time.perf_counter() < deadline:
+                response = await client.post("/measurements/", json=_payload(rng))
+                writes += 1
+                errors += response.status_code != 201
+
+        async def reader() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get(f"/measurements/{rng.choice(ids)}")
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*[writer() for _ in range(WRITERS)], *[reader() for _ in range(READERS)])
+
+    if async_engine is not None:
+        await async_engine.dispose()
+
+    print(
+        f"{mode:<11} | GET p50 {_percentile(latencies, 0.5):7.2f} ms, p99 {_percentile(latencies, 0.99):7.2f} ms "
+        f"({len(latencies)} odczytów) | zapisów: {writes} (błędów: {errors})",
+        file=sys.__stdout__,
+    )
+
+
+def run(mode: str, duration: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            ASYNC_DB="1" if mode == "aiosqlite" else "0",
+        )
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_concurrency", "--mode", mode, str(duration)],
+            env=env,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--mode"]:
+        import logging
+
+        logging.disable(logging.INFO)
+        # create_measurement wypisuje komunikaty na stdout – wyciszamy je na czas pomiaru
+        sys.stdout = open(os.devnull, "w")
+        asyncio.run(_load(args[1], float(args[2])))
+    else:
+        duration = float(args[0]) if args else DEFAULT_DURATION
+        for mode in MODES:
+            run(mode, duration)
@@ -0,0 +1,72 @@
+"""
+Benchmark eksportu: strumień NDJSON/CSV (MeasurementService.iter_export_partitions)
+vs. zbudowanie jednej listy MeasurementResponse jak w GET /measurements/.
+Mierzy czas i szczytowe zużycie pamięci (tracemalloc – zawyża czasy kilkukrotnie,
+miarodajne są proporcje i pamięć).
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_export [liczba_agregatów]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.crud.measurement import EXPORT_COLUMNS
+from app.db.database import Base
+from app.models import Measurement
+from app.schemas import MeasurementResponse
+from app.utils.export import csv_chunks, gzip_chunks, ndjson_chunks
+from benchmarks.bench_nearby import seed
+
+DEFAULT_SIZE = 1_000_000
+
+
+def _measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:7.2f} s | {size / 2**20:8.1f} MiB wyjścia | szczyt pamięci {peak / 2**20:8.1f} MiB")
+
+
+def run(size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed(engine, size, random.Random(0))
+        Session = sessionmaker(bind=engine, autoflush=False)
+        columns = [column.key for column in EXPORT_COLUMNS]
+
+        def stream(to_chunks, gzip=False):
+            with Session() as db:
+                chunks = to_chunks(columns, MeasurementService(db).iter_export_partitions())
+                if gzip:
+                    chunks = gzip_chunks(chunks)
+                return sum(len(chunk) for chunk in chunks)
+
+        def materialize():
+            with Session() as db:
+                return len(TypeAdapter(list[MeasurementResponse]).dump_json(
+                    [MeasurementResponse.model_validate(m) for m in db.query(Measurement).all()]
+                ))
+
+        print(f"{size:,} agregatów")
+        _measure("export NDJSON", lambda: stream(ndjson_chunks))
+        _measure("export CSV", lambda: stream(csv_chunks))
+        _measure("export CSV + gzip", lambda: stream(csv_chunks, gzip=True))
+        _measure("jedna lista (jak GET /)", materialize)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
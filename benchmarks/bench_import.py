@@ -0,0 +1,78 @@
+"""
+Benchmark importu kampanii (app.jobs.importer): wygenerowany plik w formacie data.txt
+z pojedynczymi pomiarami na obszarze kampusu, import do pustej bazy i ponowne
+uruchomienie (które nie powinno nic zmienić).
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_import [liczba_wierszy]
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.jobs.importer import MeasurementImporter
+from app.models import Measurement
+
+DEFAULT_ROWS = 1_000_000
+
+# ~2 x 2 km wokół kampusu – gęstość daje mieszankę nowych i scalanych agregatów
+MIN_LAT, MAX_LAT = 51.100, 51.118
+MIN_LON, MAX_LON = 17.045, 17.074
+
+COLUMNS = "id|user_id|latitude|longitude|height|download_speed|upload_speed|ping|timestamp|color"
+
+
+def write_campaign(path: str, rows: int, rng: random.Random) -> None:
+    start = datetime(2025, 5, 29, 8, 0)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(COLUMNS + "\n")
+        for i in range(rows):
+            f.write(
+                f"{i + 1}||{rng.uniform(MIN_LAT, MAX_LAT)}|{rng.uniform(MIN_LON, MAX_LON)}|"
+                f"{rng.choice((120.0, 124.0, 128.0))}|{rng.uniform(1, 150):.1f}|{rng.uniform(1, 100):.1f}|"
+                f"{rng.randint(8, 600)}|{start + timedelta(seconds=i)}|green\n"
+            )
+
+
+def run(rows: int) -> None:
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "campaign.txt")
+        write_campaign(path, rows, random.Random(0))
+
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            start = time.perf_counter()
+            stats = MeasurementImporter(db).import_file(path)
+            elapsed = time.perf_counter() - start
+
+            rerun_start = time.perf_counter()
+            rerun = MeasurementImporter(db).import_file(path)
+            rerun_elapsed = time.perf_counter() - rerun_start
+
+            aggregates, measurements = db.execute(
+                select(func.count(), func.sum(Measurement.measurement_count))
+            ).one()
+        engine.dispose()
+
+    print(
+        f"{rows:,} wierszy: {elapsed:6.1f} s ({rows / elapsed:,.0f} wierszy/s), nowe agregaty "
+        f"{stats.created:,}, scalone {stats.merged:,} | w bazie {aggregates:,} agregatów / "
+        f"{measurements:,} pomiarów | ponowny import: {rerun_elapsed:.2f} s, "
+        f"pominięty={rerun.already_imported}"
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS)
@@ -0,0 +1,134 @@
+"""
+Benchmark opóźnienia MeasurementService.create_measurement w zależności od
+liczby agregatów w budynku (indeks siatki vs. dawne skanowanie całego budynku).
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_ingest [liczba_agregatów ...]
+"""
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.db.database import Base
+from app.models import Measurement
+from app.schemas import MeasurementCreate
+from app.utils.buildings import find_building
+from app.utils.distance_utils import METERS_PER_DEGREE, haversine_distance
+from app.utils.grid import grid_cell, height_band
+
+DEFAULT_SIZES = [100, 10_000, 100_000, 1_000_000]
+PROBES = 200
+LEGACY_PROBES = 3
+SEED_CHUNK = 50_000
+
+# obszar poza poligonami kampusu – find_building zwraca tam budynek domyślny
+ORIGIN_LAT, ORIGIN_LON = 51.0, 16.9
+SPACING_METERS = 6.0
+HEIGHT = 120.0
+BUILDING = find_building(ORIGIN_LAT, ORIGIN_LON)
+
+
+def _offset(north_m: float, east_m: float) -> tuple[float, float]:
+    lat = ORIGIN_LAT + north_m / METERS_PER_DEGREE
+    lon = ORIGIN_LON + east_m / (METERS_PER_DEGREE * math.cos(math.radians(ORIGIN_LAT)))
+    return lat, lon
+
+
+def seed(engine, size: int) -> float:
+    """Wstaw `size` agregatów na siatce co SPACING_METERS; zwraca bok obszaru w metrach"""
+    side = math.ceil(math.sqrt(size))
+    rows = []
+    with engine.begin() as conn:
+        for i in range(size):
+            lat, lon = _offset((i // side) * SPACING_METERS, (i % side) * SPACING_METERS)
+            rows.append({
+                "latitude": lat,
+                "longitude": lon,
+                "height": HEIGHT,
+                "download_speed": 50.0,
+                "upload_speed": 20.0,
+                "ping": 20,
+                "download_speed_sum": 50.0,
+                "upload_speed_sum": 20.0,
+                "ping_sum": 20,
+                "measurement_count": 1,
+                "building_name": BUILDING,
+                "color": "#E4A316",
+                "grid_cell": grid_cell(lat, lon),
+                "height_band": height_band(HEIGHT),
+            })
+            if len(rows) == SEED_CHUNK:
+                conn.execute(insert(Measurement), rows)
+                rows = []
+        if rows:
+            conn.execute(insert(Measurement), rows)
+    return side * SPACING_METERS
+
+
+def legacy_lookup(db, latitude: float, longitude: float):
+    """Dawna ścieżka: wczytaj wszystkie agregaty budynku i licz odległości w pętli"""
+    for measurement in (
+        db.query(Measurement)
+        .filter(Measurement.building_name == BUILDING)
+        .order_by(Measurement.timestamp.desc())
+        .all()
+    ):
+        if haversine_distance(latitude, longitude, measurement.latitude, measurement.longitude) <= 5:
+            return measurement
+    return None
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        extent = seed(engine, size)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        rng = random.Random(size)
+
+        with Session() as db:
+            service = MeasurementService(db)
+            timings = []
+            for _ in range(PROBES):
+                lat, lon = _offset(rng.uniform(0, extent), rng.uniform(0, extent))
+                payload = MeasurementCreate(
+                    latitude=lat, longitude=lon, height=HEIGHT,
+                    download_speed=rng.uniform(1, 150), upload_speed=rng.uniform(1, 100),
+                    ping=rng.randint(8, 600),
+                )
+                start = time.perf_counter()
+                service.create_measurement(payload)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            legacy = []
+            for _ in range(LEGACY_PROBES):
+                lat, lon = _offset(rng.uniform(0, extent), rng.uniform(0, extent))
+                start = time.perf_counter()
+                legacy_lookup(db, lat, lon)
+                legacy.append((time.perf_counter() - start) * 1000)
+
+        engine.dispose()
+
+    print(
+        f"{size:>10,} agregatów | create_measurement: mediana {statistics.median(timings):7.2f} ms, "
+        f"p95 {_percentile(timings, 0.95):7.2f} ms | dawne wyszukiwanie: {statistics.median(legacy):9.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size)
@@ -0,0 +1,124 @@
+"""
+Benchmark opóźnień GET /measurements/{id} podczas fali logowań:
+
+- inline: bcrypt.checkpw wołany wprost w handlerze async (dawne zachowanie),
+- pool:   weryfikacja w puli app.auth.passwords (PASSWORD_HASH_WORKERS wątków).
+
+Każdy tryb działa w osobnym procesie na świeżej bazie tymczasowej.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_login [czas_trwania_s]
+"""
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ["inline", "pool"]
+DEFAULT_DURATION = 5.0
+LOGINS = 8
+READERS = 2
+SEED_COUNT = 500
+USER = {"email": "bench@example.com", "password": "benchpassword"}
+
+
+def _payload(rng: random.Random) -> dict:
+    return {
+        "latitude": rng.uniform(51.1080, 51.1100),
+        "longitude": rng.uniform(17.0570, 17.0610),
+        "height": 120.0,
+        "download_speed": rng.uniform(1, 150),
+        "upload_speed": rng.uniform(1, 100),
+        "ping": rng.randint(8, 600),
+    }
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _load(mode: str, duration: float) -> None:
+    import bcrypt
+    import httpx
+
+    from app.crud import user as user_crud
+    from app.main import app
+
+    rng = random.Random(0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        seeded = await client.post(
+            "/measurements/batch", json=[_payload(rng) for _ in range(SEED_COUNT)]
+        )
+        ids = [item["measurement"]["id"] for item in seeded.json()]
+        await client.post("/user/register", json=USER)
+
+        if mode == "inline":
+            async def inline_verify(password: str, hashed: str) -> bool:
+                return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+            user_crud.verify_password = inline_verify
+
+        # opóźnienia bez logowań – punkt odniesienia
+        baseline: list[float] = []
+        for _ in range(200):
+            start = time.perf_counter()
+            await client.get(f"/measurements/{rng.choice(ids)}")
+            baseline.append((time.perf_counter() - start) * 1000)
+
+        deadline = time.perf_counter() + duration
+        latencies: list[float] = []
+        logins = 0
+        errors = 0
+
+        async def login() -> None:
+            nonlocal logins, errors
+            while time.perf_counter() < deadline:
+                response = await client.post("/user/login", json=USER)
+                logins += response.status_code == 200
+                errors += response.status_code not in (200, 503)
+
+        async def reader() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get(f"/measurements/{rng.choice(ids)}")
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*[login() for _ in range(LOGINS)], *[reader() for _ in range(READERS)])
+
+    print(
+        f"{mode:<6} | GET bez logowań p50 {_percentile(baseline, 0.5):6.2f} ms | "
+        f"w trakcie p50 {_percentile(latencies, 0.5):7.2f} ms, p99 {_percentile(latencies, 0.99):7.2f} ms "
+        f"({len(latencies)} odczytów) | logowań: {logins} (błędów: {errors})",
+        file=sys.__stdout__,
+    )
+
+
+def run(mode: str, duration: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_login", "--mode", mode, str(duration)],
+            env=env,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--mode"]:
+        import logging
+
+        logging.disable(logging.INFO)
+        # create_measurement wypisuje komunikaty na stdout – wyciszamy je na czas pomiaru
+        sys.stdout = open(os.devnull, "w")
+        asyncio.run(_load(args[1], float(args[2])))
+    else:
+        duration = float(args[0]) if args else DEFAULT_DURATION
+        for mode in MODES:
+            run(mode, duration)
@@ -0,0 +1,111 @@
+"""
+Benchmark wyszukiwania w promieniu (MeasurementService.get_nearby_measurements)
+vs. dawne podejście: prostokąt radius_km * 0.01 i haversine w pętli Pythona.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_nearby [liczba_agregatów]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.db.database import Base
+from app.models import Measurement
+from app.utils.distance_utils import haversine_distance
+
+DEFAULT_SIZE = 1_000_000
+QUERIES = 50
+RADIUS_KM = 1.0
+SEED_CHUNK = 50_000
+
+# agregaty rozłożone równomiernie na obszarze ~20 x 20 km wokół Wrocławia
+MIN_LAT, MAX_LAT = 51.02, 51.20
+MIN_LON, MAX_LON = 16.88, 17.17
+
+
+def seed(engine, size: int, rng: random.Random) -> None:
+    rows = []
+    with engine.begin() as conn:
+        for _ in range(size):
+            rows.append({
+                "latitude": rng.uniform(MIN_LAT, MAX_LAT),
+                "longitude": rng.uniform(MIN_LON, MAX_LON),
+                "height": 120.0,
+                "download_speed": 50.0,
+                "upload_speed": 20.0,
+                "ping": 20,
+                "download_speed_sum": 50.0,
+                "upload_speed_sum": 20.0,
+                "ping_sum": 20,
+                "measurement_count": 1,
+                "building_name": "Politechnika Wrocławska",
+                "color": "#E4A316",
+            })
+            if len(rows) == SEED_CHUNK:
+                conn.execute(insert(Measurement), rows)
+                rows = []
+        if rows:
+            conn.execute(insert(Measurement), rows)
+
+
+def legacy_nearby(db, latitude: float, longitude: float, radius_km: float, limit: int) -> list:
+    """Dawny (zakomentowany) algorytm z get_measurements"""
+    delta = radius_km * 0.01
+    records = db.query(Measurement).filter(
+        Measurement.latitude.between(latitude - delta, latitude + delta),
+        Measurement.longitude.between(longitude - delta, longitude + delta),
+    ).all()
+    results = []
+    for m in records:
+        d = haversine_distance(latitude, longitude, m.latitude, m.longitude)
+        if d <= radius_km * 1000:
+            results.append((m, d))
+    results.sort(key=lambda x: x[1])
+    return results[:limit]
+
+
+def _time_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(size: int) -> None:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed(engine, size, rng)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            service = MeasurementService(db)
+            centers = [
+                (rng.uniform(MIN_LAT + 0.02, MAX_LAT - 0.02), rng.uniform(MIN_LON + 0.03, MAX_LON - 0.03))
+                for _ in range(QUERIES)
+            ]
+            new = [
+                _time_ms(lambda: service.get_nearby_measurements(lat, lon, RADIUS_KM * 1000, 100))
+                for lat, lon in centers
+            ]
+            legacy = [
+                _time_ms(lambda: legacy_nearby(db, lat, lon, RADIUS_KM, 100))
+                for lat, lon in centers[:5]
+            ]
+        engine.dispose()
+
+    print(
+        f"{size:>10,} agregatów, promień {RADIUS_KM} km | nearby: mediana {statistics.median(new):7.2f} ms "
+        f"| dawne podejście: mediana {statistics.median(legacy):8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
@@ -0,0 +1,120 @@
+"""
+Benchmark przeliczania kolorów (app.jobs.recolor) po zmianie progów wyniku:
+czas dla całej tabeli, czas samego liczenia kolorów (ScoringEngine.colors
+w porównaniu z calculate_color wiersz po wierszu) oraz opóźnienie zapisów
+wykonywanych w tym samym czasie z innego połączenia.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_recolor [liczba_agregatów]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, event, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.db.database import Base, _set_sqlite_pragmas
+from app.jobs.recolor import MeasurementRecolorer
+from app.models import Measurement
+from app.utils.scoring import ScoringEngine
+from benchmarks.bench_nearby import MAX_LAT, MAX_LON, MIN_LAT, MIN_LON, SEED_CHUNK
+
+DEFAULT_SIZE = 1_000_000
+WRITE_INTERVAL_SECONDS = 0.005
+
+
+def seed(engine, size: int, rng: random.Random) -> None:
+    scoring = ScoringEngine()
+    with engine.begin() as conn:
+        for start in range(0, size, SEED_CHUNK):
+            n = min(SEED_CHUNK, size - start)
+            download = [rng.uniform(1, 150) for _ in range(n)]
+            upload = [rng.uniform(1, 100) for _ in range(n)]
+            ping = [rng.randint(8, 600) for _ in range(n)]
+            colors = scoring.colors(download, upload, ping)
+            conn.execute(insert(Measurement), [
+                {
+                    "latitude": rng.uniform(MIN_LAT, MAX_LAT),
+                    "longitude": rng.uniform(MIN_LON, MAX_LON),
+                    "download_speed": dl,
+                    "upload_speed": ul,
+                    "ping": p,
+                    "download_speed_sum": dl,
+                    "upload_speed_sum": ul,
+                    "ping_sum": p,
+                    "measurement_count": 1,
+                    "color": str(color),
+                }
+                for dl, ul, p, color in zip(download, upload, ping, colors)
+            ])
+
+
+def _concurrent_writes(Session, stop: threading.Event, latencies: list) -> None:
+    """Pojedyncze zapisy jak z API – mierzy, jak długo czekają na blokadę zapisu"""
+    with Session() as db:
+        while not stop.is_set():
+            start = time.perf_counter()
+            db.execute(
+                update(Measurement)
+                .where(Measurement.id == 1)
+                .values(measurement_count=Measurement.measurement_count + 0)
+            )
+            db.commit()
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(WRITE_INTERVAL_SECONDS)
+
+
+def run(size: int) -> None:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(bind=engine)
+        seed(engine, size, rng)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            rows = db.query(
+                Measurement.download_speed, Measurement.upload_speed, Measurement.ping
+            ).all()
+        download, upload, ping = (np.array(column, dtype=float) for column in zip(*rows))
+        service = MeasurementService(None)
+
+        start = time.perf_counter()
+        for dl, ul, p in rows:
+            service.calculate_color(dl, ul, p)
+        per_row = time.perf_counter() - start
+        start = time.perf_counter()
+        ScoringEngine().colors(download, upload, ping)
+        vectorized = time.perf_counter() - start
+        print(f"kolory {size:,} agregatów: calculate_color {per_row:.2f} s | ScoringEngine.colors {vectorized:.3f} s")
+
+        retuned = ScoringEngine(thresholds=(30.0, 70.0))
+        stop, latencies = threading.Event(), []
+        writer = threading.Thread(target=_concurrent_writes, args=(Session, stop, latencies))
+        writer.start()
+        with Session() as db:
+            start = time.perf_counter()
+            stats = MeasurementRecolorer(db, engine=retuned).run()
+            elapsed = time.perf_counter() - start
+        stop.set()
+        writer.join()
+        engine.dispose()
+
+    latencies.sort()
+    print(
+        f"recolor: {elapsed:.2f} s, zmienione {stats.changed:,} z {stats.rows:,} | "
+        f"równoległe zapisy ({len(latencies)}): mediana {statistics.median(latencies):.1f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)]:.1f} ms, max {latencies[-1]:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
@@ -0,0 +1,79 @@
+"""
+Benchmark serializacji listy agregatów: dawna ścieżka GET /measurements/
+(obiekty ORM + MeasurementResponse.model_validate + TypeAdapter.dump_json)
+vs. krotki z Core (EXPORT_COLUMNS) serializowane od razu do bajtów przez orjson (json_rows).
+Mierzy osobno zapytanie i serializację – bez HTTP i pamięci podręcznej odpowiedzi.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_serialization [liczba_wierszy]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.measurement import EXPORT_COLUMNS
+from app.db.database import Base
+from app.models import Measurement
+from app.schemas import MeasurementResponse
+from app.utils.export import json_rows
+from benchmarks.datagen import seed_measurements
+
+DEFAULT_SIZE = 100_000
+REPEATS = 5
+
+_list_adapter = TypeAdapter(List[MeasurementResponse])
+_columns = [column.key for column in EXPORT_COLUMNS]
+
+
+def _orm_model_validate(Session) -> int:
+    with Session() as db:
+        measurements = db.scalars(select(Measurement)).all()
+        return len(_list_adapter.dump_json([MeasurementResponse.model_validate(m) for m in measurements]))
+
+
+def _core_orjson(Session) -> int:
+    with Session() as db:
+        return len(json_rows(_columns, db.execute(select(*EXPORT_COLUMNS)).all()))
+
+
+def _median(fn, Session) -> tuple[float, int]:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        size = fn(Session)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), size
+
+
+def run(size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed_measurements(engine, size, np.random.default_rng(0))
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        print(f"{size:,} wierszy")
+        baseline = None
+        for label, fn in (
+            ("ORM + model_validate", _orm_model_validate),
+            ("Core + orjson", _core_orjson),
+        ):
+            elapsed, body = _median(fn, Session)
+            baseline = baseline or elapsed
+            print(
+                f"  {label:<22} mediana {elapsed * 1000:8.1f} ms | {size / elapsed:>10,.0f} wierszy/s | "
+                f"{body / 2**20:6.1f} MiB | x{baseline / elapsed:.1f}"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
@@ -0,0 +1,83 @@
+"""
+Benchmark kafelków mapy (MeasurementService.get_tile): czas agregacji w SQL
+na kilku poziomach przybliżenia, rozmiar odpowiedzi i czas trafienia w pamięć podręczną
+w porównaniu z pobraniem wszystkich agregatów kafelka jako osobnych punktów.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_tiles [liczba_agregatów]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.db.database import Base
+from app.models import Measurement
+from app.schemas import MeasurementResponse, MeasurementTileResponse
+from app.utils.tiles import TILE_GRID_SIZE, TileCache, tile_bounds, tile_for_point
+from benchmarks.bench_nearby import MAX_LAT, MAX_LON, MIN_LAT, MIN_LON, seed
+
+DEFAULT_SIZE = 1_000_000
+ZOOMS = (10, 13, 16)
+REPEATS = 5
+
+
+def _time_ms(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run(size: int) -> None:
+    rng = random.Random(0)
+    center = ((MIN_LAT + MAX_LAT) / 2, (MIN_LON + MAX_LON) / 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed(engine, size, rng)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            service = MeasurementService(db)
+            for z in ZOOMS:
+                x, y = tile_for_point(*center, z)
+
+                def render():
+                    cells = service.get_tile(z, x, y)
+                    return MeasurementTileResponse(
+                        z=z, x=x, y=y, grid_size=TILE_GRID_SIZE, cells=cells
+                    ).model_dump_json().encode()
+
+                timings = [_time_ms(render) for _ in range(REPEATS)]
+                body = timings[0][1]
+
+                cache = TileCache()
+                cache.put((z, x, y), body, cache.begin((z, x, y)))
+                hit_ms, _ = _time_ms(lambda: cache.get((z, x, y)))
+
+                min_lat, max_lat, min_lon, max_lon = tile_bounds(z, x, y)
+                points_ms, points = _time_ms(lambda: [
+                    MeasurementResponse.model_validate(m).model_dump_json()
+                    for m in db.query(Measurement).filter(
+                        Measurement.latitude.between(min_lat, max_lat),
+                        Measurement.longitude.between(min_lon, max_lon),
+                    )
+                ])
+
+                print(
+                    f"z={z:>2} | kafelek: mediana {statistics.median(t for t, _ in timings):8.2f} ms, "
+                    f"{len(body) / 1024:6.1f} KiB | z pamięci: {hit_ms * 1000:6.1f} µs "
+                    f"| wszystkie punkty: {len(points):>8,} w {points_ms:9.1f} ms, "
+                    f"{sum(map(len, points)) / 1024:9.1f} KiB"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
@@ -0,0 +1,109 @@
+"""
+Benchmark trendów z rollupów: zapis semestru pomiarów do rollupów godzinowych
+i dziennych (apply_rollup_deltas) oraz czas zapytań GET /measurements/trends
+(MeasurementService.get_trends) dla budynku, punktu i całego kampusu.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_trends [liczba_pomiarów]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.crud.rollups import apply_rollup_deltas
+from app.db.database import Base, _set_sqlite_pragmas
+from app.models import BuildingRollup, CellRollup
+from app.utils.buildings import BUILDINGS
+
+DEFAULT_SIZE = 1_000_000
+CHUNK = 100_000
+REPEATS = 20
+SEMESTER_START = datetime(2025, 2, 24)
+SEMESTER_DAYS = 120
+
+
+def seed(Session, size: int, rng: np.random.Generator) -> None:
+    """Pomiary w losowych wierzchołkach budynków, w godzinach 7-21 przez cały semestr"""
+    names = list(BUILDINGS)
+    corners = [BUILDINGS[name][0] for name in names]
+    with Session() as db:
+        for start in range(0, size, CHUNK):
+            n = min(CHUNK, size - start)
+            building = rng.integers(len(names), size=n)
+            offsets = (
+                rng.integers(SEMESTER_DAYS, size=n) * 86_400
+                + rng.integers(7 * 3600, 21 * 3600, size=n)
+            ).astype("timedelta64[s]")
+            apply_rollup_deltas(
+                db,
+                [names[i] for i in building.tolist()],
+                np.array([corners[i][0] for i in building.tolist()]) + rng.normal(0, 2e-4, n),
+                np.array([corners[i][1] for i in building.tolist()]) + rng.normal(0, 2e-4, n),
+                np.datetime64(SEMESTER_START, "s") + offsets,
+                rng.uniform(1, 150, n),
+                rng.uniform(1, 100, n),
+                rng.integers(8, 600, n),
+            )
+            db.commit()
+
+
+def _timed(query) -> tuple[float, int]:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = query()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(result)
+
+
+def run(size: int) -> None:
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        start = time.perf_counter()
+        seed(Session, size, rng)
+        elapsed = time.perf_counter() - start
+
+        with Session() as db:
+            rows = (
+                db.scalar(select(func.count()).select_from(BuildingRollup)),
+                db.scalar(select(func.count()).select_from(CellRollup)),
+            )
+            print(
+                f"rollupy {size:,} pomiarów: {elapsed:.1f} s ({size / elapsed:,.0f}/s), "
+                f"wiersze budynków {rows[0]:,}, komórek {rows[1]:,}"
+            )
+
+            service = MeasurementService(db)
+            building = random.Random(0).choice(list(BUILDINGS))
+            latitude, longitude = BUILDINGS[building][0]
+            semester = dict(since=SEMESTER_START, until=SEMESTER_START + timedelta(days=SEMESTER_DAYS))
+            queries = {
+                "budynek, godzinowo": lambda: service.get_trends("hour", building_name=building, **semester),
+                "budynek, profil doby": lambda: service.get_trends("hour_of_day", building_name=building, **semester),
+                "punkt, dziennie": lambda: service.get_trends("day", latitude=latitude, longitude=longitude, **semester),
+                "kampus, dziennie": lambda: service.get_trends("day", **semester),
+                "kampus, profil doby": lambda: service.get_trends("hour_of_day", **semester),
+            }
+            for label, query in queries.items():
+                median, buckets = _timed(query)
+                print(f"  {label:<22} {buckets:>5} przedziałów: mediana {median:7.2f} ms")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
@@ -0,0 +1,121 @@
+"""
+Syntetyczne pomiary na poligonach kampusu (app.utils.buildings.BUILDINGS) dla benchmarków:
+losowe punkty wewnątrz budynków, wiersze agregatów gotowe do INSERT i zasilanie bazy porcjami.
+Wszystko zależy tylko od przekazanego numpy.random.Generator, więc dane są powtarzalne.
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from sqlalchemy import insert
+
+from app.models import Measurement
+from app.utils.buildings import BUILDINGS
+from app.utils.grid import grid_cells, height_band
+from app.utils.scoring import scoring_engine
+
+SEED_CHUNK = 50_000
+
+# pomiary z kilku pięter – pasma wysokości rozkładają agregaty w pionie
+MIN_HEIGHT, MAX_HEIGHT = 110.0, 150.0
+SEMESTER_START = np.datetime64(datetime(2025, 2, 24), "s")
+SEMESTER_SECONDS = 120 * 86_400
+
+_polygons = {
+    name: Polygon((lon, lat) for (lat, lon) in coords) for name, coords in BUILDINGS.items()
+}
+for _polygon in _polygons.values():
+    shapely.prepare(_polygon)
+
+
+def largest_building() -> str:
+    return max(_polygons, key=lambda name: _polygons[name].area)
+
+
+def points_in_building(name: str, n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """n punktów wewnątrz poligonu budynku – losowanie z odrzucaniem w prostokącie otaczającym"""
+    polygon = _polygons[name]
+    min_lon, min_lat, max_lon, max_lat = polygon.bounds
+    lats, lons = [np.empty(0)], [np.empty(0)]
+    missing = n
+    while missing > 0:
+        size = 2 * missing + 16
+        lat = rng.uniform(min_lat, max_lat, size)
+        lon = rng.uniform(min_lon, max_lon, size)
+        inside = shapely.contains_xy(polygon, lon, lat)
+        lats.append(lat[inside][:missing])
+        lons.append(lon[inside][:missing])
+        missing -= len(lats[-1])
+    return np.concatenate(lats), np.concatenate(lons)
+
+
+def campus_points(n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """n punktów w budynkach kampusu, rozłożonych proporcjonalnie do powierzchni budynków"""
+    names = list(_polygons)
+    areas = np.array([_polygons[name].area for name in names])
+    counts = np.bincount(rng.choice(len(names), size=n, p=areas / areas.sum()), minlength=len(names))
+
+    lats, lons, buildings = [], [], []
+    for name, count in zip(names, counts.tolist()):
+        lat, lon = points_in_building(name, count, rng)
+        lats.append(lat)
+        lons.append(lon)
+        buildings.extend([name] * count)
+    order = rng.permutation(n)
+    return np.concatenate(lats)[order], np.concatenate(lons)[order], [buildings[i] for i in order.tolist()]
+
+
+def measurement_rows(
+    lats: np.ndarray, lons: np.ndarray, buildings: List[str], rng: np.random.Generator
+) -> List[dict]:
+    """Agregaty z pojedynczym pomiarem (sumy = wartości) z losowymi prędkościami, wysokością i czasem"""
+    n = len(lats)
+    download = rng.uniform(1, 150, n)
+    upload = rng.uniform(1, 100, n)
+    ping = rng.integers(8, 600, n)
+    heights = rng.uniform(MIN_HEIGHT, MAX_HEIGHT, n)
+    timestamps = (SEMESTER_START + rng.integers(0, SEMESTER_SECONDS, n).astype("timedelta64[s]")).tolist()
+    colors = scoring_engine.colors(download, upload, ping).tolist()
+    cells = grid_cells(lats, lons).tolist()
+    bands = [height_band(height) for height in heights.tolist()]
+
+    return [
+        {
+            "latitude": lat,
+            "longitude": lon,
+            "height": height,
+            "building_name": building,
+            "download_speed": dl,
+            "upload_speed": ul,
+            "ping": p,
+            "download_speed_sum": dl,
+            "upload_speed_sum": ul,
+            "ping_sum": p,
+            "measurement_count": 1,
+            "color": color,
+            "timestamp": timestamp,
+            "grid_cell": cell,
+            "height_band": band,
+        }
+        for lat, lon, height, building, dl, ul, p, color, timestamp, cell, band in zip(
+            lats.tolist(), lons.tolist(), heights.tolist(), buildings,
+            download.tolist(), upload.tolist(), ping.tolist(), colors, timestamps, cells, bands,
+        )
+    ]
+
+
+def seed_measurements(
+    engine, n: int, rng: np.random.Generator, building: Optional[str] = None
+) -> None:
+    """Wstaw n agregatów – w całym kampusie albo w jednym budynku – porcjami po SEED_CHUNK"""
+    with engine.begin() as conn:
+        for start in range(0, n, SEED_CHUNK):
+            size = min(SEED_CHUNK, n - start)
+            if building is None:
+                lats, lons, buildings = campus_points(size, rng)
+            else:
+                lats, lons = points_in_building(building, size, rng)
+                buildings = [building] * size
+            conn.execute(insert(Measurement), measurement_rows(lats, lons, buildings, rng))
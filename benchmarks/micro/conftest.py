@@ -0,0 +1,61 @@
+"""
+Mikro-benchmarki (pytest-benchmark) ścieżek zapisu i odczytu pomiarów.
+
+Każdy zestaw danych ma własną bazę SQLite w katalogu tymczasowym, więc benchmarki
+działają offline i nie dotykają database.db. Wyniki zapisywane są jako JSON
+w .benchmarks/ (z numerem przebiegu i commitem), żeby porównywać je między commitami.
+
+Użycie (z katalogu benchmarks/micro):
+    python -m pytest
+    python -m pytest --max-rows 100000
+    pytest-benchmark compare 0001 0002
+"""
+import os
+
+# aplikacja przy imporcie tworzy tabele w DATABASE_URL – benchmarki nie mogą trafić do database.db
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, event
+
+from app.db.database import Base, _set_sqlite_pragmas
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--max-rows",
+        type=int,
+        default=1_000_000,
+        help="pomiń benchmarki na bazach większych niż podana liczba agregatów",
+    )
+
+
+@pytest.fixture(scope="session")
+def max_rows(request) -> int:
+    return request.config.getoption("--max-rows")
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(0)
+
+
+@pytest.fixture(scope="module")
+def make_engine(tmp_path_factory):
+    """Tworzy pustą bazę w pliku tymczasowym, z tymi samymi pragmami (WAL) co aplikacja"""
+    engines = []
+
+    def make(name: str):
+        path = tmp_path_factory.mktemp("bench") / f"{name}.db"
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(bind=engine)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
@@ -0,0 +1,49 @@
+from itertools import cycle
+
+import numpy as np
+import pytest
+
+from app.crud import MeasurementService
+from app.utils.buildings import find_building, find_buildings
+from app.utils.distance_utils import haversine_distance
+from benchmarks.datagen import campus_points
+
+POINTS = 10_000
+
+
+@pytest.fixture(scope="module")
+def campus():
+    lats, lons, _ = campus_points(POINTS, np.random.default_rng(0))
+    return lats, lons
+
+
+def test_find_building_on_campus(benchmark, campus):
+    points = cycle(zip(*(column.tolist() for column in campus)))
+    benchmark(lambda: find_building(*next(points)))
+
+
+def test_find_building_off_campus(benchmark):
+    # poza prostokątem kampusu – wczesne wyjście bez zapytania do STRtree
+    benchmark(find_building, 52.2297, 21.0122)
+
+
+def test_find_buildings_batch(benchmark, campus):
+    benchmark.extra_info["points"] = POINTS
+    benchmark(find_buildings, *campus)
+
+
+def test_haversine_distance(benchmark, campus):
+    lats, lons = (column.tolist() for column in campus)
+    pairs = cycle(zip(lats, lons, lats[1:] + lats[:1], lons[1:] + lons[:1]))
+    benchmark(lambda: haversine_distance(*next(pairs)))
+
+
+def test_calculate_color(benchmark):
+    rng = np.random.default_rng(0)
+    values = cycle(zip(
+        rng.uniform(1, 150, POINTS).tolist(),
+        rng.uniform(1, 100, POINTS).tolist(),
+        rng.integers(8, 600, POINTS).tolist(),
+    ))
+    service = MeasurementService(None)
+    benchmark(lambda: service.calculate_color(*next(values)))
@@ -0,0 +1,52 @@
+from itertools import cycle
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import MeasurementService
+from app.schemas import MeasurementCreate
+from benchmarks.datagen import largest_building, points_in_building, seed_measurements
+
+BUILDING_SIZES = [100, 1_000, 10_000, 100_000]
+PAYLOADS = 1_000
+ROUNDS = 200
+
+
+@pytest.fixture(scope="module", params=BUILDING_SIZES, ids=lambda size: f"{size}_aggregates")
+def building_session(request, make_engine, max_rows):
+    size = request.param
+    if size > max_rows:
+        pytest.skip(f"{size:,} agregatów > --max-rows")
+    building = largest_building()
+    engine = make_engine(f"building_{size}")
+    seed_measurements(engine, size, np.random.default_rng(size), building=building)
+
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    with Session() as db:
+        yield db, building, size
+
+
+def test_create_measurement(benchmark, building_session):
+    db, building, size = building_session
+    rng = np.random.default_rng(1)
+    lats, lons = points_in_building(building, PAYLOADS, rng)
+    payloads = cycle([
+        MeasurementCreate(
+            latitude=lat, longitude=lon, height=height,
+            download_speed=dl, upload_speed=ul, ping=ping,
+        )
+        for lat, lon, height, dl, ul, ping in zip(
+            lats.tolist(), lons.tolist(),
+            rng.uniform(110, 150, PAYLOADS).tolist(),
+            rng.uniform(1, 150, PAYLOADS).tolist(),
+            rng.uniform(1, 100, PAYLOADS).tolist(),
+            rng.integers(8, 600, PAYLOADS).tolist(),
+        )
+    ])
+    service = MeasurementService(db)
+
+    benchmark.extra_info["building_aggregates"] = size
+    benchmark.pedantic(
+        service.create_measurement, setup=lambda: ((next(payloads),), {}), rounds=ROUNDS
+    )
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import get_db
+from app.main import app
+from app.routers.measurements import measurement_list_cache
+from benchmarks.datagen import largest_building, seed_measurements
+
+ROW_COUNTS = [1_000, 100_000, 1_000_000]
+ROUNDS = 100
+
+
+@pytest.fixture(scope="module", params=ROW_COUNTS, ids=lambda rows: f"{rows}_rows")
+def client(request, make_engine, max_rows):
+    rows = request.param
+    if rows > max_rows:
+        pytest.skip(f"{rows:,} wierszy > --max-rows")
+    engine = make_engine(f"list_{rows}")
+    seed_measurements(engine, rows, np.random.default_rng(rows))
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    measurement_list_cache.clear()
+
+
+def _get(client, **params):
+    response = client.get("/measurements/", params=params)
+    assert response.status_code == 200
+    return response
+
+
+def test_list_first_page(benchmark, client):
+    # czyszczenie cache przed każdą rundą – mierzony jest odczyt z bazy, a nie trafienie w cache
+    benchmark.pedantic(_get, args=(client,), setup=measurement_list_cache.clear, rounds=ROUNDS)
+
+
+def test_list_building_page(benchmark, client):
+    benchmark.pedantic(
+        _get, args=(client,), kwargs={"building_name": largest_building()},
+        setup=measurement_list_cache.clear, rounds=ROUNDS,
+    )
+
+
+def test_list_next_page(benchmark, client):
+    cursor = _get(client).headers["X-Next-Cursor"]
+    benchmark.pedantic(
+        _get, args=(client,), kwargs={"cursor": cursor},
+        setup=measurement_list_cache.clear, rounds=ROUNDS,
+    )
+
+
+def test_list_cached_page(benchmark, client):
+    _get(client)
+    benchmark(_get, client)
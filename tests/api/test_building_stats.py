@@ -0,0 +1,52 @@
+import pytest
+
+
+def _create(client, latitude, longitude, download_speed, ping=30):
+    response = client.post("/measurements/", json={
+        "latitude": latitude,
+        "longitude": longitude,
+        "height": 120.0,
+        "download_speed": download_speed,
+        "upload_speed": 10.0,
+        "ping": ping,
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_building_stats_follow_writes(client):
+    first = _create(client, 51.1097, 17.0580, 20.0, ping=40)
+    _create(client, 51.10975, 17.05812, 60.0, ping=20)
+    client.put(f"/measurements/{first['id']}", json={"download_speed": 100.0, "upload_speed": 10.0, "ping": 30})
+
+    stats = client.get("/buildings/D-21/stats").json()
+    assert stats["measurement_count"] == 3
+    assert stats["download_speed"] == pytest.approx(60.0)
+    assert stats["ping"] == 30
+    assert (stats["min_download_speed"], stats["max_download_speed"]) == (20.0, 100.0)
+    assert (stats["min_ping"], stats["max_ping"]) == (20, 40)
+
+    # usunięcie pomiaru z agregatu odejmuje jego najnowszą próbkę z dziennika (100), tak jak w samym agregacie
+    client.delete(f"/measurements/{first['id']}")
+    stats = client.get("/buildings/D-21/stats").json()
+    assert stats["measurement_count"] == 2
+    assert stats["download_speed"] == pytest.approx(40.0)
+
+
+def test_building_stats_removed_with_last_measurement(client):
+    created = _create(client, 51.1097, 17.0580, 20.0)
+    assert client.get("/buildings/D-21/stats").status_code == 200
+
+    client.delete(f"/measurements/{created['id']}")
+
+    assert client.get("/buildings/D-21/stats").status_code == 404
+
+
+def test_all_building_stats(client):
+    _create(client, 51.1097, 17.0580, 20.0)
+    _create(client, 52.5, 21.5, 40.0)
+
+    names = [s["building_name"] for s in client.get("/buildings/stats").json()]
+
+    assert "D-21" in names
+    assert names == sorted(names)
@@ -0,0 +1,49 @@
+PAYLOAD = {
+    "latitude": 51.1097,
+    "longitude": 17.0580,
+    "height": 120.0,
+    "download_speed": 20.0,
+    "upload_speed": 10.0,
+    "ping": 30,
+}
+
+
+def _changes(client, since, **params):
+    response = client.get("/measurements/changes", params={"since": since, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_changes_since_cursor(client):
+    start = _changes(client, 0)["cursor"]
+
+    first = client.post("/measurements/", json=PAYLOAD).json()
+    second = client.post("/measurements/", json={**PAYLOAD, "latitude": 52.0, "longitude": 21.0}).json()
+    changes = _changes(client, start)
+    assert [m["id"] for m in changes["changed"]] == [first["id"], second["id"]]
+    assert changes["changed"][0] == first
+    assert changes["deleted"] == [] and not changes["has_more"]
+
+    cursor = changes["cursor"]
+    assert _changes(client, cursor) == {"changed": [], "deleted": [], "cursor": cursor, "has_more": False}
+
+    # scalenie z pierwszym agregatem i usunięcie drugiego
+    client.post("/measurements/", json={**PAYLOAD, "download_speed": 40.0})
+    client.delete(f"/measurements/{second['id']}")
+    changes = _changes(client, cursor)
+    assert [(m["id"], m["measurement_count"]) for m in changes["changed"]] == [(first["id"], 2)]
+    assert changes["deleted"] == [second["id"]]
+
+
+def test_changes_pagination(client):
+    start = _changes(client, 0)["cursor"]
+    ids = [
+        client.post("/measurements/", json={**PAYLOAD, "latitude": 52.0 + i * 0.001}).json()["id"]
+        for i in range(3)
+    ]
+
+    page = _changes(client, start, limit=2)
+    assert page["has_more"]
+    rest = _changes(client, page["cursor"], limit=2)
+    assert not rest["has_more"]
+    assert [m["id"] for m in page["changed"] + rest["changed"]] == ids
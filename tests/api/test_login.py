@@ -0,0 +1,42 @@
+import asyncio
+
+from app.crud.user import UserService
+
+USER = {"email": "login@example.com", "password": "testpassword"}
+
+
+def test_register_and_login(client):
+    assert client.post("/user/register", json=USER).status_code == 200
+
+    response = client.post("/user/login", json=USER)
+    assert response.status_code == 200
+    assert "access_token" in response.json()
+
+
+def test_login_errors_keep_their_status(client):
+    client.post("/user/register", json=USER)
+
+    wrong = client.post("/user/login", json={**USER, "password": "wrongpassword"})
+    missing = client.post("/user/login", json={**USER, "email": "nobody@example.com"})
+
+    assert wrong.status_code == 401
+    assert missing.status_code == 404
+
+
+def test_user_lookups_run_off_the_event_loop(client, monkeypatch):
+    on_loop = []
+    get_by_email = UserService._get_by_email
+
+    def recording_get_by_email(self, email):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return get_by_email(self, email)
+
+    monkeypatch.setattr(UserService, "_get_by_email", recording_get_by_email)
+    client.post("/user/register", json=USER)
+    client.post("/user/login", json=USER)
+
+    assert on_loop == [False, False]
@@ -115,3 +115,24 @@ def test_color_based_on_speed():
     fast_response = client.post("/measurements/", json=payload_fast)
     assert fast_response.status_code == 201
     assert fast_response.json()["color"] == "green"
+
+
+def test_create_measurements_batch(client):
+    base = {"height": 120.0, "download_speed": 20.0, "upload_speed": 10.0, "ping": 30}
+    payload = [
+        {"latitude": 52.0, "longitude": 21.0, **base},
+        {"latitude": 52.00001, "longitude": 21.0, **base, "download_speed": 40.0},
+        {"latitude": 52.01, "longitude": 21.0, **base},
+    ]
+    response = client.post("/measurements/batch", json=payload)
+    assert response.status_code == 201
+    data = response.json()
+    assert [item["index"] for item in data] == [0, 1, 2]
+    assert [item["merged"] for item in data] == [False, True, False]
+    assert data[0]["measurement"]["id"] == data[1]["measurement"]["id"]
+    assert data[1]["measurement"]["measurement_count"] == 2
+    assert data[1]["measurement"]["download_speed"] == 30.0
+
+    response = client.post("/measurements/", json={"latitude": 52.00002, "longitude": 21.0, **base})
+    assert response.json()["id"] == data[0]["measurement"]["id"]
+    assert response.json()["measurement_count"] == 3
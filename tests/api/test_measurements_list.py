@@ -0,0 +1,216 @@
+from app.schemas import MeasurementResponse
+
+
+def _create(client, latitude, longitude, download_speed=20.0):
+    response = client.post("/measurements/", json={
+        "latitude": latitude,
+        "longitude": longitude,
+        "height": 120.0,
+        "download_speed": download_speed,
+        "upload_speed": 10.0,
+        "ping": 30,
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_list_measurements_keyset_pagination(client):
+    created = {_create(client, 52.0 + i * 0.001, 21.0)["id"] for i in range(5)}
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/measurements/", params=params)
+        assert response.status_code == 200
+        seen.extend(m["id"] for m in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert created <= set(seen)
+
+
+def test_list_measurements_filters(client):
+    inside = _create(client, 51.1097, 17.0580)
+    _create(client, 52.5, 21.5)
+
+    response = client.get("/measurements/", params={"building_name": "D-21"})
+    assert [m["id"] for m in response.json()] == [inside["id"]]
+
+    response = client.get("/measurements/", params={
+        "min_latitude": 51.10, "max_latitude": 51.12,
+        "min_longitude": 17.05, "max_longitude": 17.07,
+    })
+    assert [m["id"] for m in response.json()] == [inside["id"]]
+
+
+def test_list_measurements_rejects_bad_parameters(client):
+    _create(client, 52.0, 21.0)
+    assert client.get("/measurements/", params={"min_latitude": 51.0}).status_code == 400
+    assert client.get("/measurements/", params={"cursor": "???"}).status_code == 400
+
+
+def test_list_measurements_etag_and_not_modified(client):
+    _create(client, 52.0, 21.0)
+
+    first = client.get("/measurements/")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+
+    not_modified = client.get("/measurements/", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    _create(client, 52.5, 21.5)
+    changed = client.get("/measurements/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == len(first.json()) + 1
+
+
+def test_nearby_measurements_sorted_by_distance(client):
+    far = _create(client, 52.0200, 21.0)
+    near = _create(client, 52.0010, 21.0)
+    nearest = _create(client, 52.0001, 21.0)
+    _create(client, 52.5, 21.0)
+
+    response = client.get("/measurements/nearby", params={
+        "latitude": 52.0, "longitude": 21.0, "radius_km": 3, "limit": 2,
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert [m["id"] for m in data] == [nearest["id"], near["id"]]
+    assert data[0]["distance_m"] < data[1]["distance_m"] < 3000
+
+    response = client.get("/measurements/nearby", params={
+        "latitude": 52.0, "longitude": 21.0, "radius_km": 3,
+    })
+    assert far["id"] in [m["id"] for m in response.json()]
+
+
+def test_measurement_tile_aggregates_cells(client):
+    from app.utils.tiles import tile_for_point
+
+    x, y = tile_for_point(52.0, 21.0, 12)
+    _create(client, 52.0, 21.0, download_speed=20.0)
+    _create(client, 52.0001, 21.0001, download_speed=40.0)
+    _create(client, 10.0, 10.0)
+
+    response = client.get(f"/measurements/tiles/12/{x}/{y}")
+    assert response.status_code == 200
+    tile = response.json()
+    assert tile["grid_size"] ** 2 >= len(tile["cells"])
+    assert sum(cell["measurement_count"] for cell in tile["cells"]) == 2
+
+    # nowy pomiar w kafelku musi unieważnić zapamiętaną odpowiedź
+    _create(client, 52.001, 21.001)
+    tile = client.get(f"/measurements/tiles/12/{x}/{y}").json()
+    assert sum(cell["measurement_count"] for cell in tile["cells"]) == 3
+
+
+def test_merge_across_tile_edge_invalidates_aggregate_tile(client):
+    from app.utils.tiles import tile_for_point
+
+    # krawędź kafelków z=22 między dwoma pomiarami w promieniu scalania
+    edge = round((21.0 + 180.0) / 360.0 * 2 ** 22) / 2 ** 22 * 360.0 - 180.0
+    first = _create(client, 52.0, edge - 0.000005)
+    x, y = tile_for_point(52.0, edge - 0.000005, 22)
+    assert tile_for_point(52.0, edge + 0.000005, 22) == (x + 1, y)
+    assert client.get(f"/measurements/tiles/22/{x}/{y}").json()["cells"][0]["measurement_count"] == 1
+
+    # próbka z sąsiedniego kafelka trafia do agregatu, który zostaje w kafelku x
+    second = _create(client, 52.0, edge + 0.000005)
+    assert second["id"] == first["id"]
+    assert client.get(f"/measurements/tiles/22/{x}/{y}").json()["cells"][0]["measurement_count"] == 2
+
+
+def test_list_and_tile_columnar_format(client):
+    from app.utils.columnar import COLUMNS_MEDIA_TYPE, decode_columns
+    from app.utils.tiles import tile_for_point
+
+    first = _create(client, 51.1097, 17.0580, download_speed=20.0)
+    second = _create(client, 52.0, 21.0, download_speed=40.0)
+    headers = {"Accept": COLUMNS_MEDIA_TYPE}
+
+    response = client.get("/measurements/", headers=headers)
+    assert response.headers["content-type"] == COLUMNS_MEDIA_TYPE
+    assert response.headers["etag"] != client.get("/measurements/").headers["etag"]
+    columns = decode_columns(response.content)
+    assert sorted(columns["id"].tolist()) == sorted([first["id"], second["id"]])
+    index = columns["id"].tolist().index(first["id"])
+    assert abs(columns["latitude"][index] - first["latitude"]) < 1e-6
+    assert columns["building_name"][index] == first["building_name"]
+    assert columns["color"][index] == first["color"]
+
+    x, y = tile_for_point(52.0, 21.0, 12)
+    response = client.get(f"/measurements/tiles/12/{x}/{y}", headers=headers)
+    assert response.headers["x-tile-grid-size"] == "16"
+    assert decode_columns(response.content)["measurement_count"].tolist() == [1]
+    assert client.get(f"/measurements/tiles/12/{x}/{y}").json()["cells"][0]["measurement_count"] == 1
+
+
+def test_measurement_tile_rejects_out_of_range(client):
+    assert client.get("/measurements/tiles/2/4/0").status_code == 400
+    assert client.get("/measurements/tiles/23/0/0").status_code == 422
+
+
+def test_export_measurements_ndjson_and_csv(client):
+    import csv
+    import io
+    import json
+
+    inside = _create(client, 51.1097, 17.0580)
+    other = _create(client, 52.5, 21.5)
+
+    response = client.get("/measurements/export", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert {row["id"] for row in rows} >= {inside["id"], other["id"]}
+    assert rows[0].keys() >= {"latitude", "longitude", "color", "timestamp"}
+
+    response = client.get(
+        "/measurements/export",
+        params={"format": "csv", "building_name": "D-21"},
+        headers={"Accept-Encoding": "identity"},
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [inside["id"]]
+
+
+def test_export_measurements_gzip(client):
+    import gzip
+
+    _create(client, 52.0, 21.0)
+
+    with client.stream(
+        "GET", "/measurements/export", params={"format": "csv"}, headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+
+    assert gzip.decompress(raw).decode().startswith("id,latitude,longitude")
+
+
+def test_list_measurements_matches_response_schema(client):
+    created = _create(client, 51.1097, 17.0580)
+
+    [listed] = client.get("/measurements/").json()
+
+    assert listed == created
+    assert listed == MeasurementResponse.model_validate(listed).model_dump(mode="json")
+
+
+def test_empty_batch_keeps_etag(client):
+    _create(client, 52.0, 21.0)
+    etag = client.get("/measurements/").headers["ETag"]
+
+    response = client.post("/measurements/batch", json=[])
+    assert response.status_code == 201
+    assert response.json() == []
+
+    assert client.get("/measurements/", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,32 @@
+from app.utils.metrics import http_requests_total, measurements_ingested_total, raw_measurements_received_total
+
+PAYLOAD = {
+    "latitude": 51.1097,
+    "longitude": 17.0580,
+    "height": 120.0,
+    "download_speed": 20.0,
+    "upload_speed": 10.0,
+    "ping": 30,
+}
+
+
+def test_metrics_count_requests_by_route_template(client, test_measurement):
+    route = "/measurements/{measurement_id}"
+    before = http_requests_total.value("GET", route, "200")
+    created = measurements_ingested_total.value("api", "created")
+    logged = raw_measurements_received_total.value()
+
+    client.get(f"/measurements/{test_measurement['id']}")
+    client.post("/measurements/", json=PAYLOAD)
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert http_requests_total.value("GET", route, "200") == before + 1
+    assert measurements_ingested_total.value("api", "created") == created + 1
+    # każdy zapis przez API trafia też do dziennika surowych pomiarów
+    assert raw_measurements_received_total.value() == logged + 1
+    body = response.text
+    assert f'http_requests_total{{method="GET",route="{route}",status="200"}}' in body
+    assert 'http_request_duration_seconds_bucket{method="POST",route="/measurements/",le="+Inf"}' in body
+    assert "db_commit_duration_seconds_count" in body
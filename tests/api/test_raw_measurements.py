@@ -0,0 +1,33 @@
+from app.jobs.compactor import MeasurementCompactor
+
+RAW_PAYLOAD = {
+    "latitude": 51.1097,
+    "longitude": 17.0580,
+    "height": 120.0,
+    "download_speed": 20.0,
+    "upload_speed": 10.0,
+    "ping": 30,
+}
+
+
+def test_raw_measurement_is_accepted_and_compacted(client, db_session):
+    response = client.post("/measurements/raw", json=RAW_PAYLOAD)
+
+    assert response.status_code == 202
+    assert response.json()["aggregate_id"] is None
+    assert client.get("/measurements/").status_code == 404
+
+    MeasurementCompactor(db_session).compact_all()
+
+    [aggregate] = client.get("/measurements/").json()
+    assert aggregate["measurement_count"] == 1
+    assert aggregate["building_name"] == "D-21"
+
+
+def test_delete_raw_measurement(client, db_session):
+    raw_id = client.post("/measurements/raw", json=RAW_PAYLOAD).json()["id"]
+    MeasurementCompactor(db_session).compact_all()
+
+    assert client.delete(f"/measurements/raw/{raw_id}").status_code == 204
+    assert client.get("/measurements/").status_code == 404
+    assert client.delete(f"/measurements/raw/{raw_id}").status_code == 404
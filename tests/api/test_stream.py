@@ -0,0 +1,41 @@
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.crud.live import live_hub
+
+PAYLOAD = {
+    "latitude": 51.1097,
+    "longitude": 17.0580,
+    "height": 120.0,
+    "download_speed": 20.0,
+    "upload_speed": 10.0,
+    "ping": 30,
+}
+
+
+def test_stream_pushes_committed_changes(client):
+    with client.websocket_connect("/measurements/stream") as websocket:
+        created = client.post("/measurements/", json=PAYLOAD).json()
+        message = websocket.receive_json()
+
+    assert message["changed"] == [created]
+    assert message["deleted"] == []
+    assert message["cursor"] == client.get("/measurements/changes", params={"since": 0}).json()["cursor"]
+
+
+def test_stream_filters_by_bbox(client):
+    bbox = {"min_latitude": 51.0, "max_latitude": 51.2, "min_longitude": 17.0, "max_longitude": 17.1}
+    with client.websocket_connect("/measurements/stream", params=bbox) as websocket:
+        client.post("/measurements/", json={**PAYLOAD, "latitude": 52.2297, "longitude": 21.0122})
+        inside = client.post("/measurements/", json=PAYLOAD).json()
+        message = websocket.receive_json()
+
+    assert [m["id"] for m in message["changed"]] == [inside["id"]]
+
+
+def test_stream_rejects_partial_bbox(client):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/measurements/stream", params={"min_latitude": 51.0}):
+            pass
+    assert exc.value.code == 1008
+    assert not live_hub._subscribers
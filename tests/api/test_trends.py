@@ -0,0 +1,30 @@
+import pytest
+
+
+def _create(client, download_speed):
+    response = client.post("/measurements/", json={
+        "latitude": 51.1097,
+        "longitude": 17.0580,
+        "height": 120.0,
+        "download_speed": download_speed,
+        "upload_speed": 10.0,
+        "ping": 30,
+    })
+    assert response.status_code == 201
+
+
+def test_trends_follow_writes(client):
+    _create(client, 20.0)
+    _create(client, 60.0)
+
+    [bucket] = client.get("/measurements/trends", params={"building_name": "D-21"}).json()
+
+    assert bucket["measurement_count"] == 2
+    assert bucket["download_speed"] == pytest.approx(40.0)
+    assert bucket["hour_of_day"] is None
+
+
+def test_trends_validate_point(client):
+    response = client.get("/measurements/trends", params={"latitude": 51.1})
+
+    assert response.status_code == 400
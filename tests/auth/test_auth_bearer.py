@@ -0,0 +1,65 @@
+from app.auth import auth_bearer
+from app.models import Measurement
+
+USER = {"email": "bearer@example.com", "password": "testpassword"}
+PAYLOAD = {
+    "latitude": 51.1097,
+    "longitude": 17.0580,
+    "height": 120.0,
+    "download_speed": 20.0,
+    "upload_speed": 10.0,
+    "ping": 30,
+}
+
+
+def _token(client) -> str:
+    client.post("/user/register", json=USER)
+    return client.post("/user/login", json=USER).json()["access_token"]
+
+
+def test_authenticated_measurement_is_attributed_to_user(client, db_session):
+    headers = {"Authorization": f"Bearer {_token(client)}"}
+
+    created = client.post("/measurements/", json=PAYLOAD, headers=headers).json()
+    anonymous = client.post("/measurements/", json={**PAYLOAD, "latitude": 52.0}).json()
+
+    user_id = db_session.get(Measurement, created["id"]).user_id
+    assert user_id is not None
+    assert db_session.get(Measurement, anonymous["id"]).user_id is None
+
+
+def test_verified_token_and_user_are_cached(client, monkeypatch):
+    headers = {"Authorization": f"Bearer {_token(client)}"}
+    decoded, looked_up = [], []
+    decode_jwt, active_user_id = auth_bearer.decode_jwt, auth_bearer._active_user_id
+    monkeypatch.setattr(auth_bearer, "decode_jwt", lambda token: decoded.append(1) or decode_jwt(token))
+    monkeypatch.setattr(
+        auth_bearer, "_active_user_id", lambda factory, email: looked_up.append(1) or active_user_id(factory, email)
+    )
+
+    for i in range(3):
+        response = client.post("/measurements/", json={**PAYLOAD, "latitude": 51.0 + i}, headers=headers)
+        assert response.status_code == 201
+
+    assert len(decoded) == 1
+    assert len(looked_up) == 1
+
+
+def test_invalid_token_is_rejected(client):
+    response = client.post("/measurements/", json=PAYLOAD, headers={"Authorization": "Bearer not-a-token"})
+
+    assert response.status_code == 403
+
+
+def test_malformed_authorization_header_is_rejected(client):
+    for header in ("Basic dXNlcjpwYXNz", "Bearer", "Bearer "):
+        response = client.post("/measurements/", json=PAYLOAD, headers={"Authorization": header})
+        assert response.status_code == 403
+
+
+def test_bearer_scheme_is_case_insensitive(client):
+    headers = {"Authorization": f"bearer {_token(client)}"}
+
+    response = client.post("/measurements/", json=PAYLOAD, headers=headers)
+
+    assert response.status_code == 201
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+from app.auth.passwords import PasswordHasher
+
+
+def test_hash_and_verify_use_configured_cost():
+    hasher = PasswordHasher(rounds=4)
+
+    async def scenario():
+        hashed = await hasher.hash("testpassword")
+        return hashed, await hasher.verify("testpassword", hashed), await hasher.verify("wrong", hashed)
+
+    hashed, correct, wrong = asyncio.run(scenario())
+    hasher.shutdown()
+
+    assert hashed.startswith("$2b$04$")
+    assert correct and not wrong
+
+
+def test_hashing_does_not_block_event_loop():
+    hasher = PasswordHasher(rounds=12, workers=1)
+
+    async def scenario():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await hasher.hash("testpassword")
+        task.cancel()
+        return ticks
+
+    ticks = asyncio.run(scenario())
+    hasher.shutdown()
+
+    # pętla obsługiwała inne zadania przez cały czas liczenia hasha
+    assert len(ticks) > 5
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+
+
+def test_too_many_waiting_hashes_are_rejected():
+    hasher = PasswordHasher(rounds=10, workers=1, max_waiting=1)
+
+    async def scenario():
+        return await asyncio.gather(*(hasher.hash("testpassword") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    hasher.shutdown()
+
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == 503
+    assert bcrypt.checkpw(b"testpassword", results[0].encode())
@@ -3,7 +3,10 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.db.database import Base, get_db
+from app.db.database import Base, get_db, get_session_factory
+from app.routers.measurements import measurement_list_cache
+from app.utils.tiles import tile_cache
+from app.auth.auth_bearer import token_cache, user_cache
 
 TEST_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
@@ -40,6 +43,14 @@ def client(db_session):
             db_session.close()
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: (
+        lambda: TestingSessionLocal(bind=db_session.bind)
+    )
+    # każdy test wycofuje swoje zapisy, więc wersje zbioru między testami się powtarzają
+    measurement_list_cache.clear()
+    tile_cache.clear()
+    token_cache.clear()
+    user_cache.clear()
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.schemas import MeasurementCreate
+
+
+@pytest.fixture
+def make_measurement():
+    def factory(i: int, download_speed: float = 50.0) -> MeasurementCreate:
+        return MeasurementCreate(
+            latitude=51.1079 + i * 0.001,
+            longitude=17.0385,
+            download_speed=download_speed,
+            upload_speed=10.0,
+            ping=20,
+            timestamp="2025-05-19T15:30:00",
+        )
+
+    return factory
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Fabryka sesji do osobnej bazy SQLite (zapisy z innych wątków); opened liczy otwarte sesje"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'crud.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    opened = []
+
+    def counting_factory():
+        opened.append(1)
+        return factory()
+
+    counting_factory.opened = opened
+    yield counting_factory
+    engine.dispose()
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.crud.ingest_queue import MeasurementWriter
+from app.db.profiling import QueryStats, collect_query_stats, instrument_engine
+
+
+def test_concurrent_submits_are_group_committed(session_factory, make_measurement):
+    async def scenario():
+        writer = MeasurementWriter(session_factory, group_size=100, group_wait_ms=50)
+        await writer.start()
+        results = await asyncio.gather(*(writer.submit([make_measurement(i)]) for i in range(20)))
+        await writer.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 20
+    assert all(len(r) == 1 and r[0][1] is False for r in results)
+    assert len({r[0][0].id for r in results}) == 20
+    # jedna sesja (i jeden commit) na grupę, a nie na żądanie
+    assert len(session_factory.opened) < 20
+
+
+def test_full_queue_is_rejected_with_retry_after(session_factory, make_measurement):
+    async def scenario():
+        writer = MeasurementWriter(session_factory, max_queue_depth=1)
+        # bez uruchomionego zadania zapisującego kolejka się nie opróżnia
+        writer._queue = asyncio.Queue(maxsize=1)
+        writer._queue.put_nowait(([make_measurement(0)], None, None, asyncio.get_running_loop().create_future()))
+        with pytest.raises(HTTPException) as exc:
+            await writer.submit([make_measurement(1)])
+        return exc.value
+
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "1"
+
+
+def test_queued_write_reports_queries_to_request_stats(session_factory, make_measurement):
+    with session_factory() as db:
+        instrument_engine(db.get_bind())
+
+    async def scenario():
+        writer = MeasurementWriter(session_factory, group_wait_ms=1)
+        await writer.start()
+        # jak w żądaniu z QueryProfilingMiddleware – zapis wykonuje zadanie writera
+        with collect_query_stats(QueryStats()) as stats:
+            await writer.submit([make_measurement(0)])
+        await writer.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats.count > 0
+    assert stats.seconds > 0
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.crud.live import LiveHub, LiveSubscription, SlowConsumer
+from app.crud.measurement import MeasurementService
+
+
+def _write(session_factory, measurements):
+    with session_factory() as db:
+        MeasurementService(db).create_measurements(measurements)
+
+
+def test_burst_for_one_point_is_coalesced(session_factory, make_measurement):
+    async def scenario():
+        hub = LiveHub(session_factory, poll_interval_seconds=0.01)
+        async with hub.subscribe() as subscription:
+            # trzy zapisy tego samego punktu, zanim klient odebrał cokolwiek
+            for speed in (10.0, 20.0, 30.0):
+                _write(session_factory, [make_measurement(0, speed)])
+            await asyncio.sleep(0.1)
+            return await subscription.next_batch(timeout=1)
+
+    batch = asyncio.run(scenario())
+
+    assert len(batch["changed"]) == 1
+    assert batch["changed"][0]["measurement_count"] == 3
+    assert batch["changed"][0]["download_speed"] == pytest.approx(20.0)
+
+
+def test_slow_subscriber_is_dropped(session_factory, make_measurement):
+    async def scenario():
+        hub = LiveHub(session_factory, poll_interval_seconds=0.01, max_pending=2)
+        async with hub.subscribe() as subscription:
+            _write(session_factory, [make_measurement(i) for i in range(3)])
+            await asyncio.sleep(0.1)
+            assert not hub._subscribers
+            with pytest.raises(SlowConsumer):
+                await subscription.next_batch(timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_subscription_filters_by_building_but_not_deletions():
+    subscription = LiveSubscription(building_name="C-3")
+    subscription.offer(
+        [{"id": 1, "building_name": "C-3"}, {"id": 2, "building_name": "D-1"}], deleted=[7], cursor=5
+    )
+
+    batch = asyncio.run(subscription.next_batch(timeout=0))
+
+    assert batch == {"changed": [{"id": 1, "building_name": "C-3"}], "deleted": [7], "cursor": 5}
@@ -0,0 +1,97 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app.crud import MeasurementService
+from app.models import RawMeasurement
+from app.schemas import MeasurementCreate, MeasurementUpdate
+
+
+def _payload(**overrides) -> MeasurementCreate:
+    data = dict(
+        latitude=51.1079,
+        longitude=17.0385,
+        download_speed=100.0,
+        upload_speed=50.0,
+        ping=20,
+        timestamp="2025-05-19T15:30:00",
+    )
+    data.update(overrides)
+    return MeasurementCreate(**data)
+
+
+def test_update_measurement_increments_aggregate(db_session):
+    service = MeasurementService(db_session)
+    created = service.create_measurement(_payload())
+
+    updated = service.update_measurement(
+        created.id, MeasurementUpdate(download_speed=2.0, upload_speed=2.0, ping=500)
+    )
+
+    assert updated.measurement_count == 2
+    assert updated.download_speed_sum == pytest.approx(102.0)
+    assert updated.download_speed == pytest.approx(51.0)
+    assert updated.upload_speed == pytest.approx(26.0)
+    assert updated.ping == 260
+    assert updated.color == service.calculate_color(51.0, 26.0, 260)
+    assert updated.timestamp == created.timestamp
+    # obie próbki są w dzienniku, z punktem agregatu
+    raw = db_session.scalars(select(RawMeasurement).order_by(RawMeasurement.id)).all()
+    assert [r.download_speed for r in raw] == [100.0, 2.0]
+    assert {(r.latitude, r.aggregate_id) for r in raw} == {(created.latitude, created.id)}
+
+
+@pytest.mark.parametrize(
+    "download_speed, upload_speed, ping",
+    [(1.0, 1.0, 600), (30.0, 20.0, 100), (150.0, 100.0, 8), (20.0, 20.0, 300)],
+)
+def test_sql_color_matches_calculate_color(db_session, download_speed, upload_speed, ping):
+    service = MeasurementService(db_session)
+    created = service.create_measurement(_payload())
+
+    updated = service.update_measurement(
+        created.id,
+        MeasurementUpdate(download_speed=download_speed, upload_speed=upload_speed, ping=ping),
+    )
+
+    assert updated.color == service.calculate_color(
+        updated.download_speed, updated.upload_speed, updated.ping
+    )
+
+
+def test_update_missing_measurement_returns_404(db_session):
+    with pytest.raises(HTTPException) as exc:
+        MeasurementService(db_session).update_measurement(999999, MeasurementUpdate(ping=10))
+
+    assert exc.value.status_code == 404
+
+
+def test_batch_merges_into_existing_aggregate_atomically(db_session):
+    service = MeasurementService(db_session)
+    existing = service.create_measurement(_payload())
+
+    results = service.create_measurements(
+        [_payload(download_speed=20.0), _payload(download_speed=30.0)]
+    )
+
+    assert [merged for _, merged in results] == [True, True]
+    aggregate = results[-1][0]
+    assert aggregate.id == existing.id
+    assert aggregate.measurement_count == 3
+    assert aggregate.download_speed == pytest.approx(50.0)
+
+
+def test_failed_partial_delete_rolls_back_and_returns_500(db_session, monkeypatch):
+    service = MeasurementService(db_session)
+    created = service.create_measurement(_payload())
+    service.create_measurement(_payload())
+
+    def failing_remove(raw):
+        raise OperationalError("UPDATE measurements", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(service, "_remove_raw_sample", failing_remove)
+    with pytest.raises(HTTPException) as exc:
+        service.delete_measurement(created.id)
+
+    assert exc.value.status_code == 500
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app.crud import MeasurementService
+from app.crud.rollups import apply_rollup_deltas
+from app.models import BuildingRollup
+from app.schemas import MeasurementCreate
+
+LAT, LON = 51.1097, 17.0580
+
+
+def _add(db, timestamps, download_speeds, building="D-21", counts=None):
+    n = len(timestamps)
+    apply_rollup_deltas(
+        db, [building] * n, [LAT] * n, [LON] * n, timestamps,
+        download_speeds, [10.0] * n, [30] * n, counts=counts,
+    )
+
+
+def test_trends_by_hour_day_and_hour_of_day(db_session):
+    _add(db_session, [
+        datetime(2025, 5, 19, 8, 5), datetime(2025, 5, 19, 8, 55),
+        datetime(2025, 5, 19, 14, 0), datetime(2025, 5, 20, 8, 30),
+    ], [10.0, 30.0, 100.0, 50.0])
+    service = MeasurementService(db_session)
+
+    hourly = service.get_trends("hour", building_name="D-21")
+    assert [b["bucket_start"] for b in hourly] == [
+        datetime(2025, 5, 19, 8), datetime(2025, 5, 19, 14), datetime(2025, 5, 20, 8)
+    ]
+    assert hourly[0]["measurement_count"] == 2
+    assert hourly[0]["download_speed"] == pytest.approx(20.0)
+
+    daily = service.get_trends("day", since=datetime(2025, 5, 20), building_name="D-21")
+    assert [(b["bucket_start"], b["measurement_count"]) for b in daily] == [(datetime(2025, 5, 20), 1)]
+
+    profile = service.get_trends("hour_of_day", latitude=LAT, longitude=LON)
+    assert [(b["hour_of_day"], b["measurement_count"]) for b in profile] == [(8, 3), (14, 1)]
+    assert profile[0]["download_speed"] == pytest.approx(30.0)
+
+
+def test_subtracted_samples_remove_empty_buckets(db_session):
+    _add(db_session, [datetime(2025, 5, 19, 8, 5), datetime(2025, 5, 19, 9, 5)], [10.0, 30.0])
+
+    _add(db_session, [datetime(2025, 5, 19, 9, 5)], [-30.0], counts=[-1])
+
+    assert db_session.scalar(select(func.count()).select_from(BuildingRollup)) == 2
+    [day] = MeasurementService(db_session).get_trends("day")
+    assert day["measurement_count"] == 1
+    assert day["download_speed"] == pytest.approx(10.0)
+
+
+
+def test_ingest_buckets_by_client_time_and_delete_uses_same_buckets(db_session):
+    service = MeasurementService(db_session)
+    # bufor offline wysłany później (czas UTC przeliczony na lokalny); czas z przyszłości – teraz
+    [(aggregate, _), *_] = service.create_measurements([
+        MeasurementCreate(latitude=LAT, longitude=LON, download_speed=speed, upload_speed=10.0,
+                          ping=30, timestamp=timestamp)
+        for speed, timestamp in [
+            (10.0, "2025-05-19T08:05:00"),
+            (30.0, "2025-05-19T06:30:00Z"),
+            (50.0, "2999-01-01T00:00:00"),
+        ]
+    ])
+
+    hourly = service.get_trends("hour", building_name="D-21")
+    assert len(hourly) == 2
+    assert (hourly[0]["bucket_start"], hourly[0]["measurement_count"]) == (datetime(2025, 5, 19, 8), 2)
+    assert hourly[0]["download_speed"] == pytest.approx(20.0)
+    assert hourly[1]["bucket_start"] < datetime(2999, 1, 1)
+
+    service.delete_measurement(aggregate.id)
+    [hour] = service.get_trends("hour", building_name="D-21")
+    assert hour["bucket_start"] == datetime(2025, 5, 19, 8)
+
+    service.delete_measurement(aggregate.id)
+    service.delete_measurement(aggregate.id)
+    assert db_session.scalar(select(func.count()).select_from(BuildingRollup)) == 0
@@ -0,0 +1,50 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.db import profiling
+from app.db.profiling import QueryProfilingMiddleware, instrument_engine
+
+
+def _engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    instrument_engine(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v INTEGER)"))
+    return engine
+
+
+def test_server_timing_counts_queries_of_request():
+    engine = _engine()
+    app = FastAPI()
+    app.add_middleware(QueryProfilingMiddleware)
+
+    @app.get("/")
+    def index():
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT count(*) FROM t"))
+        return {}
+
+    response = TestClient(app).get("/")
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+
+
+def test_slow_query_is_logged_with_plan(monkeypatch, caplog):
+    engine = _engine()
+    monkeypatch.setattr(profiling, "SLOW_QUERY_MS", 0.0)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.profiling"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT v FROM t WHERE v = :v"), {"v": 1})
+
+    [record] = [r for r in caplog.records if "SELECT v FROM t" in r.getMessage()]
+    assert "[slow_query]" in record.getMessage()
+    assert "SCAN t" in record.getMessage()
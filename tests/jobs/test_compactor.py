@@ -0,0 +1,115 @@
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.crud import MeasurementService
+from app.jobs.compactor import MeasurementCompactor
+from app.models import BuildingStats, Measurement, RawMeasurement
+from app.schemas import MeasurementCreate
+
+
+def _raw(service, latitude, longitude, download_speed, ping=30):
+    return service.create_raw_measurement(MeasurementCreate(
+        latitude=latitude,
+        longitude=longitude,
+        height=120.0,
+        download_speed=download_speed,
+        upload_speed=10.0,
+        ping=ping,
+    ))
+
+
+def test_compaction_folds_pending_samples(db_session):
+    service = MeasurementService(db_session)
+    first = _raw(service, 51.1097, 17.0580, 20.0, ping=40)
+    _raw(service, 51.10971, 17.05801, 80.0, ping=21)
+    _raw(service, 51.1200, 17.0700, 50.0)
+    version = service.get_dataset_version()
+    assert db_session.scalar(select(func.count()).select_from(Measurement)) == 0
+
+    compactor = MeasurementCompactor(db_session, batch_size=2)
+    assert compactor.compact_all() == 3
+
+    assert compactor.pending_count() == 0
+    assert service.get_dataset_version() == version + 2
+    merged = db_session.scalar(select(Measurement).where(Measurement.measurement_count == 2))
+    assert merged.download_speed == pytest.approx(50.0)
+    assert merged.ping == 30
+    assert db_session.get(RawMeasurement, first.id).aggregate_id == merged.id
+    assert db_session.get(BuildingStats, "D-21").measurement_count == 2
+
+
+def test_deleting_samples_is_exact(db_session):
+    service = MeasurementService(db_session)
+    low = _raw(service, 51.1097, 17.0580, 20.0)
+    _raw(service, 51.10971, 17.05801, 80.0)
+    _raw(service, 51.10972, 17.05802, 50.0)
+    MeasurementCompactor(db_session).compact_all()
+    aggregate = db_session.scalar(select(Measurement))
+
+    # usunięcie z agregatu zabiera najnowszą próbkę (50), a nie średnią
+    service.delete_measurement(aggregate.id)
+    db_session.refresh(aggregate)
+    assert aggregate.measurement_count == 2
+    assert aggregate.download_speed == pytest.approx(50.0)
+
+    service.delete_raw_measurement(low.id)
+    db_session.refresh(aggregate)
+    assert aggregate.measurement_count == 1
+    assert aggregate.download_speed == pytest.approx(80.0)
+    assert db_session.get(BuildingStats, "D-21").download_speed_sum == pytest.approx(80.0)
+
+    service.delete_measurement(aggregate.id)
+    assert db_session.scalar(select(func.count()).select_from(RawMeasurement)) == 0
+    assert db_session.get(BuildingStats, "D-21") is None
+
+
+def test_rebuild_with_larger_radius(db_session):
+    service = MeasurementService(db_session)
+    _raw(service, 51.1097, 17.0580, 20.0)
+    _raw(service, 51.10975, 17.05812, 60.0)
+    MeasurementCompactor(db_session).compact_all()
+    assert db_session.scalar(select(func.count()).select_from(Measurement)) == 2
+
+    old_ids = set(db_session.scalars(select(Measurement.id)))
+    assert MeasurementCompactor(db_session, merge_radius_meters=50.0).rebuild() == 2
+
+    [aggregate] = db_session.scalars(select(Measurement)).all()
+    changes = service.get_changes()
+    assert [row[0] for row in changes["changed"]] == [aggregate.id]
+    assert set(changes["deleted"]) == old_ids - {aggregate.id}
+    assert aggregate.measurement_count == 2
+    assert aggregate.download_speed == pytest.approx(40.0)
+    assert db_session.get(BuildingStats, "D-21").measurement_count == 2
+
+
+def test_api_ingest_is_logged_for_exact_delete_and_rebuild(db_session):
+    service = MeasurementService(db_session)
+    service.create_measurements([
+        MeasurementCreate(latitude=51.1097, longitude=17.0580, download_speed=speed, upload_speed=10.0, ping=30)
+        for speed in (20.0, 80.0, 50.0)
+    ])
+    aggregate = db_session.scalar(select(Measurement))
+    assert aggregate.measurement_count == 3
+    assert set(db_session.scalars(select(RawMeasurement.aggregate_id))) == {aggregate.id}
+
+    # najnowsza próbka (50) z dziennika, a nie średnia
+    service.delete_measurement(aggregate.id)
+    db_session.refresh(aggregate)
+    assert aggregate.download_speed == pytest.approx(50.0)
+
+    assert MeasurementCompactor(db_session).rebuild() == 2
+    [aggregate] = db_session.scalars(select(Measurement)).all()
+    assert aggregate.measurement_count == 2
+    assert aggregate.download_speed == pytest.approx(50.0)
+
+
+def test_rebuild_refuses_to_drop_measurements_outside_the_log(db_session):
+    service = MeasurementService(db_session)
+    service.create_measurement(MeasurementCreate(
+        latitude=51.1097, longitude=17.0580, download_speed=20.0, upload_speed=10.0, ping=30
+    ))
+    # agregat sprzed dziennika
+    db_session.execute(delete(RawMeasurement))
+
+    with pytest.raises(RuntimeError):
+        MeasurementCompactor(db_session).rebuild()
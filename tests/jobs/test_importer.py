@@ -0,0 +1,126 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.crud import MeasurementService
+from app.jobs.compactor import MeasurementCompactor
+from app.jobs.importer import MeasurementImporter, file_hash, parse_record, read_rows
+from app.models import BuildingRollup, CellRollup, Measurement, MeasurementImport, RawMeasurement
+
+FIXED_WIDTH = """\
+id  user_id  latitude          longitude         height            download_speed  upload_speed  ping  timestamp                   color
+--  -------  ----------------  ----------------  ----------------  --------------  ------------  ----  --------------------------  -----
+1            51.109885535541   17.0578444319407  122.899097597221  62.0            35.0          17    2025-05-29 12:33:14.889719  green
+2            51.1098855        17.0578444        122.9             40.0            20.0          30    2025-05-29 12:35:00.000000  green
+3            51.1200000        17.0700000                          10.0            5.0                 2025-05-29 12:40:00.000000  green
+"""
+
+PIPE = """\
+id|user_id|latitude|longitude|height|download_speed|upload_speed|ping|download_speed_sum|upload_speed_sum|ping_sum|measurement_count|building_name|timestamp|color
+1||51.1098855|17.0578444|122.9|10.0|10.0|10|30.0|30.0|30|3|D-21|2025-06-23 14:52:25.189895|#E4A316
+2||abc|17.0578444|122.9|10.0|10.0|10|30.0|30.0|30|3|D-21|2025-06-23 14:52:25.189895|#E4A316
+"""
+
+
+def _write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_read_rows_fixed_width():
+    rows = list(read_rows(FIXED_WIDTH.splitlines(keepends=True)))
+
+    assert len(rows) == 3
+    assert rows[0]["latitude"] == "51.109885535541"
+    assert rows[0]["timestamp"] == "2025-05-29 12:33:14.889719"
+    assert rows[2]["height"] == ""
+    assert rows[2]["ping"] == ""
+
+
+def test_parse_record_aggregate_and_invalid_rows():
+    rows = list(read_rows(PIPE.splitlines(keepends=True)))
+
+    record = parse_record(rows[0])
+    assert record.measurement_count == 3
+    assert record.download_speed_sum == pytest.approx(30.0)
+    assert record.ping_sum == 30
+    assert parse_record(rows[1]) is None
+
+
+def test_import_merges_nearby_rows_and_is_idempotent(db_session, tmp_path):
+    path = _write(tmp_path, "29_05.txt", FIXED_WIDTH)
+    importer = MeasurementImporter(db_session, chunk_size=2)
+
+    stats = importer.import_file(path)
+
+    assert (stats.rows, stats.created, stats.merged, stats.skipped) == (3, 2, 1, 0)
+    assert db_session.scalar(select(func.sum(Measurement.measurement_count))) == 3
+    merged = db_session.scalar(select(Measurement).where(Measurement.measurement_count == 2))
+    assert merged.download_speed == pytest.approx(51.0)
+    assert merged.ping == 23
+
+    rerun = importer.import_file(path)
+    assert rerun.already_imported
+    assert db_session.scalar(select(func.count()).select_from(Measurement)) == 2
+    assert db_session.get(MeasurementImport, file_hash(path)).completed
+
+
+def test_import_adds_to_stored_aggregates(db_session, tmp_path):
+    importer = MeasurementImporter(db_session)
+    importer.import_file(_write(tmp_path, "29_05.txt", FIXED_WIDTH))
+
+    stats = importer.import_file(_write(tmp_path, "data.txt", PIPE))
+
+    assert (stats.created, stats.merged, stats.skipped) == (0, 1, 1)
+    merged = db_session.scalar(select(Measurement).where(Measurement.measurement_count == 5))
+    assert merged.download_speed_sum == pytest.approx(132.0)
+    assert merged.ping == 15
+    assert merged.timestamp.year == 2025 and merged.timestamp.month == 6
+
+    changes = MeasurementService(db_session).get_changes()
+    assert {row[0] for row in changes["changed"]} == set(db_session.scalars(select(Measurement.id)))
+
+
+
+def test_import_logs_samples_for_exact_delete_and_rebuild(db_session, tmp_path):
+    importer = MeasurementImporter(db_session)
+    importer.import_file(_write(tmp_path, "29_05.txt", FIXED_WIDTH))
+    importer.import_file(_write(tmp_path, "data.txt", PIPE))
+
+    # gotowy agregat z pliku to 3 próbki – sumy próbek są sumami agregatów
+    sums = db_session.execute(
+        select(
+            RawMeasurement.aggregate_id, func.count(),
+            func.sum(RawMeasurement.download_speed), func.sum(RawMeasurement.ping),
+        ).group_by(RawMeasurement.aggregate_id)
+    ).all()
+    for aggregate_id, count, download_sum, ping_sum in sums:
+        aggregate = db_session.get(Measurement, aggregate_id)
+        assert count == aggregate.measurement_count
+        assert download_sum == pytest.approx(aggregate.download_speed_sum)
+        assert (ping_sum or 0) == aggregate.ping_sum
+
+    assert MeasurementCompactor(db_session).rebuild() == 6
+    assert db_session.scalar(select(func.sum(Measurement.measurement_count))) == 6
+
+
+def test_deleting_imported_aggregate_subtracts_its_rollups(db_session, tmp_path):
+    importer = MeasurementImporter(db_session)
+    importer.import_file(_write(tmp_path, "29_05.txt", FIXED_WIDTH))
+    importer.import_file(_write(tmp_path, "data.txt", PIPE))
+    service = MeasurementService(db_session)
+    largest = db_session.scalar(select(Measurement).where(Measurement.measurement_count == 5))
+
+    # próbka po próbce, a ostatnia razem z całym agregatem
+    for _ in range(5):
+        service.delete_measurement(largest.id)
+
+    remaining = db_session.scalar(select(func.sum(Measurement.measurement_count)))
+    remaining_download = db_session.scalar(select(func.sum(Measurement.download_speed_sum)))
+    for model in (BuildingRollup, CellRollup):
+        count, download_sum = db_session.execute(
+            select(func.sum(model.measurement_count), func.sum(model.download_speed_sum))
+            .where(model.period == "day")
+        ).one()
+        assert count == remaining == 1
+        assert download_sum == pytest.approx(remaining_download)
@@ -0,0 +1,49 @@
+from sqlalchemy import select
+
+from app.crud import MeasurementService
+from app.jobs.recolor import MeasurementRecolorer
+from app.models import Measurement
+from app.schemas import MeasurementCreate
+from app.utils.scoring import GOOD_COLOR, POOR_COLOR, ScoringEngine
+
+
+def _create(service, latitude, download_speed):
+    return service.create_measurement(MeasurementCreate(
+        latitude=latitude,
+        longitude=17.0385,
+        download_speed=download_speed,
+        upload_speed=30.0,
+        ping=100,
+        timestamp="2025-05-19T15:30:00",
+    ))
+
+
+def test_recolor_applies_new_thresholds(db_session):
+    service = MeasurementService(db_session)
+    ids = [
+        _create(service, 51.1 + i * 0.001, download_speed).id
+        for i, download_speed in enumerate((5.0, 50.0, 140.0))
+    ]
+    timestamps = db_session.scalars(select(Measurement.timestamp).order_by(Measurement.id)).all()
+    version = service.get_dataset_version()
+
+    stats = MeasurementRecolorer(db_session, engine=ScoringEngine(thresholds=(60.0, 70.0)), chunk_size=2).run()
+
+    db_session.expire_all()
+    colors = [db_session.get(Measurement, id).color for id in ids]
+    assert colors[:2] == [POOR_COLOR, POOR_COLOR]
+    assert colors[2] == GOOD_COLOR
+    assert stats.rows == 3 and stats.changed == 2 and stats.skipped == 0
+    assert db_session.scalars(select(Measurement.timestamp).order_by(Measurement.id)).all() == timestamps
+    assert service.get_dataset_version() == version + 1
+
+
+def test_recolor_without_changes_writes_nothing(db_session):
+    service = MeasurementService(db_session)
+    _create(service, 51.1, 50.0)
+    version = service.get_dataset_version()
+
+    stats = MeasurementRecolorer(db_session).run()
+
+    assert stats.changed == 0
+    assert service.get_dataset_version() == version
@@ -0,0 +1,19 @@
+from app.utils.buildings import DEFAULT_BUILDING, BuildingIndex, find_building, find_buildings
+
+
+def test_find_building_inside_and_outside():
+    assert find_building(51.1097, 17.0580) == "D-21"
+    assert find_building(51.0, 16.9) == DEFAULT_BUILDING
+
+
+def test_find_buildings_matches_single_lookup():
+    lats = [51.1097, 51.1089, 51.1092, 51.0, 51.1085]
+    lons = [17.0580, 17.0604, 17.0604, 16.9, 17.0590]
+    assert find_buildings(lats, lons) == [find_building(lat, lon) for lat, lon in zip(lats, lons)]
+
+
+def test_overlapping_buildings_prefer_first_declared():
+    square = [(0.0, 0.0), (0.0, 1.0), (1.0, 1.0), (1.0, 0.0)]
+    index = BuildingIndex({"first": square, "second": square})
+    assert index.find(0.5, 0.5) == "first"
+    assert index.find_many([0.5], [0.5]) == ["first"]
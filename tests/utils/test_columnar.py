@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.utils.columnar import (
+    COLUMNS_MEDIA_TYPE,
+    decode_columns,
+    delta_column,
+    dictionary_column,
+    encode_columns,
+    plain_column,
+    timestamp_column,
+)
+from app.utils.export import preferred_media_type
+
+
+def test_columns_round_trip():
+    latitudes = [51.1097, 51.1101, 51.1012, 51.1097]
+    start = datetime(2025, 3, 1, 12, 30)
+    timestamps = [start - timedelta(seconds=s) for s in (0, 7, 3600, 86_400 * 40)]
+    body = encode_columns(4, [
+        delta_column("id", [10, 3, 70_000, 11]),
+        delta_column("latitude", latitudes, 1e-6),
+        plain_column("ping", [12, None, 30, 600], np.float32),
+        dictionary_column("building_name", ["C-3", None, "D-21", "C-3"]),
+        timestamp_column("timestamp", timestamps),
+    ])
+
+    columns = decode_columns(body)
+
+    assert columns["id"].tolist() == [10, 3, 70_000, 11]
+    assert np.allclose(columns["latitude"], latitudes, atol=1e-6)
+    assert np.isnan(columns["ping"][1]) and columns["ping"][3] == 600
+    assert columns["building_name"].tolist() == ["C-3", None, "D-21", "C-3"]
+    assert columns["timestamp"].astype("datetime64[s]").tolist() == timestamps
+
+
+def test_empty_columns_round_trip():
+    columns = decode_columns(encode_columns(0, [delta_column("id", []), dictionary_column("color", [])]))
+    assert len(columns["id"]) == 0 and len(columns["color"]) == 0
+
+
+def test_preferred_media_type():
+    offered = ("application/json", COLUMNS_MEDIA_TYPE)
+    assert preferred_media_type(None, offered) == "application/json"
+    assert preferred_media_type("*/*", offered) == "application/json"
+    assert preferred_media_type(COLUMNS_MEDIA_TYPE, offered) == COLUMNS_MEDIA_TYPE
+    assert preferred_media_type(f"application/json;q=0.5, {COLUMNS_MEDIA_TYPE}", offered) == COLUMNS_MEDIA_TYPE
+    assert preferred_media_type(f"{COLUMNS_MEDIA_TYPE};q=0", offered) == "application/json"
@@ -0,0 +1,38 @@
+import math
+import random
+
+from app.utils.distance_utils import METERS_PER_DEGREE, haversine_distance
+from app.utils.grid import grid_cell, height_band, neighbour_cell_pairs, neighbour_cells
+
+
+def test_neighbour_cells_cover_merge_radius():
+    rng = random.Random(0)
+    for _ in range(2000):
+        lat = rng.uniform(-70, 70)
+        lon = rng.uniform(-179, 179)
+        bearing = rng.uniform(0, 2 * math.pi)
+        distance = rng.uniform(0, 5)
+        other_lat = lat + distance * math.cos(bearing) / METERS_PER_DEGREE
+        other_lon = lon + distance * math.sin(bearing) / (METERS_PER_DEGREE * math.cos(math.radians(lat)))
+        if haversine_distance(lat, lon, other_lat, other_lon) > 5:
+            continue
+        assert grid_cell(other_lat, other_lon) in neighbour_cells(lat, lon, 5)
+
+
+def test_neighbour_cells_are_few():
+    assert len(neighbour_cells(51.1097, 17.0580, 5)) <= 9
+
+
+def test_neighbour_cell_pairs_match_neighbour_cells():
+    rng = random.Random(1)
+    lats = [rng.uniform(-89.99999, 89.99999) for _ in range(500)] + [89.99999, -89.99999]
+    lons = [rng.uniform(-179, 179) for _ in range(502)]
+    points, cells = neighbour_cell_pairs(lats, lons, 5)
+    for i, (lat, lon) in enumerate(zip(lats, lons)):
+        assert sorted(cells[points == i].tolist()) == sorted(neighbour_cells(lat, lon, 5))
+
+
+def test_height_band():
+    assert height_band(None) is None
+    assert height_band(120.4) == 120
+    assert abs(height_band(120.9) - height_band(121.8)) <= 1
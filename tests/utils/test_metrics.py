@@ -0,0 +1,32 @@
+from app.utils.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/a")
+
+    lines = registry.render().decode().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_counter_and_gauge_escape_label_values():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("path",))
+    in_progress = registry.gauge("in_progress", "In progress")
+    requests.inc('a"b\\c\nd')
+    requests.inc('a"b\\c\nd', amount=2)
+    in_progress.inc()
+    in_progress.dec()
+
+    lines = registry.render().decode().splitlines()
+
+    assert 'requests_total{path="a\\"b\\\\c\\nd"} 3' in lines
+    assert "in_progress 0" in lines
@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from app.utils.scoring import FAIR_COLOR, GOOD_COLOR, POOR_COLOR, ScoringEngine
+
+
+def test_colors_match_color_for_each_row():
+    engine = ScoringEngine()
+    rng = random.Random(0)
+    rows = [(rng.uniform(0, 200), rng.uniform(0, 120), rng.randint(1, 800)) for _ in range(1000)]
+
+    colors = engine.colors(*zip(*rows))
+
+    assert colors.tolist() == [engine.color(*row) for row in rows]
+
+
+def test_colors_treat_missing_values_as_sql_null():
+    assert ScoringEngine().colors([float("nan")], [10.0], [20]).tolist() == [GOOD_COLOR]
+
+
+@pytest.mark.parametrize(
+    "thresholds, expected",
+    [((20.0, 60.0), FAIR_COLOR), ((10.0, 30.0), GOOD_COLOR), ((60.0, 90.0), POOR_COLOR)],
+)
+def test_thresholds_are_configurable(thresholds, expected):
+    assert ScoringEngine(thresholds=thresholds).color(50.0, 30.0, 100) == expected
@@ -0,0 +1,49 @@
+import random
+
+from app.utils.tiles import TileCache, tile_bounds, tile_for_point, tile_row_edges
+
+
+def test_point_lies_in_its_tile():
+    rng = random.Random(0)
+    for _ in range(2000):
+        lat = rng.uniform(-85, 85)
+        lon = rng.uniform(-180, 179.999)
+        z = rng.randint(0, 22)
+        min_lat, max_lat, min_lon, max_lon = tile_bounds(z, *tile_for_point(lat, lon, z))
+        assert min_lat <= lat <= max_lat
+        assert min_lon <= lon <= max_lon
+
+
+def test_row_edges_split_tile_from_top():
+    min_lat, max_lat, _, _ = tile_bounds(10, 560, 342)
+    edges = tile_row_edges(10, 342)
+    assert edges == sorted(edges, reverse=True)
+    assert all(min_lat <= edge < max_lat for edge in edges)
+    assert edges[-1] == min_lat
+
+
+def test_tile_cache_invalidates_only_tiles_of_changed_point():
+    cache = TileCache()
+    here = (51.1097, 17.0580)
+    elsewhere = (52.2297, 21.0122)
+    here_key = (14, *tile_for_point(*here, 14))
+    elsewhere_key = (14, *tile_for_point(*elsewhere, 14))
+    for key in (here_key, elsewhere_key):
+        cache.put(key, b"tile", cache.begin(key))
+
+    cache.invalidate_points([here])
+
+    assert cache.get(here_key) is None
+    assert cache.get(elsewhere_key) == b"tile"
+
+
+def test_tile_cache_drops_result_computed_during_invalidation():
+    cache = TileCache()
+    point = (51.1097, 17.0580)
+    key = (14, *tile_for_point(*point, 14))
+
+    token = cache.begin(key)
+    cache.invalidate_points([point])
+    cache.put(key, b"stale", token)
+
+    assert cache.get(key) is None